@@ -0,0 +1,281 @@
+"""
+Scene-wide audit of egg-object-types.
+
+Given every egg-object-type attribute of a scene (read with one ls), builds the index of which
+nodes carry which type and reports the tags that will not come out of the export as intended:
+
+- duplicate: a node holds the same type twice.
+- conflict: two types of a node set the same egg entry to different values, like barrier and floor
+  both setting <Scalar> collide-mask. Only one of them ends up in the egg.
+- dropped: a tag maya2egg or the egg loader ignores. The type is not defined in any PRC file, the
+  node is not a DAG node, or a legacy eggObjectTypesN attribute follows a missing number (maya2egg
+  stops reading at the first gap).
+
+This module does not import pymel, the window is MP_PY_EggObjectTypeAuditGUI in MayaPandaUI.py.
+
+Usage:
+    mayapy MayaPandaAudit.py [--summary summary.json] scenes/*.mb
+"""
+
+import argparse
+import json
+import sys
+
+from dataclasses import asdict, dataclass, field
+from itertools import combinations
+from typing import Dict, List
+
+from MayaPandaBatch import expand_scenes
+from MayaPandaPrc import load_object_types
+from MayaPandaTags import ATTRIBUTE, LEGACY_PREFIX, legacy_number, plug_patterns, read_legacy
+
+ISSUE_KINDS = ("duplicate", "conflict", "dropped")
+
+
+@dataclass
+class AuditIssue:
+    kind: str
+    node: str
+    egg_object_type: str
+    detail: str
+
+
+@dataclass
+class AuditReport:
+    # egg-object-type -> nodes carrying it, in scene order
+    index: Dict[str, List[str]] = field(default_factory = dict)
+    # node -> its egg-object-types, duplicates included
+    nodes: Dict[str, List[str]] = field(default_factory = dict)
+    issues: List[AuditIssue] = field(default_factory = list)
+
+    def nodes_with(self, *types):
+        """
+        :return: The nodes carrying every one of the egg-object-types, e.g. nodes_with("barrier", "trigger").
+        """
+        if not types:
+            return []
+        common = set(self.index.get(types[0], ()))
+        for name in types[1:]:
+            common &= set(self.index.get(name, ()))
+        return [node for node in self.index.get(types[0], ()) if node in common]
+
+    def counts(self):
+        """
+        :return: Dictionary of issue kind to the number of issues.
+        """
+        counts = dict.fromkeys(ISSUE_KINDS, 0)
+        for issue in self.issues:
+            counts[issue.kind] += 1
+        return counts
+
+
+def flag_values(flags):
+    """
+    Splits definition flags into the egg entry each sets and its value.
+
+    :param flags: List like ['<Scalar> collide-mask { 0x02 }', '<Collide> { Polyset descend }'].
+    :return: Dictionary like {'<Scalar> collide-mask': '0x02', '<Collide>': 'Polyset descend'}.
+    """
+    values = {}
+    for flag in flags:
+        entry, _, value = flag.partition("{")
+        values[" ".join(entry.split())] = value.rstrip("}").strip()
+    return values
+
+
+def _same_value(first, second):
+    try:
+        # 0x01 and 1 are the same collide mask
+        return int(first, 0) == int(second, 0)
+    except ValueError:
+        return first == second
+
+
+class ConflictChecker(object):
+    """
+    Finds the pairs of egg-object-types of a node that set the same egg entry differently.
+    Most nodes share a handful of combinations, so results are cached per combination.
+    """
+
+    def __init__(self, type_flags):
+        self.values = {name: flag_values(flags) for name, flags in type_flags.items()}
+        self._cache = {}
+
+    def conflicts(self, types):
+        """
+        :param types: The distinct egg-object-types of a node.
+        :return: List of (type, other type, description), one per conflicting pair.
+        """
+        key = tuple(types)
+        if key not in self._cache:
+            found = []
+            for first, second in combinations(key, 2):
+                first_values = self.values.get(first, {})
+                second_values = self.values.get(second, {})
+                differences = [
+                    f"{entry} {first_values[entry]} != {second_values[entry]}"
+                    for entry in first_values
+                    if entry in second_values and not _same_value(first_values[entry], second_values[entry])
+                ]
+                if differences:
+                    found.append((first, second, f"{first} + {second}: {', '.join(differences)}"))
+            self._cache[key] = found
+        return self._cache[key]
+
+
+def dropped_legacy(numbers, fillers=0):
+    """
+    :param numbers: Numbers of the eggObjectTypesN attributes of a node.
+    :param fillers: Number of types of the node's eggObjectTypeList that are not in a legacy attribute.
+                    At export time they fill the missing numbers first, see MayaPandaTags.expand_to_legacy.
+    :return: The numbers maya2egg will not read, because a number before them is still missing.
+    """
+    last = 0
+    numbers = sorted(numbers)
+    for position, number in enumerate(numbers):
+        gap = number - last - 1
+        if gap > fillers:
+            return numbers[position:]
+        fillers -= gap
+        last = number
+    return []
+
+
+def audit(rows, object_types=None, dag_nodes=None):
+    """
+    Indexes and checks the egg-object-types of a scene.
+
+    :param rows: (node, attribute, egg-object-type) of every tag, from one read of the scene.
+                 An eggObjectTypeList gives one row per type it holds.
+    :param object_types: load_object_types() data. Loaded if not given.
+    :param dag_nodes: The DAG nodes among the tagged nodes. None skips the check.
+    :return: AuditReport.
+    """
+    object_types = object_types or load_object_types()
+    type_flags = {entry["name"]: entry["flags"] for entry in object_types["types"]}
+    undefined = set(object_types["undefined"])
+    checker = ConflictChecker(type_flags)
+
+    report = AuditReport()
+    # node -> {legacy attribute number: egg-object-type}
+    legacy = {}
+    # node -> egg-object-types of its eggObjectTypeList
+    listed = {}
+    for node, attribute, name in rows:
+        report.nodes.setdefault(node, []).append(name)
+        if attribute == ATTRIBUTE:
+            listed.setdefault(node, []).append(name)
+        else:
+            legacy.setdefault(node, {})[legacy_number(attribute)] = name
+
+    issues = report.issues
+    for node, types in report.nodes.items():
+        distinct = list(dict.fromkeys(types))
+        for name in distinct:
+            report.index.setdefault(name, []).append(node)
+            if types.count(name) > 1:
+                issues.append(AuditIssue("duplicate", node, name, f"{name} is attached {types.count(name)} times"))
+            if name not in type_flags:
+                issues.append(AuditIssue("dropped", node, name, f"{name} is not a known egg-object-type"))
+            elif name in undefined:
+                issues.append(AuditIssue("dropped", node, name, f"{name} is not defined in any PRC file"))
+        for first, _, detail in checker.conflicts(distinct):
+            issues.append(AuditIssue("conflict", node, first, detail))
+        if dag_nodes is not None and node not in dag_nodes:
+            issues.append(AuditIssue("dropped", node, ", ".join(distinct), "maya2egg only exports DAG nodes"))
+        if node in legacy:
+            numbers = legacy[node]
+            fillers = len(set(listed.get(node, ())) - set(numbers.values()))
+            for number in dropped_legacy(numbers, fillers):
+                issues.append(AuditIssue(
+                    "dropped", node, numbers[number], f"{LEGACY_PREFIX}{number} follows a missing eggObjectTypes number"
+                ))
+    return report
+
+
+def scene_rows(cmds, read_plugs=None):
+    """
+    Reads every egg-object-type attribute of the open scene, finding them with a single ls.
+
+    :param read_plugs: Function reading a list of plugs into (node, attribute, egg-object-type names),
+                       like MP_PY_ReadEggObjectTypePlugs. Reads with getAttr if not given.
+    :return: Rows for audit().
+    """
+    plugs = cmds.ls(plug_patterns(), long = True, recursive = True) or []
+    if read_plugs is None:
+        def read_plugs(plug_names):
+            values = []
+            for plug in plug_names:
+                node, _, attribute = plug.rpartition(".")
+                if attribute == ATTRIBUTE:
+                    values.append((node, attribute, cmds.getAttr(plug) or []))
+                else:
+                    values.append((node, attribute, [read_legacy(cmds, plug)]))
+            return values
+
+    return [(node, attribute, name) for node, attribute, names in read_plugs(plugs) for name in names]
+
+
+def audit_scene(cmds, object_types=None, read_plugs=None):
+    """
+    :param read_plugs: See scene_rows.
+    :return: The AuditReport of the open scene.
+    """
+    rows = scene_rows(cmds, read_plugs)
+    tagged = list(dict.fromkeys(node for node, _, _ in rows))
+    dag_nodes = set(cmds.ls(tagged, long = True, dag = True) or []) if tagged else set()
+    return audit(rows, object_types, dag_nodes)
+
+
+def format_report(report):
+    """
+    :return: The lines of a plain text report.
+    """
+    lines = [f"{len(report.nodes)} tagged nodes, {len(report.index)} egg-object-types"]
+    lines.extend(f"  {name:<24} {len(nodes):>8}" for name, nodes in sorted(report.index.items()))
+    for kind, count in report.counts().items():
+        lines.append(f"{count} x {kind}")
+        lines.extend(
+            f"  {issue.node}: {issue.detail}" for issue in report.issues if issue.kind == kind
+        )
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Audit the egg-object-types of Maya scenes.")
+    parser.add_argument("scenes", nargs = "+", help = "Scene files, directories or glob patterns")
+    parser.add_argument("--summary", default = "", help = "Write a JSON summary to this file")
+    options = parser.parse_args(argv)
+
+    scenes = expand_scenes(options.scenes)
+    if not scenes:
+        parser.error("no .mb or .ma scenes found")
+
+    import maya.standalone
+    maya.standalone.initialize(name = "python")
+    import maya.cmds as cmds
+
+    object_types = load_object_types()
+    results = []
+    try:
+        for scene_file in scenes:
+            cmds.file(scene_file, open = True, force = True, prompt = False)
+            report = audit_scene(cmds, object_types)
+            print(scene_file)
+            print("\n".join(format_report(report)))
+            results.append({
+                "scene": scene_file,
+                "index": report.index,
+                "issues": [asdict(issue) for issue in report.issues],
+            })
+    finally:
+        maya.standalone.uninitialize()
+
+    if options.summary:
+        with open(options.summary, "w") as handle:
+            json.dump({"results": results}, handle, indent = 4)
+    return 1 if any(result["issues"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""
+Headless batch export of Maya scenes to Panda files.
+
+Runs the same pipeline as "Export Scene" in the exporter window (temporary .mb, maya2egg, egg2bam)
+over many scenes at once, driven by an export profile saved with "Save Export Profile...".
+The coordinator starts several mayapy workers and hands them scenes one at a time, so it can itself
+run from mayapy or plain Python. Only the workers import Maya.
+
+Usage:
+    mayapy MayaPandaBatch.py --profile profile.json --workers 4 --summary summary.json scenes/*.mb
+
+A JSON summary with one result per scene is written to --summary, or printed when it is not given.
+The exit code is 1 if any scene failed.
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from collections import deque
+from dataclasses import replace
+
+from MayaPandaCache import BuildCache, forget_stamp, save_scene_copy, scene_references
+from MayaPandaJobs import ConversionJob, JobPool, pool_size, run_job
+from MayaPandaMetrics import ExportRun, MetricsHistory
+from MayaPandaRules import TagRules, apply_rules
+from MayaPandaSettings import (
+    ExportSettings, egg2bam_command, egg2bam_targets, maya2egg_args, maya2egg_command, maya2egg_copies_textures,
+    temp_scene_path
+)
+from MayaPandaTags import legacy_layout, object_type_ids, read_types
+
+SCENE_EXTENSIONS = (".mb", ".ma")
+# Marks the worker's result lines, Maya writes plenty of its own output to stdout
+RESULT_PREFIX = "MP_PY_BATCH_RESULT "
+
+
+def expand_scenes(patterns):
+    """
+    Expands files, directories and glob patterns into a sorted list of Maya scene files.
+    """
+    scenes = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*")
+        for path in glob.glob(pattern, recursive = True) or [pattern]:
+            if os.path.splitext(path)[1].lower() in SCENE_EXTENSIONS and os.path.isfile(path):
+                scenes.add(os.path.abspath(path))
+    return sorted(scenes)
+
+
+def batch_settings(settings, output_dir=""):
+    """
+    Adjusts a saved export profile for batch use.
+    Every scene keeps its own file name, pview is never launched, and output_dir overrides the output path.
+    """
+    settings = replace(settings, custom_filename = False, filename = "", pview = False, export_selected = False)
+    if output_dir:
+        settings = replace(settings, custom_output = True, output_path = os.path.abspath(output_dir))
+    return settings
+
+
+class SceneQueue(object):
+    """
+    Scenes sharded across workers, with work stealing.
+
+    Each worker starts with its own shard and takes scenes from the front of it.
+    A worker that runs out takes from the back of the longest remaining shard,
+    so one slow scene never leaves the other workers idle.
+    """
+
+    def __init__(self, scenes, workers):
+        # Largest scenes first, dealt round-robin, so the shards start out roughly even
+        ordered = sorted(scenes, key = lambda path: os.path.getsize(path) if os.path.exists(path) else 0, reverse = True)
+        self.shards = [deque(ordered[index::workers]) for index in range(workers)]
+        self.stolen = 0
+        self._lock = threading.Lock()
+
+    def next(self, worker):
+        """
+        :return: The next scene for the worker, or None once every shard is empty.
+        """
+        with self._lock:
+            if self.shards[worker]:
+                return self.shards[worker].popleft()
+            victim = max(self.shards, key = len)
+            if not victim:
+                return None
+            self.stolen += 1
+            return victim.pop()
+
+    def remaining(self):
+        with self._lock:
+            return [scene for shard in self.shards for scene in shard]
+
+
+def worker_command(mayapy, profile, output_dir):
+    command = [mayapy, os.path.abspath(__file__), "--worker", "--profile", os.path.abspath(profile)]
+    if output_dir:
+        command.extend(["--output-dir", os.path.abspath(output_dir)])
+    return command
+
+
+def run_worker_process(index, command, queue, results, log_dir):
+    """
+    Feeds scenes to one mayapy worker over its stdin until the queue is empty.
+    Runs on a coordinator thread, one per worker.
+    """
+    log_path = os.path.join(log_dir, f"worker{index}.log") if log_dir else os.devnull
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(
+            command,
+            stdin = subprocess.PIPE,
+            stdout = subprocess.PIPE,
+            stderr = log,
+            universal_newlines = True,
+            bufsize = 1,
+        )
+        scene = queue.next(index)
+        while scene is not None:
+            start = time.time()
+            result = None
+            try:
+                process.stdin.write(scene + "\n")
+                process.stdin.flush()
+                for line in process.stdout:
+                    if line.startswith(RESULT_PREFIX):
+                        result = json.loads(line[len(RESULT_PREFIX):])
+                        break
+                    log.write(line)
+            except (OSError, ValueError):
+                pass
+            if result is None:
+                # The worker died, mayapy crashes take the scene with them. Leave the rest to the other workers.
+                results.append({
+                    "scene": scene,
+                    "status": "failed",
+                    "error": f"mayapy worker exited with code {process.wait()}",
+                    "elapsed": time.time() - start,
+                    "worker": index,
+                })
+                return
+            result["worker"] = index
+            results.append(result)
+            scene = queue.next(index)
+
+        # An empty line tells the worker to shut down
+        try:
+            process.stdin.write("\n")
+            process.stdin.close()
+        except OSError:
+            pass
+        for line in process.stdout:
+            log.write(line)
+        process.wait()
+
+
+def run_batch(scenes, profile, workers=None, mayapy=None, output_dir="", log_dir=""):
+    """
+    Exports scenes with a pool of mayapy workers.
+
+    :param scenes: Maya scene files to export.
+    :param profile: Path to a JSON export profile.
+    :param workers: Number of mayapy processes. Defaults to one per CPU core, within the profile's memory budget.
+    :param mayapy: The mayapy executable. Defaults to the running interpreter.
+    :param output_dir: Write every scene's files here instead of the profile's output path.
+    :param log_dir: Directory for the Maya output of each worker, discarded if not given.
+    :return: The summary dictionary.
+    """
+    settings = ExportSettings.load(profile)
+    workers = min(len(scenes), workers or pool_size(memory_budget_mb = settings.memory_budget_mb)) or 1
+    command = worker_command(mayapy or sys.executable, profile, output_dir)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok = True)
+
+    queue = SceneQueue(scenes, workers)
+    results = []
+    start = time.time()
+    threads = [
+        threading.Thread(target = run_worker_process, args = (index, command, queue, results, log_dir), daemon = True)
+        for index in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Only left over when every worker has died
+    for scene in queue.remaining():
+        results.append({"scene": scene, "status": "skipped", "error": "No mayapy worker left to export the scene"})
+
+    results.sort(key = lambda result: result["scene"])
+    return {
+        "profile": os.path.abspath(profile),
+        "workers": workers,
+        "elapsed": time.time() - start,
+        "stolen": queue.stolen,
+        "total": len(results),
+        "succeeded": sum(result["status"] == "ok" for result in results),
+        "failed": sum(result["status"] != "ok" for result in results),
+        "results": results,
+    }
+
+
+def export_scene(scene_file, settings, cache=None, history=None, type_ids=None):
+    """
+    Opens a scene and exports it the way MP_PY_StartSceneExport does. Needs mayapy.
+
+    :param scene_file: The Maya scene to export.
+    :param settings: ExportSettings from batch_settings.
+    :param cache: BuildCache to use when the profile has the build cache enabled.
+    :param history: MetricsHistory to record the stage timings in.
+    :param type_ids: Dictionary of egg-object-type name to stable id. Loaded from the PRC files if not given.
+    :return: A result dictionary for the summary.
+    """
+    import maya.cmds as cmds
+
+    start = time.time()
+    result = {"scene": scene_file, "status": "failed", "outputs": [], "warnings": []}
+    run = ExportRun(scene_file, history = history)
+    try:
+        cmds.file(scene_file, open = True, force = True, prompt = False)
+        settings = replace(settings, up_axis = str(cmds.upAxis(query = True, axis = True)))
+        if settings.apply_tag_rules:
+            with run.stage("tag_rules"):
+                tagged = apply_rules(cmds, TagRules.load(settings.tag_rules_file or None))
+            result["tagged"] = len(tagged)
+        file_name = os.path.splitext(os.path.basename(scene_file))[0]
+
+        temp_mb_file = temp_scene_path(settings, os.path.dirname(scene_file), file_name)
+        os.makedirs(os.path.dirname(temp_mb_file), exist_ok = True)
+        egg_file = os.path.join(os.path.dirname(temp_mb_file), file_name + ".egg")
+        # The scene was just opened, so it is the file on disk unless the tagging rules changed it
+        unchanged = settings.reuse_scene_file and not result.get("tagged")
+        type_ids = type_ids or object_type_ids()
+        with legacy_layout(cmds, type_ids) as expanded:
+            if unchanged and not expanded:
+                # maya2egg can read the file on disk as it is
+                temp_mb_file = scene_file
+            elif unchanged:
+                # A copy with the eggObjectTypesN attributes, kept for the next export of the same file
+                with run.stage("save_mb"):
+                    save_scene_copy(cmds, temp_mb_file, scene_file, type_ids)
+            else:
+                forget_stamp(temp_mb_file)
+                with run.stage("save_mb"):
+                    cmds.file(temp_mb_file, exportAll = True, type = "mayaBinary", options = "v=1", force = True)
+        run.add_file("mb", temp_mb_file)
+
+        # The window adds missing DCS flags and restarts the export, headless there is no one to ask
+        for joint in settings.force_joints:
+            if "dcs" not in read_types(cmds, joint):
+                result["warnings"].append(f"Force joint {joint} has no DCS egg-object-type")
+
+        with run.stage("args"):
+            args = maya2egg_args(settings, file_name)
+        commands = [maya2egg_command(settings, temp_mb_file, egg_file, args)]
+        cache_key = None
+        # Texture copies (-pc) are only made by running maya2egg
+        if settings.use_build_cache and cache is not None and not maya2egg_copies_textures(args):
+            cache_key = cache.maya2egg_key(temp_mb_file, egg_file, args, scene_references(cmds))
+            if (settings.overwrite or not os.path.exists(egg_file)) and cache.fetch(cache_key, egg_file):
+                commands = []
+                result["cached"] = True
+
+        outputs = [egg_file]
+        stages = ["maya2egg"] * len(commands)
+        bam_jobs = []
+        if settings.output_bam:
+            for target, target_mode in egg2bam_targets(settings, egg_file):
+                bam_cmd, bam_file = egg2bam_command(target, egg_file, target_mode)
+                bam_job = ConversionJob(f"{file_name} {target.bam_version}", [bam_cmd], [bam_file])
+                bam_jobs.append((target.bam_version, bam_job))
+        if not settings.bam_fan_out:
+            # A single bam is converted by the same job, right after maya2egg
+            for _, bam_job in bam_jobs:
+                commands.extend(bam_job.commands)
+                outputs.extend(bam_job.outputs)
+                stages.append("egg2bam")
+            bam_jobs = []
+
+        job = run_job(ConversionJob(file_name, commands, outputs))
+        run.cached = bool(result.get("cached"))
+        run.add_job(job, stages)
+        for label, path in zip(("egg", "bam"), outputs):
+            run.add_file(label, path)
+        if cache_key and job.succeeded and not result.get("cached"):
+            cache.store(cache_key, egg_file)
+
+        if job.succeeded and bam_jobs:
+            # maya2egg ran once, the egg2bam of every bam version runs at the same time
+            for _, bam_job in bam_jobs:
+                os.makedirs(os.path.dirname(bam_job.outputs[0]), exist_ok = True)
+            JobPool([bam_job for _, bam_job in bam_jobs], pool_size()).wait(0.05)
+            for bam_version, bam_job in bam_jobs:
+                run.add_job(bam_job, ["egg2bam"])
+                run.add_file(f"bam {bam_version}", bam_job.outputs[0])
+                outputs.extend(bam_job.outputs)
+
+        every_job = [job] + [bam_job for _, bam_job in bam_jobs]
+        failed = next((failed_job for failed_job in every_job if not failed_job.succeeded), None)
+        result.update(
+            status = "failed" if failed else "ok",
+            returncode = failed.returncode if failed else job.returncode,
+            outputs = [] if failed else outputs,
+            temp_file = temp_mb_file,
+        )
+        if failed:
+            result["error"] = failed.stderr.strip()[-2000:] or failed.stdout.strip()[-2000:]
+    except Exception as error:
+        result["error"] = str(error)
+    run.finish(result["status"])
+    result["elapsed"] = time.time() - start
+    return result
+
+
+def run_worker(profile, output_dir=""):
+    """
+    Worker loop: reads scene paths from stdin, one per line, and answers each with a result line.
+    An empty line or end of input stops the worker.
+    """
+    import maya.standalone
+    maya.standalone.initialize(name = "python")
+
+    settings = batch_settings(ExportSettings.load(profile), output_dir)
+    cache = BuildCache() if settings.use_build_cache else None
+    history = MetricsHistory()
+    type_ids = object_type_ids()
+    try:
+        for line in sys.stdin:
+            scene_file = line.strip()
+            if not scene_file:
+                break
+            result = export_scene(scene_file, settings, cache, history, type_ids)
+            sys.stdout.write(RESULT_PREFIX + json.dumps(result) + "\n")
+            sys.stdout.flush()
+    finally:
+        maya.standalone.uninitialize()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Export Maya scenes to Panda files with a pool of mayapy workers.")
+    parser.add_argument("scenes", nargs = "*", help = "Scene files, directories or glob patterns")
+    parser.add_argument("--profile", required = True, help = "Export profile saved from the Panda exporter")
+    parser.add_argument("--workers", type = int, default = 0, help = "Number of mayapy workers")
+    parser.add_argument("--mayapy", default = "", help = "mayapy executable, defaults to the running interpreter")
+    parser.add_argument("--output-dir", default = "", help = "Write every export here instead of the profile path")
+    parser.add_argument("--summary", default = "", help = "Write the JSON summary to this file")
+    parser.add_argument("--log-dir", default = "", help = "Keep the Maya output of each worker in this directory")
+    parser.add_argument("--worker", action = "store_true", help = argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+
+    if options.worker:
+        run_worker(options.profile, options.output_dir)
+        return 0
+
+    scenes = expand_scenes(options.scenes)
+    if not scenes:
+        parser.error("no .mb or .ma scenes found")
+
+    summary = run_batch(scenes, options.profile, options.workers, options.mayapy, options.output_dir, options.log_dir)
+    text = json.dumps(summary, indent = 4)
+    if options.summary:
+        with open(options.summary, "w") as handle:
+            handle.write(text)
+        print(f"Exported {summary['succeeded']} of {summary['total']} scenes, summary: {options.summary}")
+    else:
+        print(text)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+Content-addressed cache for files produced by the Panda tools.
+
+Entries are keyed by a hash of the input file plus everything else that affects the output
+(command line arguments, tool version, ...), so a re-export of an unchanged scene can copy the
+previous result instead of running maya2egg again, and importing a bam that was imported before
+skips bam2egg. Files saved from a scene, like the copy of a saved scene that export writes with
+its egg-object-types, are reused the same way for as long as the scene file has not changed.
+This module does not import pymel.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+
+CACHE_DIR_ENV = "MP_PY_CACHE_DIR"
+HASH_CHUNK_SIZE = 1024 * 1024
+# Maya writes its save timestamp near the start of every scene file
+HEADER_SCAN_SIZE = 64 * 1024
+# Written next to a file whose sources are recorded with mark_current
+STAMP_SUFFIX = ".source"
+
+
+def default_cache_dir():
+    """
+    Returns the cache directory, which can be overridden with the MP_PY_CACHE_DIR environment variable.
+    """
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".mayapanda", "cache")
+
+
+def hash_file(path, header_filter=None):
+    """
+    Returns the sha256 hex digest of a file, read in chunks.
+
+    :param path: File to hash.
+    :param header_filter: Optional function applied to the first HEADER_SCAN_SIZE bytes before hashing.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        head = handle.read(HEADER_SCAN_SIZE)
+        digest.update(header_filter(head) if header_filter else head)
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _strip_maya_save_stamp(head):
+    # Maya ASCII: "//Last modified: Thu, Oct 17, 2026 10:00:00 AM"
+    head = re.sub(rb"^//Last modified:[^\n]*", b"", head, count = 1, flags = re.MULTILINE)
+    # Maya binary: the CHNG chunk of the HEAD group holds the same date as a null terminated string.
+    # Drop everything from the chunk size up to the terminator, as the size changes with the date length.
+    index = head.find(b"CHNG")
+    if index != -1:
+        end = head.find(b"\0", head.find(b" ", index))
+        if end != -1:
+            head = head[:index + 4] + head[end:]
+    return head
+
+
+def maya_file_digest(path):
+    """
+    Hashes a Maya scene file, ignoring the save timestamp Maya writes into every file,
+    so that exporting the same unchanged scene twice gives the same digest.
+    """
+    return hash_file(path, _strip_maya_save_stamp)
+
+
+def tool_fingerprint(executable):
+    """
+    Identifies the installed version of a Panda tool by its resolved path, size and modification time.
+    Upgrading or swapping the Panda3D SDK changes the fingerprint without having to launch the tool.
+    """
+    resolved = shutil.which(executable)
+    if not resolved:
+        return executable
+    stat = os.stat(resolved)
+    return f"{os.path.realpath(resolved)}|{stat.st_size}|{int(stat.st_mtime)}"
+
+
+def scene_references(cmds):
+    """
+    :return: The files the open scene references, nested references included, without copy numbers.
+    """
+    files = []
+    pending = list(cmds.file(query = True, reference = True) or [])
+    while pending:
+        reference = pending.pop(0)
+        path = re.sub(r"\{\d+\}$", "", reference)
+        if path not in files:
+            files.append(path)
+            pending.extend(cmds.file(reference, query = True, reference = True) or [])
+    return files
+
+
+def source_stamp(paths, *parts):
+    """
+    Identifies the files an output is written from by their paths, sizes and modification times.
+
+    :param parts: Anything else the output depends on, as JSON serializable values.
+    """
+    files = []
+    for path in paths:
+        stat = os.stat(path) if os.path.isfile(path) else None
+        files.append([os.path.abspath(path), stat.st_size if stat else -1, stat.st_mtime_ns if stat else -1])
+    return json.dumps([files, list(parts)], sort_keys = True)
+
+
+def is_current(output, stamp):
+    """
+    :return: Whether output exists and was written from the sources of stamp, see mark_current.
+    """
+    try:
+        with open(output + STAMP_SUFFIX) as handle:
+            return handle.read() == stamp and os.path.isfile(output)
+    except OSError:
+        return False
+
+
+def mark_current(output, stamp):
+    """
+    Records that output was written from the sources of stamp, next to it.
+    """
+    with open(output + STAMP_SUFFIX, "w") as handle:
+        handle.write(stamp)
+
+
+def forget_stamp(output):
+    """
+    Removes the record of mark_current, before output is replaced by something else.
+    """
+    if os.path.exists(output + STAMP_SUFFIX):
+        os.remove(output + STAMP_SUFFIX)
+
+
+def save_scene_copy(cmds, mb_file, scene_file, *parts):
+    """
+    Saves the whole open scene to mb_file, unless the copy there was saved from the same scene file
+    and references before. The open scene has to be scene_file as it is on disk, apart from changes
+    that are made again for every copy, like the eggObjectTypesN attributes of legacy_layout.
+
+    :param parts: Anything else the copy depends on, see source_stamp.
+    :return: Whether the copy had to be written.
+    """
+    stamp = source_stamp([scene_file] + scene_references(cmds), *parts)
+    if is_current(mb_file, stamp):
+        return False
+    forget_stamp(mb_file)
+    cmds.file(mb_file, exportAll = True, type = "mayaBinary", options = "v=1", force = True)
+    mark_current(mb_file, stamp)
+    return True
+
+
+class BuildCache(object):
+    """
+    Stores build outputs on disk under the hash of their inputs.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        # (path, size, mtime) -> digest, node exports can share one scene file
+        self._digests = {}
+
+    @staticmethod
+    def key(*parts):
+        """
+        Combines the given inputs (digests, argument strings, fingerprints...) into a cache key.
+        """
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def maya2egg_key(self, mb_file, egg_file, args, references=()):
+        """
+        Cache key of a maya2egg export.
+        Texture paths can be written relative to the egg, so the output directory is part of the key too.
+
+        :param references: The files the scene references, see scene_references. maya2egg loads them from disk,
+                           so they are hashed like the scene file.
+        """
+        return self.key(
+            self.file_digest(mb_file),
+            [[os.path.abspath(path), self.file_digest(path) if os.path.isfile(path) else None] for path in references],
+            args,
+            tool_fingerprint(args.split()[0]),
+            os.path.dirname(os.path.abspath(egg_file)),
+        )
+
+    def bam2egg_key(self, bam_file, bam2egg_exe, root):
+        """
+        Cache key of a bam2egg conversion.
+        bam2egg looks the bam's textures up from its working directory, the phase root, and leaves out
+        the ones it cannot find, so that directory is part of the key too.
+        """
+        return self.key(
+            self.file_digest(bam_file, hash_file),
+            tool_fingerprint(bam2egg_exe.split()[0]),
+            os.path.abspath(root),
+        )
+
+    def file_digest(self, path, digest=maya_file_digest):
+        """
+        maya_file_digest (or the given digest function), remembered until the file changes.
+        """
+        stat = os.stat(path)
+        stamp = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, digest.__name__)
+        if stamp not in self._digests:
+            self._digests[stamp] = digest(path)
+        return self._digests[stamp]
+
+    def entry_path(self, key, extension=""):
+        return os.path.join(self.cache_dir, key[:2], key + extension)
+
+    def fetch(self, key, dest, link=False):
+        """
+        Copies a cached output to dest.
+
+        :param key: The cache key.
+        :param dest: Path to write the output to. Replaced if it already exists.
+        :param link: Hard-link instead of copying when the file system allows it.
+                     The destination then shares its data with the cache entry, so it must not be edited in place.
+        :return: True on a cache hit.
+        """
+        entry = self.entry_path(key, os.path.splitext(dest)[1])
+        if not os.path.isfile(entry):
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok = True)
+        if os.path.lexists(dest):
+            os.remove(dest)
+        if link:
+            try:
+                os.link(entry, dest)
+                return True
+            except OSError:
+                pass
+        shutil.copyfile(entry, dest)
+        return True
+
+    def store(self, key, src):
+        """
+        Adds a freshly built output to the cache.
+        The entry is written to a temporary file first, so a concurrent fetch never sees a partial file.
+        """
+        if not os.path.isfile(src):
+            return None
+        entry = self.entry_path(key, os.path.splitext(src)[1])
+        os.makedirs(os.path.dirname(entry), exist_ok = True)
+        handle, temp_path = tempfile.mkstemp(dir = os.path.dirname(entry))
+        os.close(handle)
+        try:
+            shutil.copyfile(src, temp_path)
+            os.replace(temp_path, entry)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return entry
+
+    def clear(self):
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
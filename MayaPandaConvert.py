@@ -0,0 +1,141 @@
+"""
+Batch conversion of Panda files.
+
+Converts many .egg files to .bam at once, with the egg2bam options of the exporter window or an
+export profile (see egg2bam_command in MayaPandaSettings.py). A .bam that is newer than its .egg is
+left alone. The conversions run as a pool of egg2bam processes, one per core.
+
+"Egg File 2 Bam" in the exporter window converts the chosen files and lists their progress as they
+finish, the command line converts files and directory trees:
+
+    python MayaPandaConvert.py [--profile profile.json] [--workers 8] [--force] [--conversion-worker] eggs/ props/*.egg
+
+With a custom output path in the profile, the bams of a directory tree keep its folder structure
+below that path.
+This module does not import pymel.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+
+from dataclasses import replace
+
+from MayaPandaJobs import JobPool, pool_size
+from MayaPandaSettings import ExportSettings, egg2bam_targets
+from MayaPandaWorker import WorkerClient, egg2bam_job
+
+EGG_EXTENSIONS = (".egg",)
+
+
+def expand_files(patterns, extensions):
+    """
+    Expands files, directory trees and glob patterns into the files with one of the extensions.
+
+    :return: Sorted list of (file, root) pairs. root is the directory given for files found in a
+             directory tree, else the file's own directory.
+    """
+    found = {}
+    for pattern in patterns:
+        for path in glob.glob(pattern, recursive = True) or [pattern]:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                for directory, _, names in os.walk(path):
+                    for name in names:
+                        if name.lower().endswith(extensions):
+                            found.setdefault(os.path.join(directory, name), path)
+            elif path.lower().endswith(extensions) and os.path.isfile(path):
+                found.setdefault(path, os.path.dirname(path))
+    return sorted(found.items())
+
+
+def is_up_to_date(output, inputs):
+    """
+    :return: Whether output exists and is at least as new as every one of the inputs.
+    """
+    try:
+        output_time = os.path.getmtime(output)
+        return all(os.path.getmtime(path) <= output_time for path in inputs)
+    except OSError:
+        return False
+
+
+def egg2bam_jobs(eggs, settings, force=False, worker=None):
+    """
+    Builds the egg2bam jobs of a batch.
+
+    :param eggs: (egg file, root) pairs, see expand_files.
+    :param settings: ExportSettings with the egg2bam options. Its custom output path, if any, is
+                     where the bams go, mirroring the folders below each root. With bam_fan_out,
+                     every egg gets a bam per version, in a folder per version.
+    :param force: Also convert eggs whose bam is up to date.
+    :param worker: WorkerClient to convert in when the settings enable the conversion worker.
+    :return: The jobs to run and the (egg, bam) pairs that were up to date.
+    """
+    jobs = []
+    skipped = []
+    for egg_file, root in eggs:
+        output_path = ""
+        if settings.custom_output and settings.output_path:
+            output_path = os.path.normpath(
+                os.path.join(settings.output_path, os.path.relpath(os.path.dirname(egg_file), root))
+            )
+        # Every bam keeps the name of its egg
+        egg_settings = replace(settings, filename = "", output_path = output_path)
+        for target, target_mode in egg2bam_targets(egg_settings, egg_file, 1):
+            name = os.path.basename(egg_file)
+            if settings.bam_fan_out:
+                name = f"{target.bam_version} {name}"
+            job, bam_file = egg2bam_job(target, egg_file, target_mode, worker, name)
+            if not force and is_up_to_date(bam_file, [egg_file]):
+                skipped.append((egg_file, bam_file))
+                continue
+            os.makedirs(os.path.dirname(bam_file), exist_ok = True)
+            jobs.append(job)
+    return jobs, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Convert .egg files to .bam with a pool of egg2bam processes.")
+    parser.add_argument("files", nargs = "+", help = "Egg files, directory trees or glob patterns")
+    parser.add_argument("--profile", default = "", help = "Export profile with the egg2bam options")
+    parser.add_argument("--workers", type = int, default = 0, help = "Concurrent egg2bam processes, defaults to the cores")
+    parser.add_argument("--force", action = "store_true", help = "Also convert eggs whose bam is up to date")
+    parser.add_argument(
+        "--conversion-worker", action = "store_true", help = "Convert in one panda3d worker process, see MayaPandaWorker.py"
+    )
+    options = parser.parse_args(argv)
+
+    settings = ExportSettings.load(options.profile) if options.profile else ExportSettings()
+    if options.conversion_worker:
+        settings = replace(settings, conversion_worker = True)
+    eggs = expand_files(options.files, EGG_EXTENSIONS)
+    if not eggs:
+        parser.error("no .egg files found")
+    replied = threading.Event()
+    worker = WorkerClient(on_reply = replied.set) if settings.conversion_worker else None
+    jobs, skipped = egg2bam_jobs(eggs, settings, options.force, worker)
+    print(f"{len(jobs)} to convert, {len(skipped)} up to date.")
+
+    start = time.time()
+    pool = JobPool(jobs, pool_size(options.workers or None))
+    while not pool.done():
+        for job in pool.poll():
+            status = "ok" if job.succeeded else f"FAILED (exit code {job.returncode})"
+            print(f"{status:<24} {job.elapsed:6.2f}s  {job.outputs[0]}")
+            if not job.succeeded and job.stderr.strip():
+                print(job.stderr.rstrip())
+        replied.wait(0.05)
+        replied.clear()
+    if worker is not None:
+        worker.close()
+    failed = [job for job in pool.finished if not job.succeeded]
+    print(f"Converted {len(jobs) - len(failed)} of {len(jobs)} in {time.time() - start:.2f}s, {len(failed)} failed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
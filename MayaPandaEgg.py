@@ -0,0 +1,528 @@
+"""
+Streaming reader for .egg files.
+
+The file is memory-mapped and read as a stream of events (groups, vertex pools, primitives, textures, ...),
+so large exports can be inspected without building the whole egg tree in memory. Vertex pools are not
+parsed while streaming: a VertexPool event only records where the pool is, and its vertices are read
+when asked for, as a NumPy structured array (or as plain tuples when NumPy is not installed).
+The array is parsed a few megabytes of the pool at a time, straight from the text into NumPy,
+without a Python object per vertex.
+This module does not import pymel.
+
+    with EggReader("model.egg") as reader:
+        for event in reader.events():
+            if event.kind == "vertex_pool":
+                positions = event.data.array()["position"]
+"""
+
+import mmap
+import re
+import warnings
+
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Entries that open a node of the scene graph
+GROUP_ENTRIES = {"group", "instance", "joint"}
+# Entries made of vertex references
+PRIMITIVE_ENTRIES = {"polygon", "trianglestrip", "trianglefan", "patch", "line", "linestrip", "pointlight"}
+# Render attributes of groups and primitives
+ATTRIBUTE_ENTRIES = {"scalar", "bface", "objecttype", "tag", "billboard", "collide", "dcs", "model", "decal"}
+
+# Comments, <Entry> tags, braces, quoted strings and bare words
+TOKEN_RE = re.compile(rb'//[^\n]*|<([^>]*)>|([{}])|"((?:[^"\\]|\\.)*)"|([^\s{}<"]+)')
+# Only what matters for finding the closing brace of an entry
+BRACE_RE = re.compile(rb'//[^\n]*|"(?:[^"\\]|\\.)*"|([{}])')
+# The rest of an entry body nested at most three deep, without strings or comments. Covers nearly every primitive.
+# Only used on primitives: the regex engine keeps a backtracking state per character, too much for a vertex pool.
+SIMPLE_BODY_RE = re.compile(rb'(?:[^{}"/]|\{(?:[^{}"/]|\{[^{}"/]*\})*\})*\}')
+VERTEX_RE = re.compile(rb"<Vertex>", re.IGNORECASE)
+# Pieces of vertices and primitives. These are matched directly, as tokenizing millions of them is slow.
+NUMBER_RE = re.compile(rb"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+VERTEX_HEAD_RE = re.compile(rb"<Vertex>\s*(\d+)\s*\{([^<}]*)", re.IGNORECASE)
+NORMAL_RE = re.compile(rb"<Normal>\s*\{([^<}]*)", re.IGNORECASE)
+# The default UV set, which has no name. Other sets are <UV> name { ... }, see _uv_re.
+UV_RE = re.compile(rb"<UV>\s*\{([^<}]*)", re.IGNORECASE)
+RGBA_RE = re.compile(rb"<RGBA>\s*\{([^<}]*)", re.IGNORECASE)
+VERTEX_REF_RE = re.compile(rb"<VertexRef>\s*\{([^<}]*)(?:<Ref>\s*\{\s*\"?([^}\"]*?)\"?\s*\})?", re.IGNORECASE)
+TREF_RE = re.compile(rb"<TRef>\s*\{\s*\"?([^}\"]*?)\"?\s*\}", re.IGNORECASE)
+MREF_RE = re.compile(rb"<MRef>\s*\{\s*\"?([^}\"]*?)\"?\s*\}", re.IGNORECASE)
+PRIMITIVE_ATTRIBUTE_RE = re.compile(
+    rb"<(Scalar|BFace|Tag|ObjectType)>\s*\"?([^{\s\"]*)\"?\s*\{\s*([^}]*?)\s*\}", re.IGNORECASE
+)
+
+# VertexPool.array() turns a piece of a pool into one stream of numbers: every <Vertex>, <Normal>,
+# <UV> of the read UV set and <RGBA> becomes a mark value no egg number reaches, any other entry
+# (<Tangent>, <Dxyz>, other UV sets...) an "other" mark, and braces become spaces. Each entry's numbers follow its mark.
+VERTEX_MARK, NORMAL_MARK, UV_MARK, RGBA_MARK, OTHER_MARK = 1e300, 2e300, 3e300, 4e300, 5e300
+# The spelling maya2egg and egg-optchar write, replaced without the regex engine
+PLAIN_MARKS = ((b"<Vertex>", b" 1e300 "), (b"<Normal> {", b" 2e300 "), (b"<UV> {", b" 3e300 "), (b"<RGBA> {", b" 4e300 "))
+# Everything else, only run when something is left after PLAIN_MARKS
+STREAM_MARKS = (
+    (re.compile(rb"//[^\n]*"), b" "),
+    (re.compile(rb"<Vertex>", re.IGNORECASE), b" 1e300 "),
+    (re.compile(rb"<Normal>[^{]*\{", re.IGNORECASE), b" 2e300 "),
+    (re.compile(rb"<UV>\s*\{", re.IGNORECASE), b" 3e300 "),
+    (re.compile(rb"<RGBA>[^{]*\{", re.IGNORECASE), b" 4e300 "),
+    (re.compile(rb"<[^>]*>[^{]*\{"), b" 5e300 "),
+)
+BRACES_TO_SPACES = bytes.maketrans(b"{}", b"  ")
+# Bodies longer than this are scanned for their closing brace in chunks of BRACE_CHUNK_SIZE bytes
+BRACE_FOLLOW_SIZE = 16 * 1024
+BRACE_CHUNK_SIZE = 1024 * 1024
+# Bytes of a vertex pool parsed at once by VertexPool.array()
+ARRAY_CHUNK_SIZE = 8 * 1024 * 1024
+# (column of VertexPool.vertices(), field, mark, size) of the optional vertex attributes
+VERTEX_ATTRIBUTES = ((2, "normal", NORMAL_MARK, 3), (3, "uv", UV_MARK, 2), (4, "rgba", RGBA_MARK, 4))
+
+COMMENT, TAG, BRACE, STRING, WORD = range(5)
+
+EggEvent = namedtuple("EggEvent", ["kind", "name", "depth", "data"])
+EggEvent.__doc__ = """
+One step of EggReader.events().
+
+kind is one of:
+    "group": a <Group>, <Instance> or <Joint> opens. data is the entry type in lower case.
+    "end_group": the group closes.
+    "vertex_pool": data is a VertexPool.
+    "primitive": data is a Primitive.
+    "texture": data is the texture filename.
+    "material": data is a dictionary of the material's scalars.
+    "attribute": a render attribute of the enclosing group, like <Scalar> alpha { blend }.
+                 name is the attribute and data its value.
+    "entry": any other entry, like <CoordinateSystem>. data is its text content, None for large entries.
+"""
+
+Primitive = namedtuple("Primitive", ["kind", "vertices", "pool", "textures", "material", "attributes"])
+Primitive.__doc__ = """
+kind: The entry type in lower case, e.g. "polygon".
+vertices: Vertex indices into the pool.
+pool: Name of the vertex pool.
+textures: Names of the referenced textures, in order.
+material: Name of the referenced material, or "".
+attributes: Dictionary of the primitive's own render attributes, e.g. {"bface": "1"}.
+"""
+
+# Entries whose text content is returned with an "entry" event
+MAX_ENTRY_TEXT = 4096
+
+
+def _tokens(buffer, start, end):
+    """
+    Yields (kind, value, end position) tokens of buffer[start:end], without comments.
+    """
+    for match in TOKEN_RE.finditer(buffer, start, end):
+        tag, brace, string, word = match.groups()
+        if tag is not None:
+            yield TAG, tag.decode(errors = "replace").strip(), match.end()
+        elif brace is not None:
+            yield BRACE, brace, match.end()
+        elif string is not None:
+            yield STRING, string.decode(errors = "replace"), match.end()
+        elif word is not None:
+            yield WORD, word.decode(errors = "replace"), match.end()
+
+
+def _find_closing_brace(buffer, start, end, simple=False):
+    """
+    :param start: Position just after an opening brace.
+    :param simple: Try SIMPLE_BODY_RE first, for short entries.
+    :return: Position just after the matching closing brace.
+    """
+    if simple:
+        match = SIMPLE_BODY_RE.match(buffer, start, end)
+        if match is not None:
+            return match.end()
+    # Short bodies are followed brace by brace, long ones like vertex pools a chunk at a time with NumPy
+    position, depth = _follow_braces(buffer, start, end, 1, start + BRACE_FOLLOW_SIZE if numpy is not None else end)
+    while depth and position < end:
+        position, depth = _skip_brace_chunks(buffer, position, end, depth)
+        if depth and position < end:
+            # A chunk with strings or comments, whose braces do not all count
+            position, depth = _follow_braces(buffer, position, end, depth, position + BRACE_CHUNK_SIZE)
+    if depth:
+        raise ValueError(f"Unbalanced braces in egg file after byte {start}")
+    return position
+
+
+def _follow_braces(buffer, start, end, depth, until):
+    """
+    Follows the braces from start, up to the first token after until.
+
+    :return: (position, depth) where it stopped. A depth of 0 means the body closed just before position.
+    """
+    for match in BRACE_RE.finditer(buffer, start, end):
+        if match.start() >= until:
+            return match.start(), depth
+        brace = match.group(1)
+        if brace == b"{":
+            depth += 1
+        elif brace == b"}":
+            depth -= 1
+            if depth == 0:
+                return match.end(), 0
+    return end, depth
+
+
+def _skip_brace_chunks(buffer, start, end, depth):
+    """
+    Follows the braces from start with NumPy, up to the first chunk with a string or comment in it.
+
+    :return: (position, depth) where it stopped, like _follow_braces.
+    """
+    while start < end:
+        chunk = buffer[start:min(start + BRACE_CHUNK_SIZE, end)]
+        if b'"' in chunk or b"/" in chunk:
+            break
+        codes = numpy.frombuffer(chunk, dtype = numpy.uint8)
+        braces = numpy.flatnonzero((codes == ord("{")) | (codes == ord("}")))
+        if len(braces):
+            depths = depth + numpy.cumsum(numpy.where(codes[braces] == ord("{"), 1, -1))
+            closed = numpy.flatnonzero(depths == 0)
+            if len(closed):
+                return start + int(braces[closed[0]]) + 1, 0
+            depth = int(depths[-1])
+        start += len(chunk)
+    return start, depth
+
+
+def _parse_body(tokens):
+    """
+    Parses entry tokens (up to the closing brace) into a nested list of values and (tag, name, children) tuples.
+    """
+    values = []
+    for kind, value, _ in tokens:
+        if kind == BRACE:
+            if value == b"}":
+                return values
+            values.append(_parse_body(tokens))
+        elif kind == TAG:
+            name = ""
+            children = []
+            for child_kind, child_value, _ in tokens:
+                if child_kind == BRACE and child_value == b"{":
+                    children = _parse_body(tokens)
+                    break
+                name = child_value
+            values.append((value.lower(), name, children))
+        else:
+            values.append(value)
+    return values
+
+
+def _scalars(children):
+    return {name: " ".join(str(value) for value in body) for tag, name, body in _entries(children) if tag == "scalar"}
+
+
+def _entries(children):
+    return (child for child in children if isinstance(child, tuple))
+
+
+def _attribute_numbers(pattern, text, size):
+    match = pattern.search(text)
+    if match is None:
+        return None
+    return [float(number) for number in NUMBER_RE.findall(match.group(1))[:size]]
+
+
+class VertexPool(object):
+    """
+    A vertex pool, read from the mapped file on demand.
+    """
+
+    def __init__(self, reader, name, start, end):
+        self.reader = reader
+        self.name = name
+        self.start = start  # Just after the opening brace
+        self.end = end  # Just after the closing brace
+        self._count = None
+
+    @property
+    def count(self):
+        """
+        Number of vertices, counted without parsing them.
+        """
+        if self._count is None:
+            self._count = len(VERTEX_RE.findall(self.reader.buffer, self.start, self.end))
+        return self._count
+
+    def vertices(self, uv_name=""):
+        """
+        Yields (index, position, normal, uv, rgba) for every vertex. Missing values are None.
+
+        :param uv_name: The UV set to read. The default set, which maya2egg writes without a name, if not given.
+        """
+        return _read_vertices(self.reader.buffer, self.start, self.end, uv_name)
+
+    def chunks(self, size=ARRAY_CHUNK_SIZE):
+        """
+        Splits the pool into (start, end) byte ranges of about size bytes that begin at a <Vertex>.
+        """
+        buffer = self.reader.buffer
+        start = self.start
+        while start < self.end:
+            end = self.end
+            if start + size < self.end:
+                match = VERTEX_RE.search(buffer, start + size, self.end)
+                end = match.start() if match else self.end
+            yield start, end
+            start = end
+
+    def array(self, uv_name=""):
+        """
+        Reads the pool into a NumPy structured array with the fields index and position,
+        plus normal, uv and rgba when any vertex of the pool has them.
+
+        :param uv_name: The UV set of the uv field, see vertices().
+        """
+        if numpy is None:
+            raise ImportError("NumPy is needed for VertexPool.array(), use VertexPool.vertices() instead")
+        buffer = self.reader.buffer
+        chunks = []
+        for start, end in self.chunks():
+            columns = _vertex_columns(buffer[start:end], uv_name)
+            if columns is None:
+                # Something the number stream cannot hold, like a quoted string: read vertex by vertex
+                columns = _columns_of(list(_read_vertices(buffer, start, end, uv_name)))
+            chunks.append(columns)
+
+        fields = [("index", "i4"), ("position", "f8", (3,))]
+        for _, name, _, size in VERTEX_ATTRIBUTES:
+            if any(name in columns for columns in chunks):
+                fields.append((name, "f4", (size,)))
+        pool = numpy.zeros(sum(len(columns["index"]) for columns in chunks), dtype = fields)
+        offset = 0
+        for columns in chunks:
+            count = len(columns["index"])
+            for name, values in columns.items():
+                pool[name][offset:offset + count] = values
+            offset += count
+        return pool
+
+
+def _uv_re(uv_name):
+    """
+    :return: The regex of the <UV> entries of a UV set, capturing their numbers. "" is the default set.
+    """
+    if not uv_name:
+        return UV_RE
+    return re.compile(rb'<UV>\s*"?' + re.escape(uv_name.encode()) + rb'"?\s*\{([^<}]*)', re.IGNORECASE)
+
+
+def _read_vertices(buffer, start, end, uv_name=""):
+    uv_re = _uv_re(uv_name)
+    starts = [match.start() for match in VERTEX_RE.finditer(buffer, start, end)]
+    for vertex_start, vertex_end in zip(starts, starts[1:] + [end]):
+        text = buffer[vertex_start:vertex_end]
+        head = VERTEX_HEAD_RE.match(text)
+        if head is None:
+            continue
+        yield (
+            int(head.group(1)),
+            [float(number) for number in NUMBER_RE.findall(head.group(2))[:3]],
+            _attribute_numbers(NORMAL_RE, text, 3),
+            _attribute_numbers(uv_re, text, 2),
+            _attribute_numbers(RGBA_RE, text, 4),
+        )
+
+
+def _columns_of(vertices):
+    """
+    :return: The arrays of _vertex_columns, from (index, position, normal, uv, rgba) tuples.
+    """
+    columns = {
+        "index": numpy.array([vertex[0] for vertex in vertices], dtype = "i4"),
+        "position": numpy.array([(vertex[1] + [0.0, 0.0, 0.0])[:3] for vertex in vertices], dtype = "f8"),
+    }
+    for column, name, _, size in VERTEX_ATTRIBUTES:
+        if any(vertex[column] is not None for vertex in vertices):
+            columns[name] = numpy.array(
+                [((vertex[column] or []) + [0.0] * size)[:size] for vertex in vertices], dtype = "f4"
+            )
+    return columns
+
+
+def _gather(numbers, starts, lengths, size):
+    """
+    :return: (len(starts), size) array of numbers[start + i] for i below the length, zero above it.
+    """
+    offsets = numpy.arange(size)
+    indices = numpy.minimum(starts[:, None] + offsets, len(numbers) - 1)
+    return numpy.where(offsets < lengths[:, None], numbers[indices], 0.0)
+
+
+def _vertex_columns(text, uv_name=""):
+    """
+    Parses the vertices of a piece of a vertex pool, see STREAM_MARKS.
+
+    :param uv_name: The UV set of the uv column, "" for the default set.
+    :return: Dictionary of field name to array, with only the attributes some vertex has,
+             or None when the text holds something other than numbers and entries.
+    """
+    if uv_name:
+        # The named set takes the UV mark, the default set becomes an "other" entry
+        text = re.sub(rb"<UV>\s*\{", b" 5e300 ", text, flags = re.IGNORECASE)
+        text = _uv_re(uv_name).sub(lambda match: b" 3e300 " + match.group(1), text)
+    for entry, mark in PLAIN_MARKS:
+        text = text.replace(entry, mark)
+    if b"<" in text or b"//" in text:
+        for pattern, mark in STREAM_MARKS:
+            text = pattern.sub(mark, text)
+    text = text.translate(BRACES_TO_SPACES)
+    with warnings.catch_warnings():
+        # Older NumPy warns about text it cannot read, newer NumPy raises ValueError
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            numbers = numpy.fromstring(text, sep = " ")
+        except (ValueError, DeprecationWarning):
+            return None
+
+    marks = numpy.flatnonzero(numbers >= VERTEX_MARK)
+    kinds = numbers[marks]
+    # How many numbers follow each mark
+    lengths = numpy.diff(numpy.append(marks, len(numbers))) - 1
+    is_vertex = kinds == VERTEX_MARK
+    # The vertex every mark belongs to
+    owners = numpy.cumsum(is_vertex) - 1
+    vertex_marks = marks[is_vertex]
+    if numpy.any(lengths[is_vertex] < 1):
+        # A <Vertex> without its index
+        return None
+
+    count = len(vertex_marks)
+    columns = {
+        "index": numbers[vertex_marks + 1].astype("i4"),
+        "position": _gather(numbers, vertex_marks + 2, lengths[is_vertex] - 1, 3),
+    }
+    for _, name, mark, size in VERTEX_ATTRIBUTES:
+        selected = numpy.flatnonzero((kinds == mark) & (owners >= 0))
+        if not len(selected):
+            continue
+        # Only the first, should an entry repeat within a vertex
+        vertices, first = numpy.unique(owners[selected], return_index = True)
+        selected = selected[first]
+        values = numpy.zeros((count, size), dtype = "f4")
+        values[vertices] = _gather(numbers, marks[selected] + 1, lengths[selected], size)
+        columns[name] = values
+    return columns
+
+
+class EggReader(object):
+    """
+    Memory-maps an egg file and streams its contents as EggEvents.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._handle = open(path, "rb")
+        try:
+            self.buffer = mmap.mmap(self._handle.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self.buffer = b""
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def events(self):
+        """
+        Yields the EggEvents of the file in order.
+        """
+        buffer = self.buffer
+        end = len(buffer)
+        position = 0
+        # Open groups, as (name, depth)
+        groups = []
+
+        while True:
+            match = TOKEN_RE.search(buffer, position, end)
+            if match is None:
+                break
+            position = match.end()
+            tag, brace, _, _ = match.groups()
+
+            if brace == b"}":
+                # Closes the innermost group, everything else is read as a whole
+                if groups:
+                    name, depth = groups.pop()
+                    yield EggEvent("end_group", name, depth, None)
+                continue
+            if tag is None:
+                continue
+
+            tag = tag.decode(errors = "replace").strip()
+            entry = tag.lower()
+            name, body_start = self._entry_name(position, end)
+            if body_start is None:
+                break
+            depth = len(groups)
+
+            if entry in GROUP_ENTRIES:
+                groups.append((name, depth))
+                position = body_start
+                yield EggEvent("group", name, depth, entry)
+                continue
+
+            body_end = _find_closing_brace(buffer, body_start, end, entry in PRIMITIVE_ENTRIES)
+            position = body_end
+            if entry == "vertexpool":
+                yield EggEvent("vertex_pool", name, depth, VertexPool(self, name, body_start, body_end))
+            elif entry in PRIMITIVE_ENTRIES:
+                yield EggEvent("primitive", name, depth, self._primitive(entry, body_start, body_end))
+            else:
+                body = _parse_body(_tokens(buffer, body_start, body_end)) if body_end - body_start < MAX_ENTRY_TEXT else None
+                if entry == "texture":
+                    yield EggEvent("texture", name, depth, body[0] if body else "")
+                elif entry == "material":
+                    yield EggEvent("material", name, depth, _scalars(body or []))
+                elif entry in ATTRIBUTE_ENTRIES:
+                    value = " ".join(str(value) for value in body or [] if not isinstance(value, tuple))
+                    yield EggEvent("attribute", name or entry, depth, value)
+                else:
+                    yield EggEvent("entry", name or tag, depth, body)
+
+    def _entry_name(self, position, end):
+        """
+        Reads the optional name between an entry tag and its opening brace.
+
+        :return: (name, position after the brace). The position is None at the end of the file.
+        """
+        name = ""
+        for kind, value, token_end in _tokens(self.buffer, position, end):
+            if kind == BRACE and value == b"{":
+                return name, token_end
+            name = value if not name else f"{name} {value}"
+        return name, None
+
+    def _primitive(self, entry, start, end):
+        text = self.buffer[start:end]
+        vertices = []
+        pool = ""
+        for references, ref in VERTEX_REF_RE.findall(text):
+            vertices.extend(int(index) for index in references.split())
+            pool = ref.decode(errors = "replace") or pool
+        material = MREF_RE.search(text)
+        attributes = {
+            (name or tag).decode(errors = "replace").lower(): value.decode(errors = "replace")
+            for tag, name, value in PRIMITIVE_ATTRIBUTE_RE.findall(text)
+        }
+        return Primitive(
+            entry,
+            vertices,
+            pool,
+            tuple(texture.decode(errors = "replace") for texture in TREF_RE.findall(text)),
+            material.group(1).decode(errors = "replace") if material else "",
+            attributes,
+        )
@@ -0,0 +1,173 @@
+"""
+Converting Panda bam files to egg for importing them into Maya.
+
+Maya's egg importer only reads .egg files, so a .bam is converted with bam2egg first. bam2egg
+looks the bam's textures up from its working directory, which is the phase root (the folder the
+phase_* folders are in), and writes their paths into the egg unchanged, so the egg is written to
+the phase root as well and found from there by the importer.
+
+Converted eggs are kept in the build cache (see MayaPandaCache.py) under a hash of the bam, the
+bam2egg version and the phase root. Importing the same asset again copies its egg from the cache
+instead of running bam2egg. The bams that are not cached are converted at the same time, as a pool
+of bam2egg processes, one per core, and only then imported one after another.
+
+"Import Panda File" and "Bam File 2 Egg" in the exporter window use it, and the command line
+converts files and directory trees, writing each egg next to its bam:
+
+    python MayaPandaImport.py [--root phase_root] [--bam2egg bam2egg] [--workers 8] [--force] phases/
+
+This module does not import pymel.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from dataclasses import dataclass
+from typing import Optional
+
+from MayaPandaCache import BuildCache
+from MayaPandaConvert import expand_files, is_up_to_date
+from MayaPandaJobs import ConversionJob, JobPool, pool_size
+
+BAM_EXTENSIONS = (".bam",)
+PANDA_FILE_EXTENSIONS = (".bam", ".egg")
+
+
+def bam2egg_command(bam2egg_exe, bam_file, egg_file):
+    """
+    :return: The bam2egg command writing egg_file from bam_file, replacing egg_file if it exists.
+    """
+    return f"{bam2egg_exe} -o \"{egg_file}\" \"{bam_file}\""
+
+
+def inside_root(path, root):
+    """
+    :return: Whether path is below the root folder.
+    """
+    root = os.path.normcase(os.path.abspath(root))
+    return os.path.normcase(os.path.abspath(path)).startswith(os.path.join(root, ""))
+
+
+def import_egg_path(bam_file, root):
+    """
+    Reserves a file in the phase root to write the egg of an imported bam to, named after the bam.
+    It is only there until the egg is imported, a bam of the same name never overwrites a real egg.
+    """
+    name = os.path.splitext(os.path.basename(bam_file))[0]
+    handle, egg_file = tempfile.mkstemp(prefix = f"{name}_", suffix = ".egg", dir = root)
+    os.close(handle)
+    return egg_file
+
+
+@dataclass
+class Bam2EggJob(ConversionJob):
+    """
+    A bam2egg run that adds its egg to the build cache when it succeeds.
+    """
+    cache: Optional[BuildCache] = None
+    cache_key: str = ""
+
+    def _finish(self, returncode):
+        super()._finish(returncode)
+        if self.succeeded and self.cache is not None:
+            self.cache.store(self.cache_key, self.outputs[0])
+
+
+def bam2egg_jobs(conversions, bam2egg_exe, root, cache=None):
+    """
+    Copies the eggs of the cached bams, and builds the bam2egg jobs of the others.
+
+    :param conversions: (bam file, egg file to write) pairs.
+    :param bam2egg_exe: The bam2egg of the chosen bam version.
+    :param root: Phase root, the working directory of bam2egg.
+    :param cache: BuildCache to look the eggs up in and add new ones to. None converts every bam.
+    :return: The jobs to run and the (bam, egg) pairs that came from the cache.
+    """
+    jobs = []
+    cached = []
+    for bam_file, egg_file in conversions:
+        key = cache.bam2egg_key(bam_file, bam2egg_exe, root) if cache is not None else ""
+        if key and cache.fetch(key, egg_file):
+            cached.append((bam_file, egg_file))
+            continue
+        job = Bam2EggJob(
+            f"bam2egg {os.path.basename(bam_file)}",
+            [bam2egg_command(bam2egg_exe, bam_file, egg_file)],
+            [egg_file],
+            cwd = root,
+            cache = cache,
+            cache_key = key,
+        )
+        jobs.append(job)
+    return jobs, cached
+
+
+def egg_conversions(bams, root="", force=False):
+    """
+    Works out where bam2egg runs for each bam and which eggs are up to date.
+
+    :param bams: (bam file, root) pairs, see expand_files.
+    :param root: Phase root. Bams outside of it are converted in their own folder.
+    :param force: Also convert bams whose egg is up to date.
+    :return: Dictionary of working directory to its (bam, egg next to the bam) pairs, and the
+             (bam, egg) pairs that were up to date.
+    """
+    batches = {}
+    skipped = []
+    root = os.path.abspath(root) if root else ""
+    for bam_file, _ in bams:
+        egg_file = os.path.splitext(bam_file)[0] + ".egg"
+        if not force and is_up_to_date(egg_file, [bam_file]):
+            skipped.append((bam_file, egg_file))
+            continue
+        directory = root if root and inside_root(bam_file, root) else os.path.dirname(bam_file)
+        batches.setdefault(directory, []).append((bam_file, egg_file))
+    return batches, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Convert .bam files to .egg with a pool of bam2egg processes.")
+    parser.add_argument("files", nargs = "+", help = "Bam files, directory trees or glob patterns")
+    parser.add_argument(
+        "--root", default = "", help = "Phase root the textures are found from, bams outside of it use their own folder"
+    )
+    parser.add_argument("--bam2egg", default = "bam2egg", help = "bam2egg executable of the bam version")
+    parser.add_argument("--workers", type = int, default = 0, help = "Concurrent bam2egg processes, defaults to the cores")
+    parser.add_argument("--force", action = "store_true", help = "Also convert bams whose egg is up to date")
+    parser.add_argument(
+        "--no-cache", action = "store_true", help = "Run bam2egg on every bam instead of using the build cache"
+    )
+    options = parser.parse_args(argv)
+
+    bams = expand_files(options.files, BAM_EXTENSIONS)
+    if not bams:
+        parser.error("no .bam files found")
+    cache = None if options.no_cache else BuildCache()
+    batches, skipped = egg_conversions(bams, options.root, options.force)
+    jobs = []
+    cached = []
+    for root, conversions in batches.items():
+        root_jobs, root_cached = bam2egg_jobs(conversions, options.bam2egg, root, cache)
+        jobs.extend(root_jobs)
+        cached.extend(root_cached)
+    print(f"{len(jobs)} to convert, {len(cached)} from the cache, {len(skipped)} up to date.")
+
+    start = time.time()
+    pool = JobPool(jobs, pool_size(options.workers or None))
+    while not pool.done():
+        for job in pool.poll():
+            status = "ok" if job.succeeded else f"FAILED (exit code {job.returncode})"
+            print(f"{status:<24} {job.elapsed:6.2f}s  {job.outputs[0]}")
+            if not job.succeeded and job.stderr.strip():
+                print(job.stderr.rstrip())
+        time.sleep(0.05)
+    failed = [job for job in pool.finished if not job.succeeded]
+    print(f"Converted {len(jobs) - len(failed)} of {len(jobs)} in {time.time() - start:.2f}s, {len(failed)} failed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Subprocess job helpers for the Panda exporter.
+
+maya2egg, egg2bam and pview are all separate executables, so the exporter only ever needs to
+schedule processes. This module does not import pymel and can be used from mayapy or plain Python.
+"""
+
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Rough resident size of one maya2egg process, which loads the Maya libraries on startup.
+DEFAULT_JOB_MEMORY_MB = 1024
+
+
+@dataclass
+class ConversionJob:
+    """
+    A named chain of shell commands, run one after another.
+    The chain stops at the first command that returns a non-zero exit code.
+    """
+    name: str
+    commands: List[str] = field(default_factory = lambda: list())
+    outputs: List[str] = field(default_factory = lambda: list())  # Files produced when the job succeeds
+    returncode: Optional[int] = None
+    elapsed: float = 0.0
+    cancelled: bool = False
+    stdout: str = ""
+    stderr: str = ""
+    step_times: List[float] = field(default_factory = lambda: list())  # Wall time of each command that ran
+    cwd: Optional[str] = None  # Working directory of the commands, defaults to the caller's
+
+    # Runtime state
+    _process = None
+    _stdout_file = None
+    _stderr_file = None
+    _step = 0
+    _start_time = 0.0
+    _step_start_time = 0.0
+
+    @property
+    def finished(self):
+        return self.returncode is not None
+
+    @property
+    def succeeded(self):
+        return self.returncode == 0 and not self.cancelled
+
+    def start(self):
+        self._step = 0
+        self._start_time = time.time()
+        self.step_times = []
+        if not self.commands:
+            self._finish(0)
+            return
+        self._launch()
+
+    def poll(self):
+        """
+        Advances the job to its next command when the current one has exited.
+
+        :return: True once the whole chain has finished.
+        """
+        if self.finished:
+            return True
+        result = self._process.poll()
+        if result is None:
+            return False
+        self._collect_output()
+        self.step_times.append(time.time() - self._step_start_time)
+        self._step += 1
+        if result != 0 or self._step >= len(self.commands):
+            self._finish(result)
+            return True
+        self._launch()
+        return False
+
+    def cancel(self):
+        if self.finished:
+            return
+        self.cancelled = True
+        if self._process is not None:
+            if self._process.poll() is None:
+                kill_process_tree(self._process)
+                self._process.wait()
+            self._collect_output()
+            self.step_times.append(time.time() - self._step_start_time)
+        self._finish(-1)
+
+    def _launch(self):
+        # Output goes to temporary files rather than pipes, so a chatty tool can never fill a pipe and stall
+        self._stdout_file = tempfile.TemporaryFile()
+        self._stderr_file = tempfile.TemporaryFile()
+        self._step_start_time = time.time()
+        self._process = spawn_command(
+            self.commands[self._step],
+            stdout = self._stdout_file,
+            stderr = self._stderr_file,
+            cwd = self.cwd,
+        )
+
+    def _collect_output(self):
+        for attr, handle in (("stdout", self._stdout_file), ("stderr", self._stderr_file)):
+            if handle is None:
+                continue
+            handle.seek(0)
+            setattr(self, attr, getattr(self, attr) + handle.read().decode(errors = "replace"))
+            handle.close()
+        self._stdout_file = None
+        self._stderr_file = None
+
+    def _finish(self, returncode):
+        self.returncode = returncode
+        self.elapsed = time.time() - self._start_time if self._start_time else 0.0
+        self._process = None
+
+
+def spawn_command(cmd, **kwargs):
+    """
+    Starts a shell command without waiting on it.
+    On POSIX the command gets its own process group, so it can be cancelled as a whole.
+    """
+    if os.name != "nt":
+        kwargs.setdefault("start_new_session", True)
+    return subprocess.Popen(cmd, shell = True, **kwargs)
+
+
+def kill_process_tree(process):
+    """
+    Terminates a process started by spawn_command, including the programs its shell launched.
+    """
+    if os.name == "nt":
+        subprocess.call(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            stdout = subprocess.DEVNULL,
+            stderr = subprocess.DEVNULL,
+        )
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+
+def pool_size(max_workers=None, memory_budget_mb=0, job_memory_mb=DEFAULT_JOB_MEMORY_MB):
+    """
+    Works out how many conversions can run at once.
+
+    :param max_workers: Upper bound on concurrent jobs, defaults to the number of CPU cores.
+    :param memory_budget_mb: Total memory the jobs may use. 0 disables the memory limit.
+    :param job_memory_mb: Expected memory use of a single job.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if memory_budget_mb > 0 and job_memory_mb > 0:
+        workers = min(workers, memory_budget_mb // job_memory_mb)
+    return max(1, int(workers))
+
+
+class JobPool(object):
+    """
+    Runs ConversionJobs as subprocesses, at most `workers` at a time.
+
+    The pool never blocks: the caller drives it by calling poll() from its own loop,
+    e.g. while updating the Maya progress bar, so cancellation stays with the caller.
+    """
+
+    def __init__(self, jobs, workers=1):
+        self.pending = list(jobs)
+        self.running = []
+        self.finished = []
+        self.workers = max(1, workers)
+
+    def poll(self):
+        """
+        Reaps finished jobs and starts queued ones while there are free workers.
+
+        :return: The jobs that finished during this call.
+        """
+        just_finished = [job for job in self.running if job.poll()]
+        for job in just_finished:
+            self.running.remove(job)
+            self.finished.append(job)
+
+        while self.pending and len(self.running) < self.workers:
+            job = self.pending.pop(0)
+            job.start()
+            self.running.append(job)
+        return just_finished
+
+    def done(self):
+        return not self.pending and not self.running
+
+    def cancel(self, job=None):
+        """
+        Kills running jobs and drops the queued ones.
+
+        :param job: Only cancel this job. Cancels everything if not given.
+        :return: The jobs that were cancelled.
+        """
+        cancelled = [
+            queued for queued in self.running + self.pending
+            if job is None or queued is job
+        ]
+        for queued in cancelled:
+            queued.cancel()
+            if queued in self.running:
+                self.running.remove(queued)
+            else:
+                self.pending.remove(queued)
+            self.finished.append(queued)
+        return cancelled
+
+    def wait(self, interval=0.1):
+        self.poll()
+        while not self.done():
+            time.sleep(interval)
+            self.poll()
+        return self.finished
+
+
+def run_job(job, interval=0.05):
+    """
+    Runs a job to completion on the calling thread.
+    """
+    job.start()
+    while not job.poll():
+        time.sleep(interval)
+    return job
+
+
+class AsyncJobRunner(object):
+    """
+    Runs ConversionJobs on a background thread so the caller's UI stays responsive.
+
+    Completion callbacks are handed to `deferred`, which the exporter sets to
+    maya.utils.executeDeferred so they run on Maya's main thread.
+    Without it, callbacks run on the worker thread.
+    """
+
+    def __init__(self, workers=1, deferred=None, interval=0.1):
+        self.deferred = deferred or (lambda callback, *args: callback(*args))
+        self.interval = interval
+        self._pool = JobPool([], workers)
+        self._callbacks = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._wake = threading.Event()
+
+    def submit(self, job, on_done=None):
+        """
+        Queues a job.
+
+        :param job: The ConversionJob to run.
+        :param on_done: Called with the job once it has finished, failed or been cancelled.
+        """
+        with self._lock:
+            self._pool.pending.append(job)
+            self._callbacks[id(job)] = on_done
+            if self._thread is None:
+                self._thread = threading.Thread(target = self._run, name = "MayaPandaJobRunner", daemon = True)
+                self._thread.start()
+        return job
+
+    def wake(self):
+        """
+        Polls the jobs now rather than after the interval, e.g. when a conversion worker replied.
+        """
+        self._wake.set()
+
+    def jobs(self):
+        with self._lock:
+            return list(self._pool.running) + list(self._pool.pending)
+
+    def cancel(self, job=None):
+        """
+        Cancels one job, or every running and queued job if none is given.
+        """
+        with self._lock:
+            cancelled = self._pool.cancel(job)
+        self._dispatch(cancelled)
+        return cancelled
+
+    def _run(self):
+        while True:
+            with self._lock:
+                finished = self._pool.poll()
+                idle = self._pool.done()
+                if idle:
+                    self._thread = None
+            self._dispatch(finished)
+            if idle:
+                return
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _dispatch(self, jobs):
+        for job in jobs:
+            callback = self._callbacks.pop(id(job), None)
+            if callback is not None:
+                self.deferred(callback, job)
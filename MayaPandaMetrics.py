@@ -0,0 +1,228 @@
+"""
+Export timing history for the Panda exporter.
+
+Every export records how long each stage took (temporary .mb save, maya2egg arguments, maya2egg,
+egg2bam, pview launch) together with the input and output file sizes, and appends it as one JSON
+line to a history file. The report lists the slowest assets and how each stage trends over time.
+This module does not import pymel.
+
+Usage:
+    python MayaPandaMetrics.py [--file metrics.jsonl] [--limit 20] [--days 14]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from collections import defaultdict
+from contextlib import contextmanager
+
+METRICS_FILE_ENV = "MP_PY_METRICS_FILE"
+# Stages in pipeline order
+STAGES = ("tag_rules", "save_mb", "args", "maya2egg", "egg2bam", "pview")
+
+
+def default_metrics_file():
+    """
+    Returns the history file, which can be overridden with the MP_PY_METRICS_FILE environment variable.
+    """
+    return os.environ.get(METRICS_FILE_ENV) or os.path.join(os.path.expanduser("~"), ".mayapanda", "metrics.jsonl")
+
+
+class ExportRun(object):
+    """
+    Timings and file sizes of one export, of a whole scene or of a single node.
+    Without a history, the run is measured but never written anywhere.
+    """
+
+    def __init__(self, scene, node="", history=None):
+        self.scene = scene
+        self.node = node
+        self.history = history
+        self.started = time.time()
+        self.stages = {}
+        self.sizes = {}
+        self.status = "ok"
+        self.cached = False
+        self.finished = False
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_job(self, job, stages):
+        """
+        Records the commands of a finished ConversionJob.
+
+        :param job: The finished job.
+        :param stages: Stage name of each of the job's commands, in order.
+        """
+        for name, seconds in zip(stages, job.step_times):
+            self.add_time(name, seconds)
+        if not job.succeeded:
+            self.status = "cancelled" if job.cancelled else "failed"
+
+    def add_file(self, label, path):
+        if path and os.path.isfile(path):
+            self.sizes[label] = os.path.getsize(path)
+
+    def to_dict(self):
+        return {
+            "time": self.started,
+            "scene": self.scene,
+            "node": self.node,
+            "status": self.status,
+            "cached": self.cached,
+            "total": sum(self.stages.values()),
+            "stages": self.stages,
+            "sizes": self.sizes,
+        }
+
+    def finish(self, status=None):
+        """
+        Appends the run to its history. Only the first call writes anything.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        if status:
+            self.status = status
+        if self.history is not None:
+            self.history.append(self.to_dict())
+
+
+class MetricsHistory(object):
+    """
+    Append-only JSON lines file of ExportRun records.
+    Each record is written with a single write call, so several exports can share the file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_metrics_file()
+
+    def append(self, record):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok = True)
+            with open(self.path, "a") as handle:
+                handle.write(json.dumps(record, sort_keys = True) + "\n")
+        except OSError as error:
+            # Losing a timing record must never fail an export
+            print(f"Could not write export metrics to {self.path}: {error}")
+
+    def records(self, since=0.0):
+        """
+        Reads the history, skipping lines that cannot be parsed.
+
+        :param since: Only return records newer than this timestamp.
+        """
+        if not os.path.isfile(self.path):
+            return []
+        records = []
+        with open(self.path) as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("time", 0.0) >= since:
+                    records.append(record)
+        return records
+
+
+def asset_name(record):
+    return f"{record['scene']} | {record['node']}" if record.get("node") else record["scene"]
+
+
+def slowest_assets(records, limit=10):
+    """
+    Ranks assets by the mean total time of their successful exports.
+
+    :return: A list of (asset, mean seconds, last seconds, runs, mean time per stage) tuples, slowest first.
+    """
+    by_asset = defaultdict(list)
+    for record in records:
+        if record.get("status") == "ok":
+            by_asset[asset_name(record)].append(record)
+
+    ranked = []
+    for asset, runs in by_asset.items():
+        runs.sort(key = lambda record: record["time"])
+        stage_means = {
+            stage: sum(run["stages"].get(stage, 0.0) for run in runs) / len(runs)
+            for stage in STAGES
+        }
+        mean = sum(run["total"] for run in runs) / len(runs)
+        ranked.append((asset, mean, runs[-1]["total"], len(runs), stage_means))
+    ranked.sort(key = lambda entry: entry[1], reverse = True)
+    return ranked[:limit]
+
+
+def stage_trends(records):
+    """
+    Sums the time spent in each stage per day.
+
+    :return: A sorted list of (day, runs, seconds per stage) tuples.
+    """
+    days = defaultdict(lambda: [0, defaultdict(float)])
+    for record in records:
+        day = time.strftime("%Y-%m-%d", time.localtime(record["time"]))
+        days[day][0] += 1
+        for stage, seconds in record["stages"].items():
+            days[day][1][stage] += seconds
+    return [(day, runs, dict(stages)) for day, (runs, stages) in sorted(days.items())]
+
+
+def format_report(records, limit=10):
+    """
+    Formats the slowest assets and the daily stage totals as plain text.
+    """
+    if not records:
+        return "No exports have been recorded yet."
+
+    failed = sum(record.get("status") != "ok" for record in records)
+    cached = sum(bool(record.get("cached")) for record in records)
+    total = sum(record["total"] for record in records)
+    lines = [
+        f"{len(records)} exports, {failed} failed, {cached} from the build cache, {total / 3600.0:.2f} hours in total",
+        "",
+        "Slowest assets (mean seconds per export):",
+        f"{'mean':>8} {'last':>8} {'runs':>5}  " + " ".join(f"{stage:>9}" for stage in STAGES) + "  asset",
+    ]
+    for asset, mean, last, runs, stage_means in slowest_assets(records, limit):
+        stage_columns = " ".join(f"{stage_means[stage]:9.2f}" for stage in STAGES)
+        lines.append(f"{mean:8.2f} {last:8.2f} {runs:5d}  {stage_columns}  {asset}")
+
+    lines.extend([
+        "",
+        "Seconds per stage per day:",
+        f"{'day':<10} {'runs':>5}  " + " ".join(f"{stage:>9}" for stage in STAGES),
+    ])
+    for day, runs, stages in stage_trends(records):
+        stage_columns = " ".join(f"{stages.get(stage, 0.0):9.1f}" for stage in STAGES)
+        lines.append(f"{day:<10} {runs:5d}  {stage_columns}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Show the Panda exporter timing history.")
+    parser.add_argument("--file", default = "", help = "History file, defaults to the exporter's")
+    parser.add_argument("--limit", type = int, default = 20, help = "Number of slowest assets to list")
+    parser.add_argument("--days", type = int, default = 0, help = "Only include the last N days")
+    options = parser.parse_args(argv)
+
+    since = time.time() - options.days * 86400 if options.days else 0.0
+    print(format_report(MetricsHistory(options.file or None).records(since), options.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
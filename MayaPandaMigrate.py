@@ -0,0 +1,83 @@
+"""
+Migrates eggObjectTypes attributes to the eggObjectTypeList of their node.
+
+Older versions of the exporter stored every egg-object-type as an enum attribute of its own,
+eggObjectTypes1 to eggObjectTypes10, listing all known types with the position of the type in that
+list as its value. Adding a type moved the positions, and the whole list was stored again on every
+attribute. A migrated node keeps its types by name in one eggObjectTypeList attribute, which is
+also how the exporter adds egg-object-types now (see MayaPandaTags.py).
+
+What a stored value means is read from the attribute's own enum list, the table it was written with.
+Values that do not name a known egg-object-type are reported and left alone.
+
+Usage:
+    mayapy MayaPandaMigrate.py [--dry-run] [--summary summary.json] scenes/*.mb
+
+The scene in Maya is migrated with "Migrate Egg-Object-Types" in the Panda menu.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from MayaPandaBatch import expand_scenes
+from MayaPandaTags import collapse_to_compact, object_type_ids
+
+
+def migrate_files(scenes, type_ids, dry_run=False):
+    """
+    Opens, migrates and saves each scene in turn. Needs mayapy.
+
+    :return: List of result dictionaries, one per scene.
+    """
+    import maya.cmds as cmds
+
+    results = []
+    for scene_file in scenes:
+        start = time.time()
+        result = {"scene": scene_file, "status": "failed"}
+        try:
+            cmds.file(scene_file, open = True, force = True, prompt = False)
+            report = collapse_to_compact(cmds, type_ids, dry_run)
+            if report["migrated"] and not dry_run:
+                cmds.file(save = True, force = True)
+            result.update(report, status = "failed" if report["failed"] else "ok")
+        except Exception as error:
+            result["error"] = str(error)
+        result["elapsed"] = time.time() - start
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Migrate eggObjectTypes attributes to the eggObjectTypeList of their node.")
+    parser.add_argument("scenes", nargs = "+", help = "Scene files, directories or glob patterns")
+    parser.add_argument("--dry-run", action = "store_true", help = "Report what would change without saving")
+    parser.add_argument("--summary", default = "", help = "Write the JSON summary to this file")
+    options = parser.parse_args(argv)
+
+    scenes = expand_scenes(options.scenes)
+    if not scenes:
+        parser.error("no .mb or .ma scenes found")
+
+    import maya.standalone
+    maya.standalone.initialize(name = "python")
+    try:
+        results = migrate_files(scenes, object_type_ids(), options.dry_run)
+    finally:
+        maya.standalone.uninitialize()
+
+    text = json.dumps({"dry_run": options.dry_run, "results": results}, indent = 4)
+    if options.summary:
+        with open(options.summary, "w") as handle:
+            handle.write(text)
+    else:
+        print(text)
+    migrated = sum(len(result.get("migrated", [])) for result in results)
+    print(f"Migrated {migrated} attributes in {len(results)} scenes.")
+    return 1 if any(result["status"] != "ok" for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
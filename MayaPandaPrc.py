@@ -0,0 +1,187 @@
+"""
+ObjectType definitions read from PRC files.
+
+egg2bam only understands the egg-object-types defined in a loaded PRC file, like
+
+    egg-object-type-floor           <Scalar> collide-mask { 0x02 } <Collide> { Polyset descend level }
+
+so those lines are the definitions the exporter offers. They are read from eggattribs.txt next to
+this module and from the user's Config.prc files (the *.prc files in PRC_DIR and PRC_PATH), later
+files overriding earlier ones. Everything the PRC syntax cannot hold (category, description, button
+label and colour, and which types the windows list) comes from the eggattribs.json sidecar.
+
+Parsing is cached in ~/.mayapanda/object_types.json, keyed by the modification times of every file
+read, so Maya start-up does not parse anything when nothing changed.
+This module does not import pymel.
+"""
+
+import glob
+import json
+import os
+import re
+import zlib
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ATTRIBS_FILE = os.path.join(MODULE_DIR, "eggattribs.txt")
+DEFAULT_SIDECAR_FILE = os.path.join(MODULE_DIR, "eggattribs.json")
+CACHE_FILE_ENV = "MP_PY_OT_CACHE_FILE"
+# Bumped whenever the cached data changes shape
+CACHE_VERSION = 2
+# Ids of types without an id in the sidecar are derived from their name, above the ids the sidecar hands out
+DERIVED_ID_BASE = 1000
+# Enum values are signed shorts
+MAX_ID = 32767
+
+OBJECT_TYPE_RE = re.compile(r"^\s*egg-object-type-(\S+)\s+(.*?)\s*$")
+# One <Header> [name] { value } entry of a definition
+FLAG_RE = re.compile(r"<[^>]+>[^{<]*\{[^}]*\}")
+
+
+def default_cache_file():
+    """
+    Returns the cache file, which can be overridden with the MP_PY_OT_CACHE_FILE environment variable.
+    """
+    return os.environ.get(CACHE_FILE_ENV) or os.path.join(os.path.expanduser("~"), ".mayapanda", "object_types.json")
+
+
+def default_prc_files():
+    """
+    Returns eggattribs.txt followed by the user's PRC files, in the order they are applied.
+    """
+    files = [DEFAULT_ATTRIBS_FILE]
+    directories = [os.environ.get("PRC_DIR", "")] + os.environ.get("PRC_PATH", "").split(os.pathsep)
+    for directory in directories:
+        if directory and os.path.isdir(directory):
+            files.extend(sorted(glob.glob(os.path.join(directory, "*.prc"))))
+    return files
+
+
+def parse_flags(text):
+    """
+    Splits the value of an egg-object-type line into its entries.
+
+    :return: List like ['<Scalar> collide-mask { 0x02 }', '<Collide> { Polyset descend level }'].
+    """
+    return [" ".join(flag.split()) for flag in FLAG_RE.findall(text)]
+
+
+def parse_prc(path):
+    """
+    :return: Dictionary of egg-object-type name to its flags, in file order.
+    """
+    object_types = {}
+    with open(path, encoding = "utf-8", errors = "replace") as handle:
+        for line in handle:
+            match = OBJECT_TYPE_RE.match(line)
+            if match:
+                object_types[match.group(1)] = parse_flags(match.group(2).split("#")[0])
+    return object_types
+
+
+def _file_key(paths):
+    key = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            key.append([os.path.abspath(path), None, None])
+            continue
+        key.append([os.path.abspath(path), stat.st_mtime_ns, stat.st_size])
+    return key
+
+
+def build_object_types(prc_files, sidecar_file):
+    """
+    Merges the PRC definitions with the sidecar metadata.
+
+    Types listed in the sidecar come first, in sidecar order, with the flags of the PRC files.
+    The sidecar's own flags are only used for types no PRC file defines. Types only found in
+    the PRC files are added at the end when the sidecar sets "include_unlisted", with an id
+    derived from their name.
+
+    :return: Dictionary with "types" (a list of definition dictionaries with the keys name, id, flags,
+             category, description, friendly_name and text_color) and "undefined" (listed types
+             no PRC file defines).
+    """
+    prc_types = {}
+    for path in prc_files:
+        if os.path.isfile(path):
+            prc_types.update(parse_prc(path))
+
+    sidecar = {}
+    if os.path.isfile(sidecar_file):
+        with open(sidecar_file, encoding = "utf-8") as handle:
+            sidecar = json.load(handle)
+    listed = sidecar.get("types", {})
+
+    names = list(listed)
+    if sidecar.get("include_unlisted"):
+        names.extend(name for name in prc_types if name not in listed)
+
+    types = []
+    undefined = []
+    for name in names:
+        metadata = listed.get(name, {})
+        if name not in prc_types:
+            undefined.append(name)
+        types.append({
+            "name": name,
+            "id": metadata.get("id"),
+            "flags": prc_types.get(name, metadata.get("flags", [])),
+            "category": metadata.get("category", ""),
+            "description": metadata.get("description", []),
+            "friendly_name": metadata.get("friendly_name", ""),
+            "text_color": metadata.get("text_color", ""),
+        })
+    assign_ids(types)
+    return {"types": types, "undefined": undefined}
+
+
+def assign_ids(types):
+    """
+    Gives every type without an id one derived from a checksum of its name, so it stays the same
+    across sessions and machines. Collisions move on to the next free id, in name order.
+    """
+    used = {entry["id"] for entry in types if entry["id"] is not None}
+    for entry in sorted((entry for entry in types if entry["id"] is None), key = lambda entry: entry["name"]):
+        type_id = DERIVED_ID_BASE + zlib.crc32(entry["name"].encode()) % (MAX_ID - DERIVED_ID_BASE)
+        while type_id in used:
+            type_id = type_id + 1 if type_id < MAX_ID else DERIVED_ID_BASE
+        entry["id"] = type_id
+        used.add(type_id)
+
+
+def load_object_types(prc_files=None, sidecar_file=None, cache_file=None):
+    """
+    Returns build_object_types() for the files, from the cache when none of them changed.
+
+    :param prc_files: PRC files in the order they are applied. Defaults to default_prc_files().
+    :param sidecar_file: The metadata sidecar. Defaults to eggattribs.json next to this module.
+    :param cache_file: Cache file, "" to disable caching. Defaults to default_cache_file().
+    """
+    prc_files = default_prc_files() if prc_files is None else list(prc_files)
+    sidecar_file = sidecar_file or DEFAULT_SIDECAR_FILE
+    cache_file = default_cache_file() if cache_file is None else cache_file
+    key = {"version": CACHE_VERSION, "files": _file_key(prc_files + [sidecar_file])}
+
+    if cache_file and os.path.isfile(cache_file):
+        try:
+            with open(cache_file, encoding = "utf-8") as handle:
+                cached = json.load(handle)
+            if cached.get("key") == key:
+                return cached["data"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    data = build_object_types(prc_files, sidecar_file)
+    if cache_file:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok = True)
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_file, "w", encoding = "utf-8") as handle:
+                json.dump({"key": key, "data": data}, handle)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            # A read-only home directory only costs the parse next time
+            pass
+    return data
@@ -0,0 +1,267 @@
+"""
+Rule-based tagging of egg-object-types.
+
+Instead of tagging collision geometry by hand, a rules file says which nodes get which types.
+A rule matches a transform by regular expressions on its name, its display layer, the sets it
+belongs to, the shading groups of its shapes or its parent path, and adds its types to every
+match. All patterns of a rule have to match (re.search), and every matching rule adds its types.
+
+Rules are read from ~/.mayapanda/tag_rules.json (or MP_PY_TAG_RULES_FILE):
+
+    {
+        "rules": [
+            {"label": "Walls", "match": {"name": "^wall_", "layer": "^collision"}, "types": ["barrier"]},
+            {"label": "Floors", "match": {"shading_group": "floor|ground"}, "types": ["floor"]},
+            {"label": "Doors", "match": {"parent": "\\|door_origin$"}, "types": ["dcs"]}
+        ]
+    }
+
+The scene is read with one ls of its transforms and one query per display layer and set, and the
+result is written in one batch. "Apply Tagging Rules" in the Panda menu tags the open scene, the
+"Apply tagging rules before export" option and export profiles run them before every export, and
+the command line tags scene files:
+
+    mayapy MayaPandaRules.py [--rules tag_rules.json] [--dry-run] scenes/*.mb
+
+This module does not import pymel.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from dataclasses import dataclass, field
+from typing import Pattern, Tuple
+
+from MayaPandaTags import assign_types
+
+RULES_FILE_ENV = "MP_PY_TAG_RULES_FILE"
+# What a rule can match on, see NodeFacts
+MATCH_FIELDS = ("name", "layer", "set", "shading_group", "parent")
+
+
+def default_rules_file():
+    """
+    Returns the rules file, which can be overridden with the MP_PY_TAG_RULES_FILE environment variable.
+    """
+    return os.environ.get(RULES_FILE_ENV) or os.path.join(os.path.expanduser("~"), ".mayapanda", "tag_rules.json")
+
+
+@dataclass(frozen = True)
+class NodeFacts:
+    """
+    What the rules match a transform on. Fields that can hold several values are tuples.
+    """
+    node: str
+    name: str = ""
+    parent: str = ""
+    layer: Tuple[str, ...] = ()
+    set: Tuple[str, ...] = ()
+    shading_group: Tuple[str, ...] = ()
+
+
+@dataclass(frozen = True)
+class TagRule:
+    label: str
+    types: Tuple[str, ...]
+    # (field, compiled pattern), every one has to match
+    patterns: Tuple[Tuple[str, Pattern], ...] = field(default = ())
+
+    @classmethod
+    def from_dict(cls, data, position=0):
+        """
+        :raises ValueError: For an unknown field or a pattern that does not compile, naming the rule.
+        """
+        label = data.get("label") or f"rule {position + 1}"
+        patterns = []
+        for match_field, pattern in data.get("match", {}).items():
+            if match_field not in MATCH_FIELDS:
+                raise ValueError(f"{label}: cannot match on {match_field}, only on {', '.join(MATCH_FIELDS)}")
+            try:
+                patterns.append((match_field, re.compile(pattern)))
+            except re.error as error:
+                raise ValueError(f"{label}: {match_field} pattern {pattern!r}: {error}")
+        types = data.get("types", [])
+        return cls(label, tuple([types] if isinstance(types, str) else types), tuple(patterns))
+
+    def matches(self, facts):
+        for match_field, pattern in self.patterns:
+            value = getattr(facts, match_field)
+            if isinstance(value, tuple):
+                if not any(pattern.search(item) for item in value):
+                    return False
+            elif not pattern.search(value):
+                return False
+        # A rule without patterns would tag everything, which is never what was meant
+        return bool(self.patterns)
+
+
+class TagRules(object):
+    """
+    The rules of a rules file, in file order.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Reads a rules file. A missing file means no rules.
+        """
+        path = path or default_rules_file()
+        if not os.path.isfile(path):
+            return cls()
+        with open(path) as handle:
+            data = json.load(handle)
+        return cls(TagRule.from_dict(rule, position) for position, rule in enumerate(data.get("rules", [])))
+
+    def fields(self):
+        """
+        :return: The fields any rule matches on, the others do not have to be read from the scene.
+        """
+        return {match_field for rule in self.rules for match_field, _ in rule.patterns}
+
+    def types(self):
+        """
+        :return: Every egg-object-type the rules add.
+        """
+        return {name for rule in self.rules for name in rule.types}
+
+    def evaluate(self, facts):
+        """
+        :param facts: NodeFacts of the nodes to check.
+        :return: Dictionary of node to the egg-object-types its matching rules add, in rule order.
+        """
+        assignments = {}
+        for node_facts in facts:
+            types = [name for rule in self.rules if rule.matches(node_facts) for name in rule.types]
+            if types:
+                assignments[node_facts.node] = list(dict.fromkeys(types))
+        return assignments
+
+
+def _set_members(cmds, sets):
+    """
+    :return: Dictionary of set to its members as long names, components reduced to their objects.
+    """
+    members = {}
+    for object_set in sets:
+        names = cmds.sets(object_set, query = True) or []
+        members[object_set] = cmds.ls(names, long = True, objectsOnly = True) or [] if names else []
+    return members
+
+
+def scene_facts(cmds, fields=MATCH_FIELDS):
+    """
+    Collects the NodeFacts of every transform of the open scene.
+
+    :param fields: Only read these of the MATCH_FIELDS from the scene.
+    :return: List of NodeFacts.
+    """
+    transforms = cmds.ls(type = "transform", long = True) or []
+    known = set(transforms)
+
+    def owner(path):
+        # Shapes count for their transform
+        return path if path in known else path.rpartition("|")[0]
+
+    layer_of = {}
+    if "layer" in fields:
+        for layer in cmds.ls(type = "displayLayer") or []:
+            if layer == "defaultLayer":
+                continue
+            for member in cmds.editDisplayLayerMembers(layer, query = True, fullNames = True) or []:
+                layer_of.setdefault(owner(member), layer)
+
+    sets_of = {}
+    shading_groups_of = {}
+    shading_groups = cmds.ls(type = "shadingEngine") or [] if {"set", "shading_group"} & set(fields) else []
+    if "set" in fields:
+        sets = [name for name in cmds.ls(type = "objectSet") or [] if name not in shading_groups]
+        for object_set, members in _set_members(cmds, sets).items():
+            for member in members:
+                sets_of.setdefault(owner(member), []).append(object_set)
+    if "shading_group" in fields:
+        for shading_group, members in _set_members(cmds, shading_groups).items():
+            for member in members:
+                shading_groups_of.setdefault(owner(member), []).append(shading_group)
+
+    facts = []
+    for node in transforms:
+        parent, _, name = node.rpartition("|")
+        # Display layers apply to everything below their members
+        layer = ""
+        path = node
+        while path and not layer:
+            layer = layer_of.get(path, "")
+            path = path.rpartition("|")[0]
+        facts.append(NodeFacts(
+            node = node,
+            name = name,
+            parent = parent,
+            layer = (layer,) if layer else (),
+            set = tuple(dict.fromkeys(sets_of.get(node, ()))),
+            shading_group = tuple(dict.fromkeys(shading_groups_of.get(node, ()))),
+        ))
+    return facts
+
+
+def apply_rules(cmds, rules, dry_run=False):
+    """
+    Tags the open scene with the rules: one pass over the scene, then one batched write.
+
+    :return: Dictionary of node to the egg-object-types added to it.
+    """
+    if not rules.rules:
+        return {}
+    assignments = rules.evaluate(scene_facts(cmds, rules.fields()))
+    if dry_run:
+        return assignments
+    return assign_types(cmds, assignments)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Tag the egg-object-types of Maya scenes from a rules file.")
+    parser.add_argument("scenes", nargs = "+", help = "Scene files, directories or glob patterns")
+    parser.add_argument("--rules", default = "", help = "Rules file, defaults to the exporter's")
+    parser.add_argument("--dry-run", action = "store_true", help = "Report what would be tagged without saving")
+    options = parser.parse_args(argv)
+
+    # MayaPandaBatch imports this module to run the rules before exporting
+    from MayaPandaBatch import expand_scenes
+    scenes = expand_scenes(options.scenes)
+    if not scenes:
+        parser.error("no .mb or .ma scenes found")
+    rules = TagRules.load(options.rules or None)
+    if not rules.rules:
+        parser.error("no rules found")
+
+    import maya.standalone
+    maya.standalone.initialize(name = "python")
+    import maya.cmds as cmds
+
+    failed = 0
+    try:
+        for scene_file in scenes:
+            start = time.time()
+            try:
+                cmds.file(scene_file, open = True, force = True, prompt = False)
+                tagged = apply_rules(cmds, rules, options.dry_run)
+                if tagged and not options.dry_run:
+                    cmds.file(save = True, force = True)
+            except Exception as error:
+                failed += 1
+                print(f"{scene_file}: {error}")
+                continue
+            print(f"{scene_file}: tagged {len(tagged)} nodes in {time.time() - start:.2f}s")
+    finally:
+        maya.standalone.uninitialize()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
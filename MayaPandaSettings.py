@@ -0,0 +1,333 @@
+"""
+Export settings snapshot for the Panda exporter.
+
+ExportSettings holds every exporter window option as plain data. It is captured once per export
+(see MP_PY_CaptureExportSettings in MayaPandaUI.py), can be saved to and loaded from a JSON export
+profile, and the maya2egg/egg2bam command lines are built from it without touching any UI.
+This module does not import pymel.
+"""
+
+import json
+import os
+import re
+
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Tuple
+
+# -a options of maya2egg
+ANIMATION_MODES = ("none", "model", "chan", "both", "pose")
+# -trans options of maya2egg
+TRANSFORM_MODES = ("model", "all", "dcs", "none")
+# "default" keeps textures relative to the maya file, "reference" references them relative to a
+# chosen path, "copy" also copies them there
+TEXTURE_PATH_MODES = ("default", "reference", "copy")
+
+# Checkbox options that map directly onto a maya2egg flag
+MAYA2EGG_FLAGS = (
+    ("bface", "-bface"),
+    ("legacy_shaders", "-legacy-shaders"),
+    ("keep_uvs", "-keep-uvs"),
+    ("round_uvs", "-round-uvs"),
+    ("tbnall", "-tbnall"),
+    ("convert_lights", "-convert-lights"),
+    ("convert_cameras", "-convert-cameras"),
+)
+
+
+@dataclass(frozen = True)
+class ExportSettings:
+    # Export File Type / Transforms To Save
+    animation: str = "none"
+    transform: str = "model"
+
+    # Export Options
+    export_selected: bool = False
+    bface: bool = False
+    overwrite: bool = True
+    pview: bool = False
+    # With pview: show the file in the live viewer instead of a new pview, see MayaPandaViewer.py
+    live_preview: bool = False
+    legacy_shaders: bool = False
+    keep_uvs: bool = True
+    round_uvs: bool = True
+    tbnall: bool = True
+    convert_lights: bool = False
+    convert_cameras: bool = False
+    remove_ground_plane: bool = True
+    use_build_cache: bool = True
+    reuse_scene_file: bool = True
+
+    # Bam Specific Options
+    bam_version: str = "Default"
+    rawtex: bool = False
+    flatten: bool = False
+    # Convert the Default bam version in the persistent panda3d worker instead of egg2bam, see MayaPandaWorker.py
+    conversion_worker: bool = False
+    # Write a bam for each of these (bam version, egg2bam executable) from the one egg, each in its own folder,
+    # see egg2bam_targets. Empty writes only bam_version.
+    bam_fan_out: Tuple[Tuple[str, str], ...] = ()
+
+    # Unit, up axis and output file type
+    unit: str = "cm"
+    up_axis: str = "y"
+    output_bam: bool = False
+
+    # Output Path & Name Options
+    texture_path_mode: str = "default"
+    egg_texture_path: str = ""
+    bam_texture_path: str = ""
+    custom_output: bool = False
+    output_path: str = ""
+    custom_filename: bool = False
+    filename: str = ""
+
+    # Animation Options
+    character_name: str = ""
+    force_joints: Tuple[str, ...] = ()
+    custom_frame_range: bool = False
+    start_frame: int = 0
+    end_frame: int = 48
+
+    # Egg-Object-Types: run the tagging rules (see MayaPandaRules.py) before exporting, "" is the default rules file
+    apply_tag_rules: bool = False
+    tag_rules_file: str = ""
+
+    # Node export options
+    parallel: bool = False
+    memory_budget_mb: int = 8192
+
+    # Panda tools, resolved from the maya version and the selected bam version
+    maya2egg_exe: str = "maya2egg"
+    egg2bam_exe: str = "egg2bam"
+    bam2egg_exe: str = "bam2egg"
+    pview_exe: str = "pview"
+
+    def to_json(self):
+        return json.dumps(asdict(self), indent = 4, sort_keys = True)
+
+    @classmethod
+    def from_json(cls, text):
+        """
+        Builds settings from a JSON export profile.
+        Unknown keys are ignored and missing keys keep their defaults, so older profiles keep loading.
+        """
+        data = json.loads(text)
+        known = {f.name for f in fields(cls)}
+        values = {key: value for key, value in data.items() if key in known}
+        if "force_joints" in values:
+            values["force_joints"] = tuple(values["force_joints"])
+        if "bam_fan_out" in values:
+            values["bam_fan_out"] = tuple(tuple(version) for version in values["bam_fan_out"])
+        return cls(**values)
+
+    def save(self, path):
+        with open(path, "w") as handle:
+            handle.write(self.to_json())
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as handle:
+            return cls.from_json(handle.read())
+
+
+def export_directory(settings, scene_path):
+    """
+    Returns the directory exported files are written to: the custom output path, or else the scene's directory.
+    """
+    return settings.output_path if settings.custom_output else scene_path
+
+
+def temp_scene_path(settings, scene_path, file_name):
+    """
+    Works out where the temporary .mb of a scene export is written.
+
+    :param settings: The ExportSettings snapshot.
+    :param scene_path: Directory of the current scene, empty if it was never saved.
+    :param file_name: Scene file name without extension.
+    :raises ValueError: If the settings do not give a usable path, with a message for the user.
+    """
+    if settings.custom_filename:
+        if not settings.filename:
+            raise ValueError(
+                "You have not entered a custom file name.\n"
+                "Please enter a custom name and try exporting again."
+            )
+        file_name = settings.filename
+
+    if settings.custom_output:
+        if not settings.output_path:
+            raise ValueError(
+                "You have not entered a custom path.\n"
+                "Please enter a custom path and try exporting again."
+            )
+    elif not scene_path or not file_name:
+        raise ValueError(
+            "It appears you have not yet saved this scene. Please save your scene first\n"
+            "OR specify a custom output directory AND custom filename."
+        )
+    return f"{export_directory(settings, scene_path)}/{file_name}_temp.mb"
+
+
+def maya2egg_args(settings, file_name, subsets=()):
+    """
+    Builds the maya2egg arguments for an export.
+
+    :param settings: The ExportSettings snapshot.
+    :param file_name: Base name of the exported file, used as the default character name.
+    :param subsets: Only convert the geometry under these nodes of the Maya file.
+                    Lets several exports share one scene file instead of each writing its own.
+    """
+    args = [settings.maya2egg_exe, "-v", "-p"]
+    args.extend(flag for attr, flag in MAYA2EGG_FLAGS if getattr(settings, attr))
+    args.append(f"-a {settings.animation}")
+
+    # Animation frame range
+    if settings.animation in {"chan", "both", "pose"} and settings.custom_frame_range:
+        args.append(f"-sf {settings.start_frame} -ef {settings.end_frame}")
+
+    args.append(f"-trans {settings.transform}")
+
+    # Remove groundPlane_transform
+    if settings.remove_ground_plane:
+        args.append("-exclude groundPlane_transform")
+
+    # Scene up axis and units
+    args.append(f"-cs {settings.up_axis}-up")
+    args.append(f"-uo {settings.unit}")
+
+    # Character name
+    if settings.animation != "none":
+        args.append(f"-cn {(settings.character_name or file_name).replace(' ', '_')}")
+
+    for joint in settings.force_joints:
+        args.append(f"-force-joint {joint}")
+
+    for node in subsets:
+        args.append(f"-subset {node}")
+
+    # Texture paths
+    if settings.texture_path_mode != "default":
+        args.append("-ps rel")
+        if settings.egg_texture_path:
+            args.append(f'-pd "{settings.egg_texture_path}" -pp "{settings.egg_texture_path}"')
+        if settings.output_path:
+            args.append(f'-pc "{settings.output_path}"')
+
+    return " ".join(args)
+
+
+def maya2egg_copies_textures(args):
+    """
+    Whether maya2egg copies the textures of the export (-pc), a side effect a cached egg file does not have.
+    """
+    return re.search(r"(^|\s)-pc\s", args) is not None
+
+
+def maya2egg_command(settings, mb_file, egg_file, args):
+    """
+    Builds the maya2egg command that converts mb_file into egg_file.
+    """
+    if settings.overwrite:
+        return f"{args} -o \"{egg_file}\" \"{mb_file}\""
+    return f"{args} \"{mb_file}\" \"{egg_file}\""
+
+
+def egg2bam_options(settings, egg_file, export_mode=0):
+    """
+    Works out what egg2bam does with an .egg file, for egg2bam_command and the conversion worker
+    (see MayaPandaWorker.py).
+
+    :param settings: The ExportSettings snapshot.
+    :param egg_file: Path to the .egg file to be converted.
+    :param export_mode: 0 = Normal scene exporting, 1 = User has chosen a specific egg file to convert.
+    :return: Dictionary of the egg and bam file, the rawtex, flatten and overwrite options, the
+             directory texture paths are stored relative to and the one textures are copied to
+             (empty when not used), and the directories searched for textures.
+    """
+    file_name = os.path.splitext(os.path.basename(egg_file))[0]
+    file_path = os.path.dirname(egg_file)
+
+    # Handle custom output and filename for export_mode 1
+    if export_mode == 1:
+        file_name = settings.filename or file_name
+        file_path = settings.output_path or file_path
+
+    # Texture path options
+    texture_path = settings.bam_texture_path or settings.egg_texture_path or file_path
+    relative = settings.texture_path_mode != "default"
+    return {
+        "egg": egg_file,
+        "bam": os.path.join(file_path, f"{file_name}.bam"),
+        "rawtex": settings.rawtex,
+        "flatten": settings.flatten,
+        "overwrite": settings.overwrite,
+        "path_directory": texture_path if relative else "",
+        "copy_directory": texture_path if settings.texture_path_mode == "copy" else "",
+        "search_path": [file_path] if relative else [],
+    }
+
+
+def egg2bam_command(settings, egg_file, export_mode=0):
+    """
+    Builds the egg2bam command for an .egg file.
+
+    :param settings: The ExportSettings snapshot.
+    :param egg_file: Path to the .egg file to be converted.
+    :param export_mode: 0 = Normal scene exporting, 1 = User has chosen a specific egg file to convert.
+    :return: A tuple of (command, bam file path).
+    """
+    egg2bam = egg2bam_options(settings, egg_file, export_mode)
+    options = []
+    if egg2bam["rawtex"]:
+        options.append("-rawtex")
+    if egg2bam["flatten"]:
+        options.append("-flatten 1")
+
+    if egg2bam["path_directory"]:
+        options.append("-ps rel")
+        options.append(f"-pd \"{egg2bam['path_directory']}\"")
+        if egg2bam["copy_directory"]:
+            options.append(f"-pc \"{egg2bam['copy_directory']}\"")
+        options.extend(f"-pp \"{directory}\"" for directory in egg2bam["search_path"])
+
+    if egg2bam["overwrite"]:
+        options.append("-o")
+
+    bam_file = egg2bam["bam"]
+    cmd = " ".join([settings.egg2bam_exe] + options + [f"\"{bam_file}\"", f"\"{egg_file}\""])
+    return cmd, bam_file
+
+
+def version_directory(bam_version):
+    """
+    :return: The folder a bam version's files go to, its menu label with anything but letters,
+             digits, dots and dashes replaced.
+    """
+    return re.sub(r"[^\w.-]+", "_", bam_version).strip("_") or "bam"
+
+
+def egg2bam_targets(settings, egg_file, export_mode=0):
+    """
+    Works out the bams an export writes from one egg. With bam_fan_out, that is one per version,
+    each in a folder named after the version where the single bam would have gone.
+
+    :return: List of (settings, export mode) to give egg2bam_command, one per bam.
+    """
+    if not settings.bam_fan_out:
+        return [(settings, export_mode)]
+    bam_file = egg2bam_options(settings, egg_file, export_mode)["bam"]
+    directory, name = os.path.split(os.path.splitext(bam_file)[0])
+    return [
+        (
+            replace(
+                settings,
+                bam_version = bam_version,
+                egg2bam_exe = egg2bam_exe,
+                filename = name,
+                output_path = os.path.join(directory, version_directory(bam_version)),
+                bam_fan_out = (),
+            ),
+            1,
+        )
+        for bam_version, egg2bam_exe in settings.bam_fan_out
+    ]
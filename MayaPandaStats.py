@@ -0,0 +1,272 @@
+"""
+Statistics and performance budgets of exported egg files.
+
+An exported egg is scanned with MayaPandaEgg and counted per top-level node: groups, Geoms,
+vertices, triangles, distinct textures and render states, and an estimate of the draw calls Panda
+will issue for it. Each asset (exported file) can then be checked against a budget, so heavy assets
+are caught at export time rather than when profiling the game.
+This module does not import pymel.
+
+Budgets are read from ~/.mayapanda/budgets.json (or MP_PY_BUDGETS_FILE). "default" applies to
+every asset, "assets" overrides it for asset names matching a glob pattern. 0 means no limit.
+
+    {
+        "default": {"vertices": 65000, "triangles": 40000, "draw_calls": 50, "textures": 16},
+        "assets": {"env_*": {"vertices": 250000, "draw_calls": 200}}
+    }
+
+Usage:
+    python MayaPandaStats.py model.egg [more.egg ...] [--budgets budgets.json]
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import sys
+
+from dataclasses import asdict, dataclass, field, fields, replace
+from typing import List
+
+from MayaPandaEgg import EggReader
+
+BUDGETS_FILE_ENV = "MP_PY_BUDGETS_FILE"
+# Panda splits a Geom once it has more vertices than this (egg-max-vertices)
+MAX_GEOM_VERTICES = 65534
+# Attributes that structure the scene graph rather than change how primitives are drawn
+NON_STATE_ATTRIBUTES = {"objecttype", "tag", "dcs", "model", "collide"}
+# Name of the pseudo node holding primitives outside of any group
+ROOT_NODE = "<root>"
+
+
+def default_budgets_file():
+    """
+    Returns the budgets file, which can be overridden with the MP_PY_BUDGETS_FILE environment variable.
+    """
+    return os.environ.get(BUDGETS_FILE_ENV) or os.path.join(os.path.expanduser("~"), ".mayapanda", "budgets.json")
+
+
+@dataclass
+class NodeStats:
+    name: str
+    groups: int = 0
+    geoms: int = 0
+    vertices: int = 0
+    triangles: int = 0
+    textures: int = 0
+    states: int = 0
+    draw_calls: int = 0
+
+
+# Counted values, in report order
+STAT_NAMES = tuple(f.name for f in fields(NodeStats) if f.name != "name")
+
+
+@dataclass
+class EggStats:
+    path: str
+    # One entry per top-level node, in file order
+    nodes: List[NodeStats] = field(default_factory = list)
+    total: NodeStats = field(default_factory = lambda: NodeStats("total"))
+
+
+class _NodeCounter(object):
+    """
+    Collects the distinct vertices, textures, states and Geoms of one top-level node.
+    """
+
+    def __init__(self, name):
+        self.stats = NodeStats(name)
+        self.vertices = set()
+        self.textures = set()
+        self.states = set()
+        # (group, pool, state) -> vertex indices
+        self.geoms = {}
+
+    def finish(self):
+        stats = self.stats
+        stats.vertices = len(self.vertices)
+        stats.textures = len(self.textures)
+        stats.states = len(self.states)
+        stats.geoms = len(self.geoms)
+        # One draw call per Geom, and a Geom over the vertex limit is split into several
+        stats.draw_calls = sum(-(-len(indices) // MAX_GEOM_VERTICES) for indices in self.geoms.values())
+        return stats
+
+
+def _triangles(primitive):
+    if primitive.kind in ("polygon", "trianglestrip", "trianglefan"):
+        return max(0, len(primitive.vertices) - 2)
+    return 0
+
+
+def egg_stats(path):
+    """
+    Scans an egg file in one pass.
+
+    The Geom count follows how the egg loader builds geometry: the primitives of a group become
+    one Geom per vertex pool and render state. Draw calls are estimated as one per Geom, which is
+    what the model costs before it is flattened.
+
+    :return: EggStats of the file.
+    """
+    counters = []
+    # Open groups, as (group id, render attributes)
+    groups = []
+    group_ids = 0
+    counter = None
+
+    with EggReader(path) as reader:
+        for event in reader.events():
+            if event.kind == "group":
+                if event.depth == 0:
+                    counter = _NodeCounter(event.name or f"<{event.data}>")
+                    counters.append(counter)
+                counter.stats.groups += 1
+                group_ids += 1
+                groups.append((group_ids, groups[-1][1] if groups else ()))
+            elif event.kind == "end_group":
+                groups.pop()
+            elif event.kind == "attribute":
+                if groups and event.name.lower() not in NON_STATE_ATTRIBUTES:
+                    group_id, attributes = groups[-1]
+                    groups[-1] = (group_id, attributes + ((event.name.lower(), event.data),))
+            elif event.kind == "primitive":
+                primitive = event.data
+                if not groups:
+                    if not counters or counters[-1].stats.name != ROOT_NODE:
+                        counters.append(_NodeCounter(ROOT_NODE))
+                    counter = counters[-1]
+                group_id, attributes = groups[-1] if groups else (0, ())
+                state = (
+                    primitive.textures,
+                    primitive.material,
+                    tuple(sorted(primitive.attributes.items())),
+                    attributes,
+                )
+                counter.states.add(state)
+                counter.textures.update(primitive.textures)
+                counter.vertices.update((primitive.pool, index) for index in primitive.vertices)
+                counter.geoms.setdefault((group_id, primitive.pool, state), set()).update(primitive.vertices)
+                counter.stats.triangles += _triangles(primitive)
+
+    stats = EggStats(path)
+    all_textures = set()
+    all_states = set()
+    for node_counter in counters:
+        node = node_counter.finish()
+        stats.nodes.append(node)
+        all_textures |= node_counter.textures
+        all_states |= node_counter.states
+        for name in ("groups", "geoms", "vertices", "triangles", "draw_calls"):
+            setattr(stats.total, name, getattr(stats.total, name) + getattr(node, name))
+    stats.total.textures = len(all_textures)
+    stats.total.states = len(all_states)
+    return stats
+
+
+@dataclass(frozen = True)
+class Budget:
+    """
+    Limits for one asset. 0 means no limit.
+    """
+    groups: int = 0
+    geoms: int = 0
+    vertices: int = 0
+    triangles: int = 0
+    textures: int = 0
+    states: int = 0
+    draw_calls: int = 0
+
+    def violations(self, stats):
+        """
+        :param stats: NodeStats to check, normally the total of an asset.
+        :return: A list of "vertices 80000 > 65000" descriptions, empty when the stats are within budget.
+        """
+        return [
+            f"{name} {getattr(stats, name)} > {limit}"
+            for name, limit in asdict(self).items()
+            if limit and getattr(stats, name) > limit
+        ]
+
+
+class ExportBudgets(object):
+    """
+    The default budget and the per-asset overrides of a budgets file.
+    """
+
+    def __init__(self, default=None, assets=None):
+        self.default = default or Budget()
+        # (glob pattern, {stat: limit}) in file order, the first match wins
+        self.assets = list((assets or {}).items())
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Reads a budgets file. A missing file means no limits.
+        """
+        path = path or default_budgets_file()
+        if not os.path.isfile(path):
+            return cls()
+        with open(path) as handle:
+            data = json.load(handle)
+        known = {f.name for f in fields(Budget)}
+
+        def limits(values):
+            return {name: int(value) for name, value in values.items() if name in known}
+
+        assets = {pattern: limits(values) for pattern, values in data.get("assets", {}).items()}
+        return cls(Budget(**limits(data.get("default", {}))), assets)
+
+    def for_asset(self, asset):
+        """
+        :param asset: Asset name, the exported file name without its extension.
+        :return: The Budget of the asset.
+        """
+        for pattern, limits in self.assets:
+            if fnmatch.fnmatch(asset, pattern):
+                return replace(self.default, **limits)
+        return self.default
+
+    def check(self, stats):
+        """
+        :return: The budget violations of an asset's EggStats.
+        """
+        asset = os.path.splitext(os.path.basename(stats.path))[0]
+        return self.for_asset(asset).violations(stats.total)
+
+
+def format_stats(stats, violations=()):
+    """
+    :return: The lines of a plain text report of an asset's EggStats.
+    """
+    def columns(node):
+        return "  ".join(f"{getattr(node, name):>10}" for name in STAT_NAMES)
+
+    width = max([len(node.name) for node in stats.nodes] + [len(stats.total.name)])
+    lines = [f"  {'node':<{width}}  " + "  ".join(f"{name:>10}" for name in STAT_NAMES)]
+    lines.extend(f"  {node.name:<{width}}  {columns(node)}" for node in stats.nodes)
+    lines.append(f"  {stats.total.name:<{width}}  {columns(stats.total)}")
+    lines.extend(f"  OVER BUDGET: {violation}" for violation in violations)
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Show the statistics of egg files and check them against budgets.")
+    parser.add_argument("eggs", nargs = "+", help = "Egg files")
+    parser.add_argument("--budgets", default = "", help = "Budgets file, defaults to the exporter's")
+    options = parser.parse_args(argv)
+
+    budgets = ExportBudgets.load(options.budgets or None)
+    over_budget = 0
+    for path in options.eggs:
+        stats = egg_stats(path)
+        violations = budgets.check(stats)
+        over_budget += bool(violations)
+        print(path)
+        print("\n".join(format_stats(stats, violations)))
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
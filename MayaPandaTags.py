@@ -0,0 +1,263 @@
+"""
+How egg-object-types are stored on Maya nodes.
+
+A node keeps all of its egg-object-types in one string array attribute, eggObjectTypeList, in the
+order they were added. Reading a node's tags is a single plug read, and there is no limit on how
+many a node can have.
+
+maya2egg only knows the older layout: one enum attribute per type, eggObjectTypes1,
+eggObjectTypes2, ... numbered without gaps. expand_to_legacy writes that layout next to the list
+just before maya2egg reads the scene, and legacy_layout removes it again afterwards.
+collapse_to_compact goes the other way, moving legacy attributes into the list.
+
+Functions take maya.cmds as their first argument, this module does not import pymel.
+"""
+
+import contextlib
+
+from MayaPandaPrc import load_object_types
+
+ATTRIBUTE = "eggObjectTypeList"
+LEGACY_PREFIX = "eggObjectTypes"
+# The MEL exporter and older versions of this one never wrote more than ten
+LEGACY_NUMBERS = range(1, 11)
+
+
+def parse_enum(text):
+    """
+    Reads an enumName like "floor:barrier=5:tube" the way Maya does.
+
+    :return: Dictionary of value to field name, e.g. {0: "floor", 5: "barrier", 6: "tube"}.
+    """
+    fields = {}
+    value = 0
+    for field in text.split(":") if text else []:
+        name, separator, explicit = field.partition("=")
+        if separator:
+            value = int(explicit)
+        fields[value] = name
+        value += 1
+    return fields
+
+
+def object_type_ids():
+    """
+    :return: Dictionary of egg-object-type name to its stable id.
+    """
+    return {entry["name"]: entry["id"] for entry in load_object_types()["types"]}
+
+
+def legacy_number(attribute):
+    """
+    :return: The number of an eggObjectTypesN attribute name, or None for any other attribute.
+    """
+    suffix = attribute[len(LEGACY_PREFIX):]
+    if attribute.startswith(LEGACY_PREFIX) and suffix.isdigit():
+        return int(suffix)
+    return None
+
+
+def plug_patterns():
+    """
+    :return: ls patterns matching every egg-object-type attribute of a scene, the list and the legacy ones.
+    """
+    return [f"*.{ATTRIBUTE}"] + [f"*.{LEGACY_PREFIX}{number}" for number in LEGACY_NUMBERS]
+
+
+def tagged_nodes(cmds):
+    """
+    :return: Every node with an eggObjectTypeList, as long names, from a single ls.
+    """
+    return [plug.rpartition(".")[0] for plug in cmds.ls(f"*.{ATTRIBUTE}", long = True, recursive = True) or []]
+
+
+def legacy_plugs(cmds):
+    """
+    :return: Every eggObjectTypesN attribute in the scene, as long plug names, from a single ls.
+    """
+    patterns = [f"*.{LEGACY_PREFIX}{number}" for number in LEGACY_NUMBERS]
+    return cmds.ls(patterns, long = True, recursive = True) or []
+
+
+def read_legacy(cmds, plug):
+    """
+    :return: The egg-object-type name an eggObjectTypesN plug holds, or its value as a string
+             when the enum has no field for it.
+    """
+    node, _, attribute = plug.rpartition(".")
+    value = int(cmds.getAttr(plug))
+    enum_text = (cmds.attributeQuery(attribute, node = node, listEnum = True) or [""])[0]
+    return parse_enum(enum_text).get(value, str(value))
+
+
+def read_types(cmds, node):
+    """
+    :return: The egg-object-types of a node: those of its legacy attributes first, then the list.
+    """
+    names = []
+    for number in LEGACY_NUMBERS:
+        plug = f"{node}.{LEGACY_PREFIX}{number}"
+        if cmds.objExists(plug):
+            names.append(read_legacy(cmds, plug))
+    if cmds.objExists(f"{node}.{ATTRIBUTE}"):
+        names.extend(name for name in cmds.getAttr(f"{node}.{ATTRIBUTE}") or [] if name not in names)
+    return names
+
+
+def write_types(cmds, node, names, attributes=()):
+    """
+    Stores the egg-object-types of a node in its eggObjectTypeList, with one setAttr.
+    The node's eggObjectTypesN attributes are deleted, their types have to be part of names.
+
+    :param node: Long node name.
+    :param names: Every egg-object-type the node should have, in order. An empty list removes the attribute.
+    :param attributes: The egg-object-type attributes the node has now, eggObjectTypeList and eggObjectTypesN.
+    """
+    for attribute in attributes:
+        if attribute != ATTRIBUTE:
+            cmds.deleteAttr(f"{node}.{attribute}")
+    if not names:
+        if ATTRIBUTE in attributes:
+            cmds.deleteAttr(f"{node}.{ATTRIBUTE}")
+        return
+    if ATTRIBUTE not in attributes:
+        cmds.addAttr(node, longName = ATTRIBUTE, dataType = "stringArray")
+    cmds.setAttr(f"{node}.{ATTRIBUTE}", len(names), *names, type = "stringArray")
+
+
+def assign_types(cmds, assignments):
+    """
+    Adds egg-object-types to many nodes. Their current types are found with one ls, and every
+    node that gets a new type is written once.
+
+    :param assignments: Dictionary of long node name to the egg-object-type names to add.
+    :return: Dictionary of node to the egg-object-types that were added to it.
+    """
+    current = {node: [] for node in assignments}
+    attributes = {}
+    plugs = [
+        f"{node}.{attribute}"
+        for node in assignments
+        for attribute in [f"{LEGACY_PREFIX}{number}" for number in LEGACY_NUMBERS] + [ATTRIBUTE]
+    ]
+    for plug in cmds.ls(plugs, long = True) or [] if plugs else []:
+        node, _, attribute = plug.rpartition(".")
+        attributes.setdefault(node, []).append(attribute)
+        names = cmds.getAttr(plug) or [] if attribute == ATTRIBUTE else [read_legacy(cmds, plug)]
+        current[node].extend(name for name in names if name not in current[node])
+
+    added = {}
+    for node, types in assignments.items():
+        new_types = [name for name in dict.fromkeys(types) if name not in current[node]]
+        if new_types:
+            write_types(cmds, node, current[node] + new_types, attributes.get(node, ()))
+            added[node] = new_types
+    return added
+
+
+def expand_to_legacy(cmds, type_ids):
+    """
+    Adds eggObjectTypesN attributes for the egg-object-types in every eggObjectTypeList, in the
+    numbers the legacy attributes a node already has leave free, so maya2egg sees all of its types.
+
+    :param type_ids: Dictionary of egg-object-type name to stable id, used as the enum values.
+    :return: The plugs that were added.
+    """
+    # node -> {number: egg-object-type} of the legacy attributes already there
+    legacy = {}
+    for plug in legacy_plugs(cmds):
+        node, _, attribute = plug.rpartition(".")
+        legacy.setdefault(node, {})[legacy_number(attribute)] = read_legacy(cmds, plug)
+
+    added = []
+    for node in tagged_nodes(cmds):
+        existing = legacy.get(node, {})
+        number = 1
+        for name in cmds.getAttr(f"{node}.{ATTRIBUTE}") or []:
+            if name in existing.values():
+                continue
+            # maya2egg stops at the first missing number, so gaps are filled first
+            while number in existing:
+                number += 1
+            type_id = type_ids.get(name, 0)
+            cmds.addAttr(
+                node,
+                longName = f"{LEGACY_PREFIX}{number}",
+                attributeType = "enum",
+                enumName = f"{name}={type_id}",
+                defaultValue = type_id,
+                keyable = True,
+            )
+            added.append(f"{node}.{LEGACY_PREFIX}{number}")
+            existing[number] = name
+    return added
+
+
+@contextlib.contextmanager
+def legacy_layout(cmds, type_ids):
+    """
+    Expands every eggObjectTypeList to eggObjectTypesN attributes for the duration of the block,
+    which is where the scene is written for maya2egg. Nothing of it ends up in the undo queue,
+    and the scene keeps its modified state.
+
+    :return: The plugs that were added. When there are any, the scene file on disk does not hold
+             them and cannot be given to maya2egg as it is.
+    """
+    modified = cmds.file(query = True, modified = True)
+    undo_state = cmds.undoInfo(query = True, stateWithoutFlush = True)
+    cmds.undoInfo(stateWithoutFlush = False)
+    added = []
+    try:
+        added = expand_to_legacy(cmds, type_ids)
+        yield added
+    finally:
+        # Tagging inside the block moves the types into the list and deletes the attributes itself
+        for plug in cmds.ls(added, long = True) if added else []:
+            cmds.deleteAttr(plug)
+        cmds.undoInfo(stateWithoutFlush = undo_state)
+        if added and not modified:
+            cmds.file(modified = False)
+
+
+def collapse_to_compact(cmds, type_ids, dry_run=False):
+    """
+    Moves every eggObjectTypesN attribute of the scene into the eggObjectTypeList of its node.
+    Attributes whose value is not a known egg-object-type are reported and left alone.
+
+    :param type_ids: Dictionary of egg-object-type name to stable id.
+    :param dry_run: Only report what would change.
+    :return: Report dictionary with the number of plugs checked and nodes changed, and lists of the
+             migrated, unknown and failed plugs.
+    """
+    report = {"plugs": 0, "nodes": 0, "migrated": [], "unknown": [], "failed": []}
+    # node -> [(number, attribute, egg-object-type)]
+    legacy = {}
+    for plug in legacy_plugs(cmds):
+        report["plugs"] += 1
+        node, _, attribute = plug.rpartition(".")
+        name = read_legacy(cmds, plug)
+        if name not in type_ids:
+            report["unknown"].append(f"{plug} = {name}")
+            continue
+        legacy.setdefault(node, []).append((legacy_number(attribute), attribute, name))
+
+    listed = set(tagged_nodes(cmds)) if legacy else set()
+    for node, entries in legacy.items():
+        entries.sort()
+        attributes = [attribute for _, attribute, _ in entries]
+        names = [name for _, _, name in entries]
+        if node in listed:
+            attributes.append(ATTRIBUTE)
+            names.extend(name for name in cmds.getAttr(f"{node}.{ATTRIBUTE}") or [] if name not in names)
+        names = list(dict.fromkeys(names))
+        plugs = [f"{node}.{attribute} = {name}" for _, attribute, name in entries]
+        if not dry_run:
+            try:
+                write_types(cmds, node, names, attributes)
+            except RuntimeError as error:
+                # Attributes of referenced or locked nodes have to be migrated in their own file
+                report["failed"].extend(f"{plug}: {str(error).strip()}" for plug in plugs)
+                continue
+        report["nodes"] += 1
+        report["migrated"].extend(plugs)
+    return report
@@ -7,22 +7,65 @@ You will need to run pip install natsort on your mayapy.exe in order to use this
 
 from enum import IntEnum
 
+import maya.api.OpenMaya as om
+import maya.utils
 import pymel.core as pm
+import bisect
 import os
+import re
+import threading
 import time
 
+from collections import Counter, OrderedDict
 from natsort import natsorted
 from typing import List
 from dataclasses import dataclass, field
 from functools import partial
 
+from MayaPandaAudit import ISSUE_KINDS, audit_scene
+from MayaPandaCache import BuildCache, forget_stamp, save_scene_copy, scene_references
+from MayaPandaConvert import EGG_EXTENSIONS, egg2bam_jobs, expand_files, is_up_to_date
+from MayaPandaImport import (
+    BAM_EXTENSIONS, PANDA_FILE_EXTENSIONS, bam2egg_jobs, egg_conversions, import_egg_path, inside_root
+)
+from MayaPandaJobs import AsyncJobRunner, ConversionJob, JobPool, pool_size, run_job
+from MayaPandaMetrics import ExportRun, MetricsHistory, format_report
+from MayaPandaPrc import load_object_types
+from MayaPandaRules import TagRules, default_rules_file, scene_facts
+from MayaPandaSettings import (
+    ExportSettings, egg2bam_command, egg2bam_targets, export_directory, maya2egg_args, maya2egg_command,
+    maya2egg_copies_textures, temp_scene_path
+)
+from MayaPandaStats import ExportBudgets, egg_stats, format_stats
+from MayaPandaTags import (
+    ATTRIBUTE as EGG_OBJECT_TYPE_LIST, LEGACY_NUMBERS, LEGACY_PREFIX, collapse_to_compact, legacy_layout, legacy_number,
+    write_types
+)
+from MayaPandaViewer import ViewerClient
+from MayaPandaWorker import WorkerClient, egg2bam_job
+
 # region GLOBALS
 EGG_OBJECT_TYPE_ARRAY = "gMP_PY_EggObjectTypeArray"
 PANDA_FILE_VERSIONS = "gMP_PY_PandaFileVersions"
 PANDA_SDK_NOTICE = "gMP_PY_ChoosePandaFileNotice"
+PHASE_ROOT_DIR = "gMP_PY_PhaseRootDir"
 ADDON_RELEASE_VERSION = "gMP_PY_ReleaseRevision"
 MAYA_VER_SHORT = "gMP_PY_MayaVersionShort"
 
+# Runs maya2egg/egg2bam/pview in the background, completion callbacks come back on Maya's main thread
+MP_PY_JOB_RUNNER = AsyncJobRunner(pool_size(), deferred = maya.utils.executeDeferred)
+# Previously exported eggs, keyed by the exported .mb contents, maya2egg arguments and maya2egg version
+MP_PY_BUILD_CACHE = BuildCache()
+# Per-stage timings of every export, see MP_PY_ExportMetricsReportGUI
+MP_PY_METRICS = MetricsHistory()
+# The live preview viewer, started by the first export that uses it
+MP_PY_VIEWER = ViewerClient()
+# The panda3d conversion worker, started by the first egg2bam conversion that uses it
+MP_PY_WORKER = WorkerClient(on_reply = MP_PY_JOB_RUNNER.wake)
+# State of the Add Egg-Object-Types window: the registry it was built from, the categories whose
+# buttons exist, the visible buttons, the hidden categories and the current search matches
+MP_PY_OT_PALETTE = {"registry": None, "built": set(), "visible": set(), "hidden": set(), "matches": None}
+
 # endregion
 
 """
@@ -82,7 +125,9 @@ class OTCategory(IntEnum):
     ToontownAttr = 900  # specific to toontown
 
 
-@dataclass
+# Categories are singletons compared by identity. This also keeps them hashable,
+# which Python 3.11+ (Maya 2025) requires of ObjectTypeDefinition's default category.
+@dataclass(eq = False)
 class ObjectTypeCategoryDefinition:
     name: str
     type_id: OTCategory
@@ -96,7 +141,7 @@ class ObjectTypeCategoryDefinition:
     FrameLayout = None
 
     def get_children(self):
-        return natsorted(self.children, key = lambda x: x.name.lower())
+        return OT_REGISTRY.children(self)
 
 
 ## Define custom categories ##
@@ -143,6 +188,8 @@ class ObjectTypeDefinition:
     category: ObjectTypeCategoryDefinition = NoCategory
     friendly_name: str = ""
     text_color: str = ""
+    # Stable id, the value stored in the eggObjectTypes enum attributes. Never changes once handed out.
+    mel_id: int = -1
 
     @property
     def color(self):
@@ -151,428 +198,182 @@ class ObjectTypeDefinition:
         return self.text_color
 
     # Maya controllers
-    mel_id = -1  # todo? meant to be stored as the internal enum value when defined into a mel global attr
     Button = None  # Used in the add ot window to store the button object
 
 
 ###
 
 
-OT_NEW = [
-    ObjectTypeDefinition(
-        name = "barrier",
-        description = [
-            'Creates a barrier that other objects cannot pass through.',
-            'The collision is active on the "Normals" side of the object(s)'
-        ],
-        category = CollideCategory,
-        flags = ['<Collide> { Polyset descend }']
-    ),
-    ObjectTypeDefinition(
-        name = "barrier-no-mask",
-        description = [],
-        category = CollideCategory,
-        flags = ['<Collide> { Polyset descend }']
-    ),
-    ObjectTypeDefinition(
-        name = "floor",
-        description = [
-            'Creates a collision from the object(s) that "Avatars" can walk on.',
-            'If the surface is angled, the Avatar will not slide down it.',
-            'The collision is active on the "Normals" side of the object(s)'
-        ],
-        category = CollideCategory,
-        flags = ['<Scalar> collide-mask { 0x02 }', '<Collide> { Polyset descend level }']
-    ),
-    ObjectTypeDefinition(
-        name = "floor-collide",
-        description = [],
-        category = CollideCategory,
-        flags = ['<Scalar> collide-mask { 0x06 }']
-    ),
-    ObjectTypeDefinition(
-        name = "shadow",
-        description = [
-            'Define a "shadow" object type, so we can render all shadows in their own bin '
-            'and have them not fight with other transparent geometry.'
-        ],
-        flags = ['<Scalar> bin { shadow }', '<Scalar> alpha { blend-no-occlude }'],
-        category = BinCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "shadow-cast",
-        description = [
-            'Gives the selected object(s) the required attributes so that an "Avatar\'s" shadow can be cast over it.',
-            'Commonly used for casting an "Avatar\'s" shadow onto floors.'
-        ],
-        flags = ['<Tag> cam { shground }', '<Scalar> draw-order { 0 }', '<Scalar> bin { ground }'],
-        category = BinCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "bin-fixed",
-        flags = ['<Scalar> bin { fixed }'],
-        category = BinCategory,
-        friendly_name = "Fixed"
-    ),
-    ObjectTypeDefinition(
-        name = "bin-gui-popup",
-        flags = ['<Scalar> bin { gui-popup }'],
-        category = BinCategory,
-        friendly_name = "GUI Popup"
-    ),
-    ObjectTypeDefinition(
-        name = "bin-unsorted",
-        flags = ['<Scalar> bin { unsorted }'],
-        category = BinCategory,
-        friendly_name = "Unsorted"
-    ),
-    ObjectTypeDefinition(
-        name = "bin-opaque",
-        flags = ['<Scalar> bin { opaque }'],
-        category = BinCategory,
-        friendly_name = "Opaque"
-    ),
-    ObjectTypeDefinition(
-        name = "bin-background",
-        flags = ['<Scalar> bin { background }'],
-        category = BinCategory,
-        friendly_name = "Background"
-    ),
-    ObjectTypeDefinition(
-        name = "bin-transparent",
-        flags = ['<Scalar> bin { transparent }'],
-        category = BinCategory,
-        friendly_name = "Transparent"
-    ),
-    ObjectTypeDefinition(
-        name = "dupefloor",
-        description = [
-            'This type first creates a duplicate of the selected object(s).',
-            'Then, creates a floor collision from the duplicate object(s) that "Avatars" can walk on.',
-            'If the surface is angled, the Avatar will not slide down it.',
-            'The collision is active on the "Normals" side of the object(s)'
-        ],
-        category = CollideCategory,
-        flags = ['<Collide> { Polyset keep descend level }']
-    ),
-    ObjectTypeDefinition(
-        name = "smooth-floors",
-        description = ['Makes floors smooth for the "Avatars" to walk and stand on.'],
-        flags = [
-            '<Collide> { Polyset descend }',
-            '<Scalar> from-collide-mask { 0x000fffff }',
-            '<Scalar> into-collide-mask { 0x00000002 }'
-        ],
-        category = CollideCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "camera-collide",
-        description = ['Allows only the camera to collide with the geometry.'],
-        flags = [
-            '<Scalar> collide-mask { 0x04 }',
-            '<Collide> { Polyset descend }'
-        ],
-        category = CollideCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "sphere",
-        description = [
-            'Creates a "minimum-sized" sphere collision around the selected object(s), '
-            'that other objects cannot enter into.'
-        ],
-        flags = ['<Collide> { Sphere descend }'],
-        category = CollideCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "tube",
-        description = [
-            'Creates a "minimum-sized" tube collision around the selected object(s), '
-            'that other objects cannot enter into.'
-        ],
-        flags = ['<Collide> { Tube descend }'],
-        category = CollideCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "trigger",
-        description = [
-            'Creates a collision that can be used as a "Trigger", which can be used to activate, or deactivate, '
-            'specific processes.',
-            'The collision is active on the "Normals" side of the object(s)'
-        ],
-        flags = ['<Collide> { Polyset descend intangible }'],
-        category = TriggerCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "trigger-sphere",
-        description = [
-            'Creates a "minimum-sized" sphere collision that can be used as a "Trigger", which can be used to activate,'
-            ' or deactivate, specific processes.',
-            'The collision is active on the "Normals" side of the object(s)'
-        ],
-        flags = ['<Collide> { Sphere descend intangible }'],
-        category = TriggerCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "invsphere",
-        description = [
-            'Creates a "minimum-sized" inverse-sphere collision around the selected object(s). '
-            'Any object inside the sphere will be prevented from exiting the sphere.'
-        ],
-        flags = ['<Collide> { InvSphere descend }'],
-        category = CollideCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "bubble",
-        description = [
-            '"bubble" puts a Sphere collision around the geometry, but does not otherwise remove the geometry.'
-        ],
-        flags = ['<Collide> { Sphere keep descend }'],
-        category = CollideCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "dual",
-        description = [
-            'Normally attached to polygons that have transparency, '
-            'that are in the scene by themselves, such as a Tree or Flower.'
-        ],
-        flags = ['<Scalar> alpha { dual }'],
-        category = AlphaBlendModeCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "multisample",
-        flags = ['<Scalar> alpha { ms }'],
-        category = AlphaBlendModeCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "blend",
-        flags = ['<Scalar> alpha { blend }'],
-        category = AlphaBlendModeCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "decal",
-        flags = ['<Scalar> decal { 1 }']
-    ),
-    ObjectTypeDefinition(
-        name = "ghost",
-        description = [
-            '"ghost" turns off the normal collide bit that is set on visible geometry by default, '
-            'so that if you are using visible geometry for collisions, '
-            'this particular geometry will not be part of those collisions--'
-            'it is ghostlike. Characters will pass through it.'
-        ],
-        flags = ['<Scalar> collide-mask { 0 }']
-    ),
-    ObjectTypeDefinition(
-        name = "glass",
-        flags = ['<Scalar> alpha { blend_no_occlude }'],
-        category = AlphaBlendModeCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "glow",
-        description = [
-            '"glow" is useful for halo effects and things of that ilk. It renders the object in add mode instead '
-            'of the normal opaque mode.'
-        ],
-        flags = ['<Scalar> blend { add }'],
-        friendly_name = "Add",
-        category = AlphaOperationCategory
-    ),
-    ObjectTypeDefinition(
-        name = "binary",
-        description = [
-            'This mode of alpha sets transparency pixels to either on or off. No blending is used.'
-        ],
-        flags = ['<Scalar> alpha { binary }'],
-        category = AlphaBlendModeCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "indexed",
-        flags = ['<Scalar> indexed { 1 }']
-    ),
-    ObjectTypeDefinition(
-        name = "model",
-        description = [
-            'This creates a ModelNode at the corresponding level, which is guaranteed not to be removed by any '
-            'flatten operation. However, its transform might still be changed.'
-        ],
-        flags = ['<Model> { 1 }']
-    ),
-    ObjectTypeDefinition(
-        name = "dcs",
-        description = [
-            'Indicates the node should not be flattened out of the hierarchy during conversion. '
-            'The node\'s transform is important and should be preserved.'
-        ],
-        flags = ['<DCS> { 1 }'],
-        category = DCSCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "netdcs",
-        flags = ['<DCS> { net }'],
-        category = DCSCategory,
-        friendly_name = "Net"
-
-    ),
-    ObjectTypeDefinition(
-        name = "localdcs",
-        flags = ['<DCS> { local }'],
-        category = DCSCategory,
-        friendly_name = "Local"
-
-    ),
-    ObjectTypeDefinition(
-        name = "notouch",
-        description = [
-            'Indicates the node, and below, should not be flattened out of the hierarchy during the conversion process.'
-        ],
-        flags = ['<DCS> { no-touch }'],
-        category = DCSCategory,
-
-    ),
-    ObjectTypeDefinition(
-        name = "double-sided",
-        description = [
-            'Defines whether the polygon will be rendered double-sided (i.e., its back face will be visible).'
-        ],
-        flags = ['<BFace> { 1 }']
-    ),
-    ObjectTypeDefinition(
-        name = "billboard",
-        description = [
-            'Rotates the geometry to always face the camera. Geometry will rotate on its local axis.'
-        ],
-        flags = ['<Billboard> { axis }'],
-        friendly_name = "BB-Axis",
-        category = BillboardCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "seq2",
-        description = [
-            'Indicates a series of animation frames that should be consecutively displayed at 2 fps.'
-        ],
-        flags = ['<Switch> { 1 }', '<Scalar> fps { 2 }'],
-        category = SequenceCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "seq4",
-        description = [
-            'Indicates a series of animation frames that should be consecutively displayed at 4 fps.'
-        ],
-        flags = ['<Switch> { 1 }', '<Scalar> fps { 4 }'],
-        category = SequenceCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "seq6",
-        description = [
-            'Indicates a series of animation frames that should be consecutively displayed at 6 fps.'
-        ],
-        flags = ['<Switch> { 1 }', '<Scalar> fps { 6 }'],
-        category = SequenceCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "seq8",
-        description = [
-            'Indicates a series of animation frames that should be consecutively displayed at 8 fps.'
-        ],
-        flags = ['<Switch> { 1 }', '<Scalar> fps { 8 }'],
-        category = SequenceCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "seq10",
-        description = [
-            'Indicates a series of animation frames that should be consecutively displayed at 10 fps.'
-        ],
-        flags = ['<Switch> { 1 }', '<Scalar> fps { 10 }'],
-        category = SequenceCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "seq12",
-        description = [
-            'Indicates a series of animation frames that should be consecutively displayed at 12 fps.'
-        ],
-        flags = ['<Switch> { 1 }', '<Scalar> fps { 12 }'],
-        category = SequenceCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "seq24",
-        description = [
-            'Indicates a series of animation frames that should be consecutively displayed at 24 fps.'
-        ],
-        flags = ['<Switch> { 1 }', '<Scalar> fps { 24 }'],
-        category = SequenceCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "ground",
-        flags = ['<Scalar> bin { ground }'],
-        category = BinCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "invisible",
-        flags = []
-    ),
-    ObjectTypeDefinition(
-        name = "catch-grab",
-        flags = ['<Scalar> collide-mask { 0x08 }'],
-        description = ['Things the magnet can pick up in the Cashbot CFO battle (same as CatchGameBitmask)'],
-        category = ToontownCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "pet",
-        flags = ['<Scalar> collide-mask { 0x10 }'],
-        description = ['Pets avoid this'],
-        category = ToontownCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "furniture-side",
-        flags = ['<Scalar> collide-mask { 0x20 }'],
-        category = ToontownCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "furniture-top",
-        flags = ['<Scalar> collide-mask { 0x40 }'],
-        category = ToontownCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "furniture-drag",
-        flags = ['<Scalar> collide-mask { 0x80 }'],
-        category = ToontownCategory,
-    ),
-    ObjectTypeDefinition(
-        name = "pie",
-        flags = ['<Scalar> collide-mask { 0x100 }'],
-        category = ToontownCategory,
-        description = ['Things we can throw a pie at.'],
-    ),
-]
+def MP_PY_LoadObjectTypes():
+    """
+    Builds the ObjectTypeDefinitions from eggattribs.txt, the user's PRC files and the eggattribs.json sidecar.
+    See MayaPandaPrc.py, the parsed result is cached on disk until one of the files changes.
+    """
+    categories = {category.name: category for category in list(CategoryDefs.values()) + [TagCategory]}
+    try:
+        loaded = load_object_types()
+    except (OSError, ValueError) as error:
+        print(f"Could not load the egg-object-types: {error}")
+        return []
+    if loaded["undefined"]:
+        print(
+            "These egg-object-types are not defined in eggattribs.txt or any PRC file, "
+            f"egg2bam will not know them: {', '.join(loaded['undefined'])}"
+        )
+    return [
+        ObjectTypeDefinition(
+            name = entry["name"],
+            mel_id = entry["id"],
+            description = list(entry["description"]),
+            flags = list(entry["flags"]),
+            category = categories.get(entry["category"], NoCategory),
+            friendly_name = entry["friendly_name"],
+            text_color = entry["text_color"],
+        )
+        for entry in loaded["types"]
+    ]
 
 
-def getOTNames(sortby=None):
-    names = [ot.name for ot in OT_NEW]
-    if sortby == "alphabetical":
-        names = natsorted(names)
-    elif sortby == "category":
-        def sorting_key(item):
-            category_id = item.category.type_id if item.category is not None else NoCategory.type_id
-            name_lower = item.name.lower()
-            return category_id, name_lower
+OT_NEW = MP_PY_LoadObjectTypes()
+# Words of the ObjectType search, "camera-collide" is camera and collide
+SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+class ObjectTypeRegistry(object):
+    """
+    Index over the ObjectType definitions: lookup by name, the enum index of every name, the
+    sorted views used by the windows and the search index. The views are built on first use and
+    only rebuilt after a definition is added or removed, which also bumps the generation.
+
+    The registry owns the children lists of the categories.
+    """
 
-        names = [ot.name for ot in natsorted(OT_NEW, key = sorting_key)]
-    return names
+    def __init__(self, definitions, categories):
+        self.categories = categories
+        self._definitions = {}
+        self._views = {}
+        # Changes whenever a definition is added or removed, windows built from the views compare it
+        self.generation = 0
+        for category in list(categories.values()) + [definition.category for definition in definitions]:
+            category.children.clear()
+        for definition in definitions:
+            self.add(definition)
+
+    def add(self, definition):
+        if definition.name in self._definitions:
+            raise ValueError(f"ObjectType {definition.name} is already defined")
+        if definition.mel_id in self.ids().values():
+            raise ValueError(f"ObjectType {definition.name} reuses the id {definition.mel_id}")
+        self._definitions[definition.name] = definition
+        definition.category.children.append(definition)
+        self._views.clear()
+        self.generation += 1
+
+    def remove(self, name):
+        definition = self._definitions.pop(name)
+        definition.category.children.remove(definition)
+        self._views.clear()
+        self.generation += 1
+        return definition
+
+    def get(self, name, default=None):
+        return self._definitions.get(name, default)
+
+    def __getitem__(self, name):
+        return self._definitions[name]
+
+    def __contains__(self, name):
+        return name in self._definitions
+
+    def __iter__(self):
+        return iter(self._definitions.values())
+
+    def __len__(self):
+        return len(self._definitions)
+
+    def _view(self, key, build):
+        if key not in self._views:
+            self._views[key] = build()
+        return self._views[key]
+
+    def names(self, sortby=None):
+        """
+        :param sortby: None for definition order, "alphabetical" or "category".
+        :return: Tuple of the ObjectType names.
+        """
+        if sortby == "alphabetical":
+            return self._view("alphabetical", lambda: tuple(natsorted(self._definitions)))
+        if sortby == "category":
+            def sorting_key(item):
+                category_id = item.category.type_id if item.category is not None else NoCategory.type_id
+                return category_id, item.name.lower()
+
+            return self._view("category", lambda: tuple(
+                ot.name for ot in natsorted(self._definitions.values(), key = sorting_key)
+            ))
+        return self._view("definition", lambda: tuple(self._definitions))
+
+    def ids(self):
+        """
+        :return: Dictionary of name to stable id, the value of the eggObjectTypesN attributes written for maya2egg.
+        """
+        return self._view("ids", lambda: {name: definition.mel_id for name, definition in self._definitions.items()})
+
+    def category_index(self, category):
+        """
+        :return: Position of the category in the categories, the order the windows list them in.
+        """
+        positions = self._view("category_index", lambda: {c.name: i for i, c in enumerate(self.categories.values())})
+        return positions[category.name]
+
+    def children(self, category):
+        """
+        :return: Tuple of the category's definitions, sorted by name.
+        """
+        return self._view(
+            ("children", category.name), lambda: tuple(natsorted(category.children, key = lambda x: x.name.lower()))
+        )
 
+    def _search_index(self):
+        # token -> names, and the tokens sorted so a prefix is a slice of them
+        index = {}
+        for definition in self._definitions.values():
+            text = " ".join(
+                [definition.name, definition.friendly_name, definition.category.friendly_name] + definition.description
+            )
+            for token in set(SEARCH_TOKEN_RE.findall(text.lower())):
+                index.setdefault(token, set()).add(definition.name)
+        return index, sorted(index)
+
+    def search(self, text):
+        """
+        Finds the definitions whose name, label, category or description has a word starting with
+        every word of the text, e.g. "cam col" finds camera-collide.
+
+        :return: Frozenset of the matching names, or None when the text has no words.
+        """
+        words = SEARCH_TOKEN_RE.findall(text.lower())
+        if not words:
+            return None
+        index, tokens = self._view("search", self._search_index)
+        matches = None
+        for word in words:
+            found = set()
+            position = bisect.bisect_left(tokens, word)
+            while position < len(tokens) and tokens[position].startswith(word):
+                found |= index[tokens[position]]
+                position += 1
+            matches = found if matches is None else matches & found
+            if not matches:
+                break
+        return frozenset(matches)
+
+
+# Every defined ObjectType, populates the categories with their children
+OT_REGISTRY = ObjectTypeRegistry(OT_NEW, CategoryDefs)
 
-# Populates categories with children
-for OTEntry in OT_NEW:
-    OTEntry.category.children.append(OTEntry)
+
+def getOTNames(sortby=None):
+    return list(OT_REGISTRY.names(sortby))
 
 
 # endregion
@@ -603,6 +404,15 @@ def MP_PY_PandaVersion(option):
     return executableToUse
 
 
+def MP_PY_PandaVersions():
+    """
+    :return: List of (menu label, bam2egg, egg2bam, pview) of every entry of $gMP_PY_PandaFileVersions.
+    """
+    pm.melGlobals.initVar("string[]", PANDA_FILE_VERSIONS)
+    versions = list(pm.melGlobals[PANDA_FILE_VERSIONS])
+    return [tuple(versions[i:i + 4]) for i in range(0, len(versions) - 3, 4)]
+
+
 def MP_PY_ConfirmationDialog(title, message, dialog_type):
     """
     Shows a confirmation dialog with the given title, message, and button type.
@@ -652,59 +462,18 @@ def MP_PY_PlaceholderFunc(*args, **kwargs):
     )
 
 
-def MP_PY_AddEggObjectFlags(eggObjectType):
+def MP_PY_AddEggObjectFlags(eggObjectType, nodes=None):
     """
-    Add an egg-object-type to poly
+    Add an egg-object-type to the selected nodes.
+
+    :param eggObjectType: Name of the egg-object-type.
+    :param nodes: Nodes to tag instead of the selection.
+    :return: The nodes that were tagged.
     """
-    pm.melGlobals.initVar("string[]", EGG_OBJECT_TYPE_ARRAY)
-    # global egg-object-type array
-    # generate attribute enumeration list from the array
-    enumerationList = ":".join(pm.melGlobals[EGG_OBJECT_TYPE_ARRAY])
     # Verify the eggObjectType that was passed to this process exists in the $gMP_PY_EggObjectTypeArray array
-    # If it does not, we skip processing and warn user.
-    eggTypeInArray = eggObjectType in pm.melGlobals[EGG_OBJECT_TYPE_ARRAY]
-    if eggTypeInArray == 1:
-        indexNumber = -1
-        # String version of array index number.
-        # This is necessary, so we can verify the index number is not null/empty
-        # Get the array index number of the $eggObjectType passed to this process
-        # by iterating through each array item and compare them to the $eggObjectType
-        for n in range(0, len(pm.melGlobals[EGG_OBJECT_TYPE_ARRAY])):
-            if pm.melGlobals[EGG_OBJECT_TYPE_ARRAY][n] == eggObjectType:
-                indexNumber = int(n)
-
-        selectedNodes = pm.ls(sl = 1)
-        # Variable to hold all currently selected nodes
-        # Iterate through each selected node one-by-one
-        if len(selectedNodes) == 0:
-            return MP_PY_ConfirmationDialog(
-                "Selection Error!",
-                [
-                    "You must first make a selection!",
-                    "Please select at least one node, then try again."
-                ],
-                "ok",
-            )
-
-        for node in selectedNodes:
-            for i in range(1, 11):
-                if pm.objExists(str(node) + ".eggObjectTypes" + str(i)) == 1:
-                    # At the very moment, we set our egg tag limit to 10 per node.
-                    # There's not really a reason right now for why a user will get to this limit, but
-                    # due to some prior hard-coded values with egg object types, we are capping it at 10.
-                    if i == 10:
-                        MP_PY_ConfirmationDialog(
-                            "Egg-Object-Type Error!",
-                            [
-                                "Limit of 10 egg-object-types has already been reached.",
-                                "No More Egg Object Types Supported for this node."
-                            ],
-                            "ok",
-                        )
-                else:
-                    MP_PY_SetEggObjectTypeAttribute(enumerationList, eggObjectType, indexNumber, i, node)
-                    break
-    else:
+    # (filled from OT_REGISTRY by MP_PY_Globals). If it does not, we skip processing and warn user.
+    if eggObjectType not in OT_REGISTRY:
+        # Message to user that the passed egg-object-type is NOT in the $gMP_PY_EggObjectTypeArray array
         MP_PY_ConfirmationDialog(
             "Egg-Object-Type Error!",
             [
@@ -716,11 +485,477 @@ def MP_PY_AddEggObjectFlags(eggObjectType):
             ],
             "ok",
         )
-    # Message to user that the passed egg-object-type is NOT in the $gMP_PY_EggObjectTypeArray array
+        return []
 
+    if nodes is None:
+        selectedNodes = pm.cmds.ls(selection = True, long = True)
+    else:
+        selectedNodes = pm.cmds.ls(nodes, long = True) if nodes else []
+    if not selectedNodes:
+        MP_PY_ConfirmationDialog(
+            "Selection Error!",
+            [
+                "You must first make a selection!",
+                "Please select at least one node, then try again."
+            ],
+            "ok",
+        )
+        return []
+
+    tagged = MP_PY_AssignEggObjectTypes({node: (eggObjectType,) for node in selectedNodes})
+
+    # Method to update the DeleteEggObjectTypesWindow window if it is currently being shown
     if pm.window("MP_PY_DeleteEggObjectTypesWindow", exists = 1):
         MP_PY_GetEggObjectTypes()
-    # Method to update the DeleteEggObjectTypesWindow window if it is currently being shown
+    return list(tagged)
+
+
+def MP_PY_ReadEggObjectTypes(nodes, attributes=None):
+    """
+    Reads the egg-object-types of many nodes at once.
+
+    A single ls finds which nodes have an eggObjectTypeList (and which still have eggObjectTypes1..10
+    attributes from older versions), and only those plugs are read, through the API rather than one
+    getAttr each. A node's list is one plug read, however many types it holds.
+
+    :param nodes: Long node names.
+    :param attributes: Dictionary to fill with node to the names of its egg-object-type attributes.
+    :return: Dictionary of node to its egg-object-type names in order, for every node.
+    """
+    values = {node: [] for node in nodes}
+    plugs = [
+        plug
+        for node in nodes
+        for plug in [f"{node}.{LEGACY_PREFIX}{number}" for number in LEGACY_NUMBERS] + [f"{node}.{EGG_OBJECT_TYPE_LIST}"]
+    ]
+    existing = pm.cmds.ls(plugs, long = True) if plugs else []
+    for node, attribute, names in MP_PY_ReadEggObjectTypePlugs(existing):
+        values[node].extend(name for name in names if name not in values[node])
+        if attributes is not None:
+            attributes.setdefault(node, []).append(attribute)
+    return values
+
+
+def MP_PY_ReadEggObjectTypePlugs(plugs):
+    """
+    Reads egg-object-type plugs through the API.
+
+    :param plugs: Long names of existing eggObjectTypeList and eggObjectTypesN plugs.
+    :return: List of (node, attribute, egg-object-type names), in plug order.
+    """
+    if not plugs:
+        return []
+    selection = om.MSelectionList()
+    for plug in plugs:
+        selection.add(plug)
+    values = []
+    for index, plug_name in enumerate(plugs):
+        plug = selection.getPlug(index)
+        node, _, attribute = plug_name.rpartition(".")
+        if attribute == EGG_OBJECT_TYPE_LIST:
+            names = om.MFnStringArrayData(plug.asMObject()).array()
+        else:
+            names = [om.MFnEnumAttribute(plug.attribute()).fieldName(plug.asShort())]
+        values.append((node, attribute, names))
+    return values
+
+
+def MP_PY_WriteEggObjectTypes(node, names, attributes=()):
+    """
+    Stores the complete list of egg-object-types of a node, see MayaPandaTags.write_types.
+
+    :param attributes: The node's egg-object-type attributes, as filled in by MP_PY_ReadEggObjectTypes.
+    """
+    write_types(pm.cmds, node, names, attributes)
+
+
+def MP_PY_AssignEggObjectTypes(assignments, report_attached=True):
+    """
+    Adds egg-object-types to many nodes as a single undoable step.
+
+    The current egg-object-types of every node are read in one batch first, and each node's list is
+    then written once. Types a node already has are skipped and reported together in one dialog at
+    the end. Nodes still tagged the old way have their types moved into the list.
+
+    :param assignments: Dictionary of long node name to the egg-object-type names to add.
+    :param report_attached: Whether types a node already has are reported, rather than silently skipped.
+    :return: Dictionary of node to the egg-object-types that were added to it.
+    """
+    type_ids = OT_REGISTRY.ids()
+
+    attributes = {}
+    current = MP_PY_ReadEggObjectTypes(list(assignments), attributes)
+    tagged = {}
+    already_attached = []
+    unknown = set()
+
+    pm.undoInfo(openChunk = True, chunkName = "MP_PY_AssignEggObjectTypes")
+    try:
+        for node, types in assignments.items():
+            names = current[node]
+            for eggObjectType in types:
+                if eggObjectType not in type_ids:
+                    unknown.add(eggObjectType)
+                elif eggObjectType in names:
+                    already_attached.append(f"{node} ({eggObjectType})")
+                else:
+                    names.append(eggObjectType)
+                    tagged.setdefault(node, []).append(eggObjectType)
+            if node in tagged:
+                MP_PY_WriteEggObjectTypes(node, names, attributes.get(node, ()))
+    finally:
+        pm.undoInfo(closeChunk = True)
+
+    MP_PY_EggObjectTypeConflicts(already_attached if report_attached else [], unknown)
+    print(f"Added egg-object-types to {len(tagged)} of {len(assignments)} nodes.")
+    return tagged
+
+
+def MP_PY_MigrateEggObjectTypes():
+    """
+    Moves the eggObjectTypes1..10 attributes of the scene into the eggObjectTypeList of their nodes
+    as one undoable step.
+    """
+    pm.undoInfo(openChunk = True, chunkName = "MP_PY_MigrateEggObjectTypes")
+    try:
+        report = collapse_to_compact(pm.cmds, OT_REGISTRY.ids())
+    finally:
+        pm.undoInfo(closeChunk = True)
+
+    message = [
+        f"Checked {report['plugs']} egg-object-type attributes.",
+        f"Migrated: {len(report['migrated'])} attributes on {report['nodes']} nodes",
+    ]
+    for kind, title in (("unknown", "Unknown egg-object-types, left alone:"), ("failed", "Could not be migrated:")):
+        if report[kind]:
+            print(f"{title}\n    " + "\n    ".join(report[kind]))
+            message.append(f"{len(report[kind])} x {title} see the script editor.")
+    MP_PY_ConfirmationDialog("Migrate Egg-Object-Types", message, "ok")
+    return report
+
+
+def MP_PY_EggObjectTypeConflicts(already_attached, unknown, shown=10):
+    """
+    Shows one summary dialog for every egg-object-type that could not be added.
+    The full lists are printed to the script editor.
+
+    :param already_attached: "node (egg-object-type)" of the types nodes already had.
+    :param unknown: egg-object-types missing from the $gMP_PY_EggObjectTypeArray.
+    :param shown: Number of names listed in the dialog per kind of conflict.
+    """
+    message = []
+    for items, title in (
+        (already_attached, "egg-object-type already attached on:"),
+        (sorted(unknown), "Not found in the $gMP_PY_EggObjectTypeArray:"),
+    ):
+        if not items:
+            continue
+        print(f"{title}\n    " + "\n    ".join(items))
+        message.append(f"{len(items)} x {title}")
+        message.extend(f"    {item}" for item in items[:shown])
+        if len(items) > shown:
+            message.append(f"    ... and {len(items) - shown} more, see the script editor.")
+    if message:
+        MP_PY_ConfirmationDialog("Egg-Object-Type Error!", message, "ok")
+
+
+def MP_PY_ApplyTagRules(rules_file="", quiet=False):
+    """
+    Tags the scene with the rules of a rules file (see MayaPandaRules.py) as one undoable step.
+    The scene is read in one pass and every matched node is written once.
+
+    :param rules_file: The rules file, "" for the default one.
+    :param quiet: Print the result instead of showing it in a dialog, for the export pre-stage.
+    :return: Dictionary of node to the egg-object-types added to it.
+    """
+    rules_file = rules_file or default_rules_file()
+    try:
+        rules = TagRules.load(rules_file)
+    except (OSError, ValueError) as error:
+        MP_PY_ConfirmationDialog("Tagging Rules Error!", [f"Could not read {rules_file}:", str(error)], "ok")
+        return {}
+    if not rules.rules:
+        if not quiet:
+            MP_PY_ConfirmationDialog("Tagging Rules", f"No tagging rules found in {rules_file}", "ok")
+        return {}
+
+    assignments = rules.evaluate(scene_facts(pm.cmds, rules.fields()))
+    tagged = MP_PY_AssignEggObjectTypes(assignments, report_attached = False) if assignments else {}
+    message = (
+        f"{len(rules.rules)} rules matched {len(assignments)} nodes, "
+        f"{len(tagged)} of them got new egg-object-types."
+    )
+    if quiet:
+        print(message)
+    else:
+        MP_PY_ConfirmationDialog("Tagging Rules", message, "ok")
+    return tagged
+
+
+def MP_PY_AuditEggObjectTypes():
+    """
+    Audits the egg-object-types of the whole scene, see MayaPandaAudit.py.
+    Every tag is found with one ls over the attribute patterns and read through the API.
+
+    :return: AuditReport.
+    """
+    return audit_scene(pm.cmds, load_object_types(), MP_PY_ReadEggObjectTypePlugs)
+
+
+# Sort orders of the audit window lists, the key gets the row
+AUDIT_TYPE_SORTING = {
+    "Name": lambda row: row[0],
+    "Most nodes": lambda row: (-len(row[1]), row[0]),
+    "Fewest nodes": lambda row: (len(row[1]), row[0]),
+}
+AUDIT_ISSUE_SORTING = {
+    "Kind": lambda issue: (issue.kind, issue.node, issue.detail),
+    "Node": lambda issue: (issue.node, issue.kind, issue.detail),
+    "Egg-Object-Type": lambda issue: (issue.egg_object_type, issue.kind, issue.node),
+}
+
+
+def MP_PY_EggObjectTypeAuditGUI():
+    """
+    Lists every egg-object-type of the scene with the nodes carrying it, and the duplicate,
+    conflicting and dropped tags. Selecting rows selects their nodes in the scene.
+    """
+    if pm.window("MP_PY_EggObjectTypeAuditGUI", exists = True):
+        pm.deleteUI("MP_PY_EggObjectTypeAuditGUI", window = True)
+
+    start = time.perf_counter()
+    report = MP_PY_AuditEggObjectTypes()
+    elapsed = time.perf_counter() - start
+    # The rows as currently listed, in list order
+    shown = {"types": [], "issues": []}
+
+    window = pm.window(
+        "MP_PY_EggObjectTypeAuditGUI",
+        width = 900,
+        height = 500,
+        title = "...Egg-Object-Type Audit...",
+        toolbox = True,
+        titleBarMenu = True,
+    )
+
+    def select_nodes(nodes):
+        if nodes:
+            pm.cmds.select(list(dict.fromkeys(nodes)), replace = True, noExpand = True)
+        else:
+            pm.cmds.select(clear = True)
+
+    def fill_types(*args):
+        sorting = AUDIT_TYPE_SORTING[pm.optionMenu(type_sort, query = True, value = True) or "Name"]
+        shown["types"] = sorted(report.index.items(), key = sorting)
+        pm.textScrollList(type_list, edit = True, removeAll = True)
+        pm.textScrollList(type_list, edit = True, append = [
+            f"{name:<32}{len(nodes):>8} nodes" for name, nodes in shown["types"]
+        ])
+
+    def fill_issues(*args):
+        kind = pm.optionMenu(issue_kind, query = True, value = True) or "All"
+        sorting = AUDIT_ISSUE_SORTING[pm.optionMenu(issue_sort, query = True, value = True) or "Kind"]
+        issues = [issue for issue in report.issues if kind == "All" or issue.kind == kind]
+        shown["issues"] = sorted(issues, key = sorting)
+        pm.textScrollList(issue_list, edit = True, removeAll = True)
+        pm.textScrollList(issue_list, edit = True, append = [
+            f"{issue.kind:<10} {issue.node}: {issue.detail}" for issue in shown["issues"]
+        ])
+
+    def select_types(*args):
+        indices = pm.textScrollList(type_list, query = True, selectIndexedItem = True) or []
+        types = [shown["types"][index - 1][0] for index in indices]
+        if pm.checkBox(type_all, query = True, value = True):
+            # Nodes carrying every selected type, e.g. both barrier and trigger
+            select_nodes(report.nodes_with(*types))
+        else:
+            select_nodes([node for name in types for node in report.index[name]])
+
+    def select_issues(*args):
+        indices = pm.textScrollList(issue_list, query = True, selectIndexedItem = True) or []
+        select_nodes([shown["issues"][index - 1].node for index in indices])
+
+    with pm.columnLayout(adjustableColumn = True, rowSpacing = 5):
+        counts = report.counts()
+        pm.text(
+            align = "left",
+            label = (
+                f"{len(report.nodes)} tagged nodes, {len(report.index)} egg-object-types, "
+                + ", ".join(f"{count} {kind}" for kind, count in counts.items())
+                + f" ({elapsed:.2f}s)"
+            ),
+        )
+        with pm.tabLayout() as tabs:
+            with pm.columnLayout(adjustableColumn = True, rowSpacing = 5) as types_tab:
+                with pm.rowLayout(numberOfColumns = 2, columnWidth2 = (250, 400)):
+                    type_sort = pm.optionMenu(label = "Sort by", changeCommand = fill_types)
+                    for label in AUDIT_TYPE_SORTING:
+                        pm.menuItem(label = label)
+                    type_all = pm.checkBox(
+                        label = "Only nodes carrying every selected type", value = False, changeCommand = select_types
+                    )
+                type_list = pm.textScrollList(
+                    allowMultiSelection = True, height = 400, font = "fixedWidthFont", selectCommand = select_types
+                )
+            with pm.columnLayout(adjustableColumn = True, rowSpacing = 5) as issues_tab:
+                with pm.rowLayout(numberOfColumns = 2, columnWidth2 = (250, 250)):
+                    issue_kind = pm.optionMenu(label = "Show", changeCommand = fill_issues)
+                    for label in ("All",) + ISSUE_KINDS:
+                        pm.menuItem(label = label)
+                    issue_sort = pm.optionMenu(label = "Sort by", changeCommand = fill_issues)
+                    for label in AUDIT_ISSUE_SORTING:
+                        pm.menuItem(label = label)
+                issue_list = pm.textScrollList(
+                    allowMultiSelection = True, height = 400, font = "fixedWidthFont", selectCommand = select_issues
+                )
+        pm.tabLayout(tabs, edit = True, tabLabel = ((types_tab, "Egg-Object-Types"), (issues_tab, "Issues")))
+        pm.button(label = "Refresh", command = lambda *args: MP_PY_EggObjectTypeAuditGUI())
+
+    fill_types()
+    fill_issues()
+    pm.showWindow(window)
+    return report
+
+
+class EggObjectTypePanel(object):
+    """
+    Dockable panel listing the egg-object-types of the selected nodes, following the selection.
+
+    A SelectionChanged scriptJob defers one refresh to when Maya is idle, and every event until then
+    is dropped, so a marquee select of thousands of nodes refreshes once. The egg-object-types of
+    every node read are kept, and an attribute-changed callback on the node drops its entry when one
+    of its egg-object-type attributes changes. A refresh only reads the nodes it does not know yet.
+    """
+    control = "MP_PY_EggObjectTypePanel"
+    # Rows of the node list, the rest of a larger selection is only counted
+    maxRows = 500
+    # Nodes kept in the cache, each one holds a callback
+    maxCached = 20000
+    # Attribute-changed messages that can change a node's egg-object-types
+    changeMessages = om.MNodeMessage.kAttributeSet | om.MNodeMessage.kAttributeAdded | om.MNodeMessage.kAttributeRemoved
+
+    def __init__(self):
+        # node -> egg-object-types, least recently selected first
+        self.cache = OrderedDict()
+        # node -> attribute-changed callback id, nodes of the cache and changed nodes not read again yet
+        self.callbacks = {}
+        self.selected = set()
+        self.pending = False
+
+    def create(self):
+        if pm.workspaceControl(self.control, exists = True):
+            pm.deleteUI(self.control)
+        self.clearCache()
+
+        pm.workspaceControl(
+            self.control,
+            label = "Egg-Object-Types",
+            floating = True,
+            retain = False,
+            initialWidth = 350,
+            initialHeight = 450,
+            closeCommand = self.clearCache,
+        )
+        with pm.columnLayout(adjustableColumn = True, rowSpacing = 5, parent = self.control):
+            self.summary = pm.text(align = "left", label = "")
+            self.typeList = pm.textScrollList(height = 150, font = "fixedWidthFont")
+            self.nodeList = pm.textScrollList(height = 250, font = "fixedWidthFont")
+        # The jobs are deleted with the panel
+        pm.scriptJob(event = ["SelectionChanged", self.scheduleRefresh], parent = self.control)
+        pm.scriptJob(event = ["SceneOpened", self.clearCache], parent = self.control)
+        pm.scriptJob(event = ["NewSceneOpened", self.clearCache], parent = self.control)
+        self.refresh()
+
+    def scheduleRefresh(self, *args):
+        if not self.pending:
+            self.pending = True
+            maya.utils.executeDeferred(self.refresh)
+
+    def attributeChanged(self, message, plug, other_plug, node):
+        # Runs inside setAttr/addAttr/deleteAttr, so nothing is read here
+        if not message & self.changeMessages:
+            return
+        attribute = plug.partialName(useLongNames = True)
+        if attribute != EGG_OBJECT_TYPE_LIST and legacy_number(attribute) is None:
+            return
+        self.cache.pop(node, None)
+        if node in self.selected:
+            self.scheduleRefresh()
+
+    def watchNodes(self, nodes):
+        nodes = [node for node in nodes if node not in self.callbacks]
+        if not nodes:
+            return
+        selection = om.MSelectionList()
+        for node in nodes:
+            selection.add(node)
+        for index, node in enumerate(nodes):
+            self.callbacks[node] = om.MNodeMessage.addAttributeChangedCallback(
+                selection.getDependNode(index), self.attributeChanged, node
+            )
+
+    def removeCallbacks(self, callbacks):
+        if not callbacks:
+            return
+        try:
+            om.MMessage.removeCallbacks(callbacks)
+        except RuntimeError:
+            # Callbacks of deleted nodes are already gone
+            pass
+
+    def clearCache(self, *args):
+        self.removeCallbacks(list(self.callbacks.values()))
+        self.callbacks.clear()
+        self.cache.clear()
+        self.selected = set()
+
+    def refresh(self, *args):
+        self.pending = False
+        if not pm.workspaceControl(self.control, exists = True):
+            return
+        nodes = pm.cmds.ls(selection = True, long = True, objectsOnly = True) or []
+        self.selected = set(nodes)
+        missing = [node for node in nodes if node not in self.cache]
+        if missing:
+            self.cache.update(MP_PY_ReadEggObjectTypes(missing))
+            self.watchNodes(missing)
+        types = {}
+        for node in nodes:
+            types[node] = self.cache[node]
+            self.cache.move_to_end(node)
+        evicted = []
+        while len(self.cache) > self.maxCached:
+            node, _ = self.cache.popitem(last = False)
+            # Changes of selected nodes still have to refresh the panel
+            if node not in self.selected:
+                evicted.append(self.callbacks.pop(node))
+        self.removeCallbacks(evicted)
+        self.showTypes(nodes, types)
+
+    def showTypes(self, nodes, types):
+        tagged = [node for node in nodes if types[node]]
+        counts = Counter(name for node in tagged for name in types[node])
+        pm.text(self.summary, edit = True, label = f"{len(nodes)} selected, {len(tagged)} with egg-object-types")
+        pm.textScrollList(self.typeList, edit = True, removeAll = True)
+        pm.textScrollList(self.typeList, edit = True, append = [
+            f"{name:<32}{count:>8}" for name, count in counts.most_common()
+        ])
+        rows = [f"{node.rpartition('|')[2]}: {', '.join(types[node])}" for node in tagged[:self.maxRows]]
+        if len(tagged) > self.maxRows:
+            rows.append(f"... and {len(tagged) - self.maxRows} more")
+        pm.textScrollList(self.nodeList, edit = True, removeAll = True)
+        pm.textScrollList(self.nodeList, edit = True, append = rows)
+
+
+MP_PY_OT_PANEL = EggObjectTypePanel()
+
+
+def MP_PY_EggObjectTypePanelGUI():
+    """
+    Opens the panel listing the egg-object-types of the selected nodes, see EggObjectTypePanel.
+    """
+    MP_PY_OT_PANEL.create()
+    return MP_PY_OT_PANEL
 
 
 def MP_PY_TexPathOptionsUI():
@@ -830,40 +1065,6 @@ def MP_PY_TransformModeUI():
         )
 
 
-def MP_PY_SetEggObjectTypeAttribute(enumerationList, eggObjectType, indexNumber, attributeNumber, node):
-    # Determining variable on whether we can add egg-object-type attribute to node
-    # Check for any currently attached egg-object-type attribute values on the node.
-    # If a current attribute matches passed egg-object-type,
-    # we skip adding it again and notify user it already exists.
-    for i in range(1, 11):
-        if pm.objExists(node + ".eggObjectTypes" + str(i)):
-            if pm.getAttr((node + ".eggObjectTypes" + str(i)), asString = 1) == eggObjectType:
-                MP_PY_ConfirmationDialog(
-                    "Egg-Object-Type Error!",
-                    [
-                        f'egg-object-type - "{eggObjectType}"',
-                        f"Already attached on node attribute:",
-                        f"{node}.eggObjectTypes{i}",
-                    ],
-                    "ok",
-                )
-                return
-        # Attribute exists, check if attributes matches the passed egg-object-type
-        # Message to user that the egg-object-type is already assigned to node
-        # Since attribute already exists on node, set our determining variable to 0 to skip adding it again
-
-    # pm.color(node, rgbColor=hex_to_rgb_normalized(defObj.category.color), ud=1)
-    pm.addAttr(
-        node,
-        ln = ("eggObjectTypes" + str(attributeNumber)),
-        enumName = enumerationList,
-        attributeType = "enum",
-        keyable = 1,
-    )
-    # Adds the egg-object-type attribute to node if it was not already attached
-    pm.setAttr((node + ".eggObjectTypes" + str(attributeNumber)), indexNumber)
-
-
 def generate_objtype_syntax(object_type):
     # egg-object-type XXXXX
     return f"egg-object-type-{object_type.name} " + " ".join(object_type.flags)
@@ -876,29 +1077,113 @@ def MP_PY_InspectEggObjectType(object_type: ObjectTypeDefinition):
     pm.scrollField("MP_PY_OTGEN_DESCINPUT", edit = True, text = '\n'.join(object_type.description))
     pm.textField("MP_PY_OTGEN_ATTRDEFTXT", edit = True, text = generate_objtype_syntax(object_type))
 
-    idlist = pm.optionMenu("MP_PY_OTGEN_CATMENU", query = True, ils = True)
-    objIndex = idlist.index(f"MP_PY_OTGEN_CATMENU_ITEM_{object_type.category.name}")
+    # The menu items are created in category order
+    objIndex = OT_REGISTRY.category_index(object_type.category)
     pm.optionMenu("MP_PY_OTGEN_CATMENU", edit = True, select = objIndex + 1)
     # print(idlist[pm.optionMenu("MP_PY_OTGEN_CATMENU", query=True, select=True, value=True) - 1])
 
 
+def MP_PY_BuildEggObjectTypeButtons(category_def):
+    """
+    Creates the buttons of a category in the Add Egg-Object-Types window. Categories start
+    collapsed and empty, this runs the first time one is expanded or has a search match.
+    """
+    palette = MP_PY_OT_PALETTE
+    if category_def.name in palette["built"]:
+        return
+    palette["built"].add(category_def.name)
+
+    def callback_add_ot(obj_name):
+        # hack: need this function otherwise it will pass True/False
+        return lambda *args: MP_PY_AddEggObjectFlags(obj_name)
+
+    def callback_inspect_ot(obj_name):
+        # hack: need this function otherwise it will pass True/False
+        return lambda *args: MP_PY_InspectEggObjectType(OT_REGISTRY[obj_name])
+
+    matches = palette["matches"]
+    pm.setParent(category_def.FrameLayout)
+    with pm.columnLayout(adjustableColumn = True):
+        for ot in category_def.get_children():
+            visible = matches is None or ot.name in matches
+            ot.Button = pm.button(
+                f"MP_PY_AttEggATTR_{ot.name}",
+                width = 100,
+                height = 17,
+                command = callback_add_ot(ot.name),  # Pass the current objName
+                annotation = str(MP_PY_GetObjectTypeAnnotationNEW(ot)),
+                label = ot.friendly_name if ot.friendly_name else ot.name,
+                backgroundColor = hex_to_rgb_normalized(ot.color),
+                visible = visible,
+            )
+            if visible:
+                palette["visible"].add(ot.name)
+            pm.popupMenu()
+            pm.menuItem(
+                label = f"Inspect {ot.name}",
+                command = callback_inspect_ot(ot.name),
+            )
+
+
+def MP_PY_FilterEggObjectTypes(text):
+    """
+    Shows the buttons of the Add Egg-Object-Types window matching the search text, see
+    ObjectTypeRegistry.search. Only the buttons and categories whose visibility changes are edited.
+    """
+    palette = MP_PY_OT_PALETTE
+    matches = OT_REGISTRY.search(text)
+    if matches == palette["matches"]:
+        return
+    palette["matches"] = matches
+    visible = palette["visible"]
+    for category_def in CategoryDefs.values():
+        children = category_def.get_children()
+        shown = [ot.name for ot in children if matches is None or ot.name in matches]
+        if matches is not None and shown:
+            MP_PY_BuildEggObjectTypeButtons(category_def)
+            pm.frameLayout(category_def.FrameLayout, edit = True, collapse = False)
+        if category_def.name in palette["built"]:
+            for ot in children:
+                wanted = matches is None or ot.name in matches
+                if wanted != (ot.name in visible):
+                    pm.button(ot.Button, edit = True, visible = wanted)
+                    if wanted:
+                        visible.add(ot.name)
+                    else:
+                        visible.discard(ot.name)
+        hidden = not shown
+        if hidden != (category_def.name in palette["hidden"]):
+            pm.frameLayout(category_def.FrameLayout, edit = True, visible = not hidden)
+            if hidden:
+                palette["hidden"].add(category_def.name)
+            else:
+                palette["hidden"].discard(category_def.name)
+
+
 def MP_PY_AddEggObjectTypesGUI():
     """
     Constructs and displays a GUI for adding egg-object-type tags to nodes.
-    It is designed to read the contents in the global $eggObjectTypeArray and
-    automatically create rows of 5 buttons each row in a separate window.
-    The array can be modified in the MP_PY_Globals process to the users liking.
+    Every ObjectType of OT_REGISTRY gets a button in the collapsible section of its category,
+    and the search field above them filters the buttons as you type.
     User must verify that any object types added to the array are also present
     in at least one of their PRC files, otherwise egg2bam will error complaining
     about an unknown object-type.
+
+    The window is built once and only hidden when closed, later calls show it again. It is rebuilt
+    when the ObjectType definitions changed since.
     """
 
     pm.melGlobals.initVar("string[]", EGG_OBJECT_TYPE_ARRAY)
 
-    # Delete any current instances of the AddEggObjectTypesWindow window
+    palette = MP_PY_OT_PALETTE
+    built_from = (OT_REGISTRY, OT_REGISTRY.generation)
     if pm.window("MP_PY_AddEggObjectTypesWindow", exists = 1):
+        if palette["registry"] == built_from:
+            pm.showWindow("MP_PY_AddEggObjectTypesWindow")
+            return
         pm.deleteUI("MP_PY_AddEggObjectTypesWindow", window = 1)
 
+    palette.update(registry = built_from, built = set(), visible = set(), hidden = set(), matches = None)
     pm.window(
         "MP_PY_AddEggObjectTypesWindow",
         retain = 1,
@@ -917,46 +1202,29 @@ def MP_PY_AddEggObjectTypesGUI():
                 backgroundColor = hex_to_rgb_normalized("#809933"),
                 label = "Add Egg-Object-Type Tags to Selected Nodes",
         ):
+            pm.textField(
+                "MP_PY_OTSearchField",
+                placeholderText = "Search egg-object-types by name, category or description",
+                textChangedCommand = lambda text: MP_PY_FilterEggObjectTypes(text),
+            )
 
-            def callback_add_ot(obj_name):
-                # hack: need this function otherwise it will pass True/False
-                return lambda *args: MP_PY_AddEggObjectFlags(obj_name)
-
-            def callback_inspect_ot(obj_name):
-                # hack: need this function otherwise it will pass True/False
-                return lambda *args: MP_PY_InspectEggObjectType(obj_name)
+            def callback_expand(category_def):
+                # hack: need this function otherwise every frame builds the last category
+                return lambda *args: MP_PY_BuildEggObjectTypeButtons(category_def)
 
             def addEggTypeTagsNew():
                 for category_def in CategoryDefs.values():
-                    numChildren = len(category_def.children)
-                    with pm.frameLayout(
-                            font = "boldLabelFont",
-                            collapsable = True,
-                            collapse = True,
-                            label = category_def.friendly_name,
-                            backgroundShade = True,
-                            # backgroundColor = hex_to_rgb_normalized(category_def.color),
-                    ) as frame:
-                        category_def.FrameLayout = frame
-                        with pm.columnLayout(adjustableColumn = True):
-                            for ot in category_def.get_children():
-                                annotation = str(MP_PY_GetObjectTypeAnnotationNEW(ot))
-                                labelName = ot.friendly_name if ot.friendly_name else ot.name
-                                ot.Button = pm.button(
-                                    f"MP_PY_AttEggATTR_{ot.name}",
-                                    width = 100,
-                                    height = 17,
-                                    command = callback_add_ot(ot.name),  # Pass the current objName
-                                    annotation = annotation,
-                                    label = labelName,
-                                    backgroundColor = hex_to_rgb_normalized(ot.color)
-                                )
-                                pm.popupMenu()
-                                pm.menuItem(
-                                    label = f"Inspect {ot.name}",
-                                    command = callback_inspect_ot(ot),
-                                )
-                        pm.setParent(u = 1)
+                    # The buttons are created when the frame is first expanded
+                    category_def.FrameLayout = pm.frameLayout(
+                        font = "boldLabelFont",
+                        collapsable = True,
+                        collapse = True,
+                        label = f"{category_def.friendly_name} ({len(category_def.get_children())})",
+                        backgroundShade = True,
+                        expandCommand = callback_expand(category_def),
+                        # backgroundColor = hex_to_rgb_normalized(category_def.color),
+                    )
+                    pm.setParent(u = 1)
 
             addEggTypeTagsNew()
             pm.setParent(u = 1)
@@ -1253,113 +1521,58 @@ def MP_PY_GetEggObjectTypes():
     win.show()
 
 
-def mp_py_delete_egg_object_type(node_hierarchy, index):
+def mp_py_delete_egg_object_type(node_hierarchy, eggObjectType):
     """
-    Deletes a specific egg-object-type attribute from a node.
+    Deletes a specific egg-object-type from a node.
 
     :param node_hierarchy: The full hierarchy of the node as a string.
-    :param index: The index of the egg-object-type attribute to delete.
-    """
-    # Resolve the full node path
-    node = node_hierarchy.split("|")[-1]
-    attribute_name = f"{node}.eggObjectTypes{index}"
-
-    # Check if the attribute exists
-    if pm.objExists(attribute_name):
-        # Confirm deletion with the user
-        confirm = MP_PY_ConfirmationDialog(
-            title = "Delete Egg-Object-Type",
-            message = f"Are you sure you want to delete the egg-object-type at {attribute_name}?",
-            dialog_type = "yesno"
-        )
+    :param eggObjectType: Name of the egg-object-type to delete.
+    """
+    nodes = pm.cmds.ls(node_hierarchy, long = True)
+    attributes = {}
+    names = MP_PY_ReadEggObjectTypes(nodes, attributes)[nodes[0]] if nodes else []
 
-        if confirm == "YES":
-            # Delete the attribute
-            pm.deleteAttr(attribute_name)
-            print(f"Deleted {attribute_name} from {node}.")
-        else:
-            print("Deletion canceled.")
-    else:
-        # Notify the user that the attribute does not exist
+    # Check if the node has the egg-object-type
+    if eggObjectType not in names:
+        # Notify the user that the egg-object-type is not attached
         MP_PY_ConfirmationDialog(
             title = "Error",
-            message = f"Attribute {attribute_name} does not exist on node {node}.",
+            message = f"egg-object-type {eggObjectType} is not attached to node {node_hierarchy}.",
             dialog_type = "ok"
         )
+        return
 
+    # Confirm deletion with the user
+    confirm = MP_PY_ConfirmationDialog(
+        title = "Delete Egg-Object-Type",
+        message = f"Are you sure you want to delete the egg-object-type {eggObjectType} from {node_hierarchy}?",
+        dialog_type = "yesno"
+    )
 
-def MP_PY_ArgsBuilder(FileName):
-    """
-    Constructs the arguments to pass to maya2egg.
-    """
-    # Base arguments
-    pm.melGlobals.initVar("string", MAYA_VER_SHORT)
-    ARGS = f"maya2egg{pm.melGlobals[MAYA_VER_SHORT]} -v -p "
-
-    # Checkbox flags
-    checkboxes = {
-        "MP_PY_ExportBfaceCB": "-bface",
-        "MP_PY_ExportLegacyShadersCB": "-legacy-shaders",
-        "MP_PY_ExportKeepUvsCB": "-keep-uvs",
-        "MP_PY_ExportRoundUvsCB": "-round-uvs",
-        "MP_PY_ExportTbnallCB": "-tbnall",
-        "MP_PY_ExportLightsCB": "-convert-lights",
-        "MP_PY_ExportCamerasCB": "-convert-cameras",
-    }
-    ARGS += " ".join(
-        flag for checkbox, flag in checkboxes.items() if pm.checkBox(checkbox, query = True, value = True)) + " "
-
-    # Export options
-    export_options = {
-        "MP_PY_ChooseMeshRB": "-a none",
-        "MP_PY_ChooseActorRB": "-a model",
-        "MP_PY_ChooseAnimationRB": "-a chan",
-        "MP_PY_ChooseBothRB": "-a both",
-        "MP_PY_ChoosePoseRB": "-a pose",
-    }
-    selected_export = pm.radioCollection("MP_PY_ExportOptionsRC", query = True, select = True)
-    ARGS += f"{export_options.get(selected_export, '')} "
-
-    # Animation frame range
-    if selected_export in {"MP_PY_ChooseAnimationRB", "MP_PY_ChooseBothRB", "MP_PY_ChoosePoseRB"}:
-        if pm.radioCollection("MP_PY_AnimationOptionsRC", query = True,
-                              select = True) == "MP_PY_chooseCustomAnimationRangeRB":
-            start_frame = pm.intField("MP_PY_AnimationStartFrameIF", query = True, value = True)
-            end_frame = pm.intField("MP_PY_AnimationEndFrameIF", query = True, value = True)
-            if isinstance(start_frame, int) and isinstance(end_frame, int):
-                ARGS += f"-sf {start_frame} -ef {end_frame} "
-            else:
-                pm.mel.error("Start or End Frame entered data is invalid. Must be integers.")
-                return "failed"
-
-    # Transform modes
-    transform_modes = {
-        "MP_PY_ChooseTransformModelRB": "-trans model",
-        "MP_PY_ChooseTransformAllRB": "-trans all",
-        "MP_PY_ChooseTransformDCSRB": "-trans dcs",
-        "MP_PY_ChooseTransformNoneRB": "-trans none",
-    }
-    selected_transform = pm.radioCollection("MP_PY_TransformModeRC", query = True, select = True)
-    ARGS += f"{transform_modes.get(selected_transform, '')} "
+    if confirm == "YES":
+        node = nodes[0]
+        names.remove(eggObjectType)
+        MP_PY_WriteEggObjectTypes(node, names, attributes[node])
+        print(f"Deleted {eggObjectType} from {node}.")
+    else:
+        print("Deletion canceled.")
 
-    # Remove groundPlane_transform
-    if pm.checkBox("MP_PY_RemoveGroundPlaneCB", query = True, value = True):
-        ARGS += "-exclude groundPlane_transform "
 
-    # Scene up axis and units
-    ARGS += f"-cs {pm.upAxis(query = True, axis = True)}-up "
-    ARGS += f"-uo {pm.optionMenu('MP_PY_UnitMenu', query = True, value = True)} "
+def MP_PY_ArgsBuilder(FileName, settings=None, subsets=()):
+    """
+    Constructs the arguments to pass to maya2egg.
 
-    # Character name
-    if selected_export != "MP_PY_ChooseMeshRB":
-        char_name = pm.textField("MP_PY_CharacterNameTF", query = True, text = True) or FileName
-        ARGS += f"-cn {char_name.replace(' ', '_')} "
+    :param FileName: Base name of the exported file.
+    :param settings: ExportSettings snapshot. Captured from the exporter window if not given.
+    :param subsets: Node names to convert, when maya2egg reads a file holding more than the export.
+    """
+    settings = settings or MP_PY_CaptureExportSettings()
 
     # Handle force-joint flags
-    joints = pm.textField("MP_PY_ForceJointTF", query = True, text = True).split()
-    for joint in joints:
-        if not pm.mel.attributeExists("eggObjectTypes1", joint):
-            MP_PY_AddEggObjectFlags("dcs")
+    joint_types = MP_PY_ReadEggObjectTypes(pm.cmds.ls(settings.force_joints, long = True)) if settings.force_joints else {}
+    for joint, names in joint_types.items():
+        if "dcs" not in names:
+            MP_PY_AddEggObjectFlags("dcs", [joint])
             confirm_restart = MP_PY_ConfirmationDialog(
                 "File Error!",
                 "Added missing DCS flag to nodes. Restart export?",
@@ -1368,20 +1581,118 @@ def MP_PY_ArgsBuilder(FileName):
             if confirm_restart == "yes":
                 MP_PY_StartSceneExport()
                 return "failed"
-        ARGS += f"-force-joint {joint} "
 
-    # Texture paths
-    if pm.radioCollection("MP_PY_TexPathOptionsRC", query = True, select = True) != "MP_PY_ChooseDefaultTexPathRB":
-        ARGS += "-ps rel "
-        custom_tex_path = pm.textField("MP_PY_CustomEggTexPathTF", query = True, text = True)
-        if custom_tex_path:
-            ARGS += f'-pd "{custom_tex_path}" -pp "{custom_tex_path}" '
-        custom_output_path = pm.textField("MP_PY_CustomOutputPathTF", query = True, text = True)
-        if custom_output_path:
-            ARGS += f'-pc "{custom_output_path}" '
+    ARGS = maya2egg_args(settings, FileName, subsets)
+    print(f"Using these arguments: {ARGS}")
+    return ARGS
+
+
+# Exporter window radio buttons, and the ExportSettings values they stand for
+EXPORT_OPTION_RADIO_BUTTONS = {
+    "MP_PY_ChooseMeshRB": "none",
+    "MP_PY_ChooseActorRB": "model",
+    "MP_PY_ChooseAnimationRB": "chan",
+    "MP_PY_ChooseBothRB": "both",
+    "MP_PY_ChoosePoseRB": "pose",
+}
+TRANSFORM_MODE_RADIO_BUTTONS = {
+    "MP_PY_ChooseTransformModelRB": "model",
+    "MP_PY_ChooseTransformAllRB": "all",
+    "MP_PY_ChooseTransformDCSRB": "dcs",
+    "MP_PY_ChooseTransformNoneRB": "none",
+}
+TEXTURE_PATH_RADIO_BUTTONS = {
+    "MP_PY_ChooseDefaultTexPathRB": "default",
+    "MP_PY_ChooseCustomRefPathRB": "reference",
+    "MP_PY_ChooseCustomTexPathRB": "copy",
+}
+
+
+def MP_PY_BamFanOutVersions():
+    """
+    :return: (bam version, egg2bam executable) of every version selected in the bam version fan-out list.
+    """
+    chosen = pm.textScrollList("MP_PY_BamFanOutList", query = True, selectItem = True) or []
+    return tuple((label, egg2bam) for label, _, egg2bam, _ in MP_PY_PandaVersions() if label in chosen)
+
+
+def MP_PY_CaptureExportSettings():
+    """
+    Reads every exporter window option once and returns them as an ExportSettings snapshot.
+    The rest of the export path works from the snapshot instead of querying the window again.
+    """
+    pm.melGlobals.initVar("string", MAYA_VER_SHORT)
+
+    def checked(name):
+        return bool(pm.checkBox(name, query = True, value = True))
+
+    def selected(collection):
+        return pm.radioCollection(collection, query = True, select = True)
+
+    def text(name):
+        return str(pm.textField(name, query = True, text = True))
+
+    return ExportSettings(
+        animation = EXPORT_OPTION_RADIO_BUTTONS.get(selected("MP_PY_ExportOptionsRC"), "none"),
+        transform = TRANSFORM_MODE_RADIO_BUTTONS.get(selected("MP_PY_TransformModeRC"), "model"),
+        export_selected = checked("MP_PY_ExportSelectedCB"),
+        bface = checked("MP_PY_ExportBfaceCB"),
+        overwrite = checked("MP_PY_ExportOverwriteCB"),
+        pview = checked("MP_PY_ExportPviewCB"),
+        live_preview = checked("MP_PY_LivePreviewCB"),
+        legacy_shaders = checked("MP_PY_ExportLegacyShadersCB"),
+        keep_uvs = checked("MP_PY_ExportKeepUvsCB"),
+        round_uvs = checked("MP_PY_ExportRoundUvsCB"),
+        tbnall = checked("MP_PY_ExportTbnallCB"),
+        convert_lights = checked("MP_PY_ExportLightsCB"),
+        convert_cameras = checked("MP_PY_ExportCamerasCB"),
+        remove_ground_plane = checked("MP_PY_RemoveGroundPlaneCB"),
+        use_build_cache = checked("MP_PY_UseBuildCacheCB"),
+        reuse_scene_file = checked("MP_PY_ReuseSceneFileCB"),
+        bam_version = str(pm.optionMenu("MP_PY_BamVersionOptionMenu", query = True, value = True)),
+        rawtex = checked("MP_PY_RawtexCB"),
+        flatten = checked("MP_PY_FlattenCB"),
+        conversion_worker = checked("MP_PY_ConversionWorkerCB"),
+        bam_fan_out = MP_PY_BamFanOutVersions() if checked("MP_PY_BamFanOutCB") else (),
+        unit = str(pm.optionMenu("MP_PY_UnitMenu", query = True, value = True)),
+        up_axis = str(pm.upAxis(query = True, axis = True)),
+        output_bam = selected("MP_PY_OutputPandaFileTypeRC") == "MP_PY_ChooseEggBamRB",
+        texture_path_mode = TEXTURE_PATH_RADIO_BUTTONS.get(selected("MP_PY_TexPathOptionsRC"), "default"),
+        egg_texture_path = text("MP_PY_CustomEggTexPathTF"),
+        bam_texture_path = text("MP_PY_CustomBamTexPathTF"),
+        custom_output = selected("MP_PY_OutputPathOptionsRC") == "MP_PY_ChooseCustomOutputPathRB",
+        output_path = text("MP_PY_CustomOutputPathTF"),
+        custom_filename = selected("MP_PY_OutputFilenameOptionsRC") == "MP_PY_ChooseCustomFilenameRB",
+        filename = text("MP_PY_CustomFilenameTF"),
+        character_name = text("MP_PY_CharacterNameTF"),
+        force_joints = tuple(text("MP_PY_ForceJointTF").split()),
+        custom_frame_range = selected("MP_PY_AnimationOptionsRC") == "MP_PY_chooseCustomAnimationRangeRB",
+        start_frame = int(pm.intField("MP_PY_AnimationStartFrameIF", query = True, value = True)),
+        end_frame = int(pm.intField("MP_PY_AnimationEndFrameIF", query = True, value = True)),
+        apply_tag_rules = checked("MP_PY_ApplyTagRulesCB"),
+        parallel = checked("MP_PY_ParallelExportCB"),
+        memory_budget_mb = int(pm.intField("MP_PY_MemoryBudgetIF", query = True, value = True)),
+        maya2egg_exe = f"maya2egg{pm.melGlobals[MAYA_VER_SHORT]}",
+        egg2bam_exe = MP_PY_PandaVersion("getEgg2Bam"),
+        bam2egg_exe = MP_PY_PandaVersion("getBam2Egg"),
+        pview_exe = MP_PY_PandaVersion("getPview"),
+    )
+
 
-    print(f"Using these arguments: {ARGS.strip()}")
-    return ARGS.strip()
+def MP_PY_SaveExportProfile():
+    """
+    Saves the current exporter window options to a JSON export profile.
+    """
+    profile = pm.fileDialog2(
+        dialogStyle = 2,
+        fileMode = 0,
+        caption = "Save export profile as",
+        fileFilter = "Export Profile (*.json)",
+    )
+    if not profile:
+        return
+    MP_PY_CaptureExportSettings().save(profile[0])
+    print(f"Saved export profile: {profile[0]}")
 
 
 def MP_PY_StartSceneExport():
@@ -1391,107 +1702,149 @@ def MP_PY_StartSceneExport():
     - Prepares the export path and file name.
     - Executes the export process with the necessary arguments.
     """
+    settings = MP_PY_CaptureExportSettings()
+    run = ExportRun(pm.cmds.file(query = True, sceneName = True), history = MP_PY_METRICS)
+    if settings.apply_tag_rules:
+        with run.stage("tag_rules"):
+            MP_PY_ApplyTagRules(settings.tag_rules_file, quiet = True)
+
     # Determine whether to export selected objects or the entire scene
-    selection_mode = "selected" if pm.checkBox("MP_PY_ExportSelectedCB", query = True, value = True) else "all"
-    temp_mb_file = MP_PY_ExportScene(selection_mode)
+    selection_mode = "selected" if settings.export_selected else "all"
+    # Whether maya2egg can read the saved scene, checked before legacy_layout marks it modified
+    subsets = MP_PY_SceneExportSubsets(selection_mode, settings)
+    # maya2egg reads the egg-object-types from eggObjectTypesN attributes, which only exist while the file is written
+    with legacy_layout(pm.cmds, OT_REGISTRY.ids()) as expanded:
+        temp_mb_file = MP_PY_ExportScene(selection_mode, subsets, settings, run, expanded)
 
     if temp_mb_file == "failed":
+        run.finish("failed")
         return 0  # Export failed
 
     # Retrieve original file name without extension
     orig_file_name = str(pm.mel.basenameEx(pm.cmds.file(query = True, sceneName = True)))
+    dest_path = export_directory(settings, str(pm.mel.dirname(pm.cmds.file(query = True, sceneName = True))))
 
     # Prepare and execute the export process
-    egg_file = MP_PY_ExportPrep(temp_mb_file, orig_file_name)
+    egg_file = MP_PY_ExportPrep(temp_mb_file, orig_file_name, settings, run, os.path.join(dest_path, ""), subsets or ())
 
     return egg_file != "failed"
 
 
-def MP_PY_ExportScene(selection):
+def MP_PY_ExportScene(selection, subsets, settings=None, run=None, expanded=()):
     """
     Exports the entire scene or selected objects.
+
+    :param selection: "all" or "selected".
+    :param subsets: MP_PY_SceneExportSubsets of the export. None writes a temporary file.
+    :param settings: ExportSettings snapshot. Captured from the exporter window if not given.
+    :param run: ExportRun that records the time taken to save the temporary file.
+    :param expanded: The plugs legacy_layout added. The saved scene does not hold them, so maya2egg is given a copy
+                     of it instead, see MP_PY_SaveSceneCopy.
+    :return: The Maya file for maya2egg to convert. That is the scene file itself when subsets is not None and
+             nothing was expanded.
     """
+    settings = settings or MP_PY_CaptureExportSettings()
+    run = run or ExportRun(pm.cmds.file(query = True, sceneName = True))
+
     # Get scene details
     scene_path = str(pm.mel.dirname(pm.cmds.file(query = True, sceneName = True)))
     file_name = str(pm.mel.basenameEx(pm.cmds.file(query = True, sceneName = True)))
-    temp_scene_path = ""
-
-    # Output options
-    filename_option = pm.radioCollection("MP_PY_OutputFilenameOptionsRC", query = True, select = True)
-    path_option = pm.radioCollection("MP_PY_OutputPathOptionsRC", query = True, select = True)
 
     # Validate input based on options
-    if filename_option == "MP_PY_ChooseOriginalFilenameRB":
-        if path_option == "MP_PY_ChooseDefaultOutputPathRB":
-            if not scene_path or not file_name:
-                return handle_error(
-                    "It appears you have not yet saved this scene. Please save your scene first\n"
-                    "OR specify a custom output directory AND custom filename."
-                )
-            temp_scene_path = f"{scene_path}/{file_name}_temp.mb"
-
-        elif path_option == "MP_PY_ChooseCustomOutputPathRB":
-            custom_path = validate_text_field(
-                "MP_PY_CustomOutputPathTF",
-                "You have not entered a custom path.\n"
-                "Please enter a custom path and try exporting again."
-            )
-            if not custom_path:
-                return "failed"
-            temp_scene_path = f"{custom_path}/{file_name}_temp.mb"
-
-    elif filename_option == "MP_PY_ChooseCustomFilenameRB":
-        custom_file_name = validate_text_field(
-            "MP_PY_CustomFilenameTF",
-            "You have not entered a custom file name.\n"
-            "Please enter a custom name and try exporting again."
-        )
-        if not custom_file_name:
-            return "failed"
-
-        if path_option == "MP_PY_ChooseDefaultOutputPathRB":
-            if not scene_path:
-                return handle_error(
-                    "It appears you have not yet saved this scene. Please save your scene first\n"
-                    "OR specify a custom output directory AND custom filename."
-                )
-            temp_scene_path = f"{scene_path}/{custom_file_name}_temp.mb"
-
-        elif path_option == "MP_PY_ChooseCustomOutputPathRB":
-            custom_path = validate_text_field(
-                "MP_PY_CustomOutputPathTF",
-                "You have not entered a custom path.\n"
-                "Please enter a custom path and try exporting again."
-            )
-            if not custom_path:
-                return "failed"
-            temp_scene_path = f"{custom_path}/{custom_file_name}_temp.mb"
+    try:
+        temp_mb_file = temp_scene_path(settings, scene_path, file_name)
+    except ValueError as error:
+        return handle_error(str(error))
+
+    # Nothing to write when maya2egg can read the saved scene
+    scene_file = pm.cmds.file(query = True, sceneName = True)
+    if subsets is not None and not expanded:
+        print(f"Scene is saved and unmodified, converting it directly: {scene_file}\n")
+        run.add_file("mb", scene_file)
+        return scene_file
+    if subsets is not None:
+        with run.stage("save_mb"):
+            written = MP_PY_SaveSceneCopy(temp_mb_file, scene_file)
+        if written:
+            print(f"Saved the scene with its egg-object-types as temporary file: {temp_mb_file}\n")
+        else:
+            print(f"Scene is unchanged since its temporary file was saved, converting that: {temp_mb_file}\n")
+        run.add_file("mb", temp_mb_file)
+        return temp_mb_file
 
+    forget_stamp(temp_mb_file)
     # Export logic
     if selection == "all":
         print("Exporting entire scene...\n")
-        pm.cmds.file(temp_scene_path, exportAll = True, type = "mayaBinary", options = "v=1")
-        print(f"Saved entire scene as temporary file: {temp_scene_path}\n")
+        with run.stage("save_mb"):
+            pm.cmds.file(temp_mb_file, exportAll = True, type = "mayaBinary", options = "v=1")
+        print(f"Saved entire scene as temporary file: {temp_mb_file}\n")
     else:
         print("Exporting selected objects...\n")
-        pm.cmds.file(temp_scene_path, exportSelected = True, type = "mayaBinary", options = "v=1")
-        print(f"Saved selected objects as temporary file: {temp_scene_path}\n")
+        with run.stage("save_mb"):
+            pm.cmds.file(temp_mb_file, exportSelected = True, type = "mayaBinary", options = "v=1")
+        print(f"Saved selected objects as temporary file: {temp_mb_file}\n")
+    run.add_file("mb", temp_mb_file)
+
+    return temp_mb_file
+
+
+def MP_PY_SaveSceneCopy(mb_file, scene_file):
+    """
+    Saves the whole scene for maya2egg inside legacy_layout, when the saved scene file cannot be converted as it is
+    because it has no eggObjectTypesN attributes. Later exports reuse the copy for as long as the scene file, the
+    files it references and the egg-object-type ids stay the same, see MayaPandaCache.save_scene_copy.
+
+    :param mb_file: Path of the copy.
+    :param scene_file: The saved scene file, see MP_PY_SavedSceneFile.
+    :return: Whether the copy had to be written.
+    """
+    return save_scene_copy(pm.cmds, mb_file, scene_file, OT_REGISTRY.ids())
+
+
+def MP_PY_SavedSceneFile():
+    """
+    :return: The current scene file if it is saved and has no unsaved changes, or an empty string.
+    """
+    scene_file = pm.cmds.file(query = True, sceneName = True)
+    if not scene_file or os.path.splitext(scene_file)[1].lower() not in (".mb", ".ma"):
+        return ""
+    if pm.cmds.file(query = True, modified = True):
+        return ""
+    return scene_file
 
-    return temp_scene_path
+
+def MP_PY_UniqueNodeNames(nodes):
+    """
+    maya2egg's -subset matches node names rather than DAG paths,
+    so only nodes whose short name is unique in the scene can be picked out of a shared file.
+
+    :param nodes: Long DAG paths.
+    :return: A dictionary of node to short name, for the nodes whose name is unique.
+    """
+    name_counts = Counter(str(node).split("|")[-1] for node in pm.ls(dag = True, long = True))
+    names = {node: str(node).split("|")[-1] for node in nodes}
+    return {node: name for node, name in names.items() if name_counts[name] == 1}
 
 
-def validate_text_field(field_name, error_message):
+def MP_PY_SceneExportSubsets(selection, settings):
     """
-    Validates the content of a text field. If empty, displays an error dialog.
-    :param field_name: Name of the text field to validate.
-    :param error_message: Error message to display if validation fails.
-    :return: The text content of the field if valid, None otherwise.
+    Checks whether a scene export can skip writing a temporary file and convert the saved scene directly.
+
+    :param selection: "all" or "selected".
+    :param settings: ExportSettings snapshot.
+    :return: None when a temporary file has to be written.
+             Otherwise the node names to pass to maya2egg with -subset, empty when exporting everything.
     """
-    text = str(pm.textField(field_name, query = True, text = True))
-    if not text:
-        MP_PY_ConfirmationDialog("File Error!", error_message, "ok")
+    if not settings.reuse_scene_file or not MP_PY_SavedSceneFile():
+        return None
+    if selection == "all":
+        return ()
+    selected_nodes = pm.ls(selection = True, long = True)
+    subsets = MP_PY_UniqueNodeNames(selected_nodes)
+    if not selected_nodes or len(subsets) != len(selected_nodes):
         return None
-    return text
+    return tuple(subsets[node] for node in selected_nodes)
 
 
 def handle_error(message):
@@ -1593,6 +1946,9 @@ def MP_PY_Globals():
     # It is designed so that the user only sees the notification once during session.
     pm.melGlobals.initVar("int", PANDA_SDK_NOTICE)
     pm.melGlobals[PANDA_SDK_NOTICE] = 0
+    # The folder the phase_* folders are in. bam2egg finds the textures of imported bams from there.
+    pm.melGlobals.initVar("string", PHASE_ROOT_DIR)
+    pm.melGlobals[PHASE_ROOT_DIR] = ""
 
 
 def MP_PY_CreatePandaExporterWindow():
@@ -1696,7 +2052,7 @@ def MP_PY_CreatePandaExporterWindow():
                     pm.setParent(upLevel = 1)
                 pm.setParent(upLevel = 1)
             pm.setParent(upLevel = 1)
-        with pm.frameLayout(width = 200, height = 215, label = "Export Options"):
+        with pm.frameLayout(width = 200, height = 272, label = "Export Options"):
             with pm.columnLayout(columnAttach = ("left", 0)):
                 pm.checkBox(
                     "MP_PY_ExportSelectedCB",
@@ -1728,6 +2084,16 @@ def MP_PY_CreatePandaExporterWindow():
                     value = 0,
                     label = "Run PView after export",
                 )
+                pm.checkBox(
+                    "MP_PY_LivePreviewCB",
+                    annotation = (
+                        "With Run PView after export, shows the exported file in one viewer that stays open\n"
+                        "and reloads only that model after every export, instead of starting a new pview.\n"
+                        "The viewer needs a Python with panda3d, see MayaPandaViewer.py."
+                    ),
+                    value = 0,
+                    label = "Live preview (reload in one viewer)",
+                )
                 pm.checkBox(
                     "MP_PY_ExportLegacyShadersCB",
                     annotation = (
@@ -1798,9 +2164,28 @@ def MP_PY_CreatePandaExporterWindow():
                     value = 1,
                     label = "Remove groundPlane_transform",
                 )
+                pm.checkBox(
+                    "MP_PY_UseBuildCacheCB",
+                    annotation = (
+                        "Skips maya2egg when the exported scene, export options and maya2egg version\n"
+                        "are unchanged since a previous export, and copies the cached egg file instead."
+                    ),
+                    value = 1,
+                    label = "Reuse unchanged exports (cache)",
+                )
+                pm.checkBox(
+                    "MP_PY_ReuseSceneFileCB",
+                    annotation = (
+                        "Converts the saved scene file directly when it has no unsaved changes,\n"
+                        "and converts every node of \"Convert Nodes To Panda\" from one scene file,\n"
+                        "instead of writing a temporary .mb file for each export."
+                    ),
+                    value = 1,
+                    label = "Convert from the saved scene file",
+                )
                 pm.setParent(upLevel = 1)
             pm.setParent(upLevel = 1)
-        with pm.frameLayout(width = 200, height = 85, label = "Bam Specific Options"):
+        with pm.frameLayout(width = 200, height = 178, label = "Bam Specific Options"):
             with pm.columnLayout(columnAttach = ("left", 0)):
                 with pm.rowLayout(numberOfColumns = 3):
                     pm.optionMenu(
@@ -1832,6 +2217,42 @@ def MP_PY_CreatePandaExporterWindow():
                     pm.checkBox("MP_PY_FlattenCB", value = 0, label = "Flatten (-flatten 1)")
                     pm.setParent(upLevel = 1)
                 # endregion
+                # region conversion worker
+                with pm.rowLayout(numberOfColumns = 2):
+                    pm.checkBox(
+                        "MP_PY_ConversionWorkerCB",
+                        annotation = (
+                            "Converts Default version bams in one panda3d process that stays open, keeping its\n"
+                            "textures loaded, instead of starting egg2bam for every file. It needs a Python with\n"
+                            "panda3d, see MayaPandaWorker.py, and falls back to egg2bam without one."
+                        ),
+                        value = 0,
+                        label = "Convert in a persistent worker",
+                    )
+                    pm.setParent(upLevel = 1)
+                # endregion
+                # region bam version fan-out
+                pm.checkBox(
+                    "MP_PY_BamFanOutCB",
+                    annotation = (
+                        "Writes a bam for every version selected below from the same egg, so maya2egg runs once.\n"
+                        "The egg2bam of each version runs at the same time, and each version's bam goes to a\n"
+                        "folder named after it in the output directory. Unchecked, only the Bam Version above is written."
+                    ),
+                    value = 0,
+                    label = "Write several bam versions",
+                    changeCommand = lambda state: pm.textScrollList("MP_PY_BamFanOutList", edit = True, enable = state),
+                )
+                pm.textScrollList(
+                    "MP_PY_BamFanOutList",
+                    annotation = "Bam versions to write, from the $gMP_PY_PandaFileVersions array",
+                    allowMultiSelection = True,
+                    enable = False,
+                    width = 190,
+                    height = 56,
+                    append = [version[0] for version in MP_PY_PandaVersions()],
+                )
+                # endregion
                 pm.setParent(upLevel = 1)
             pm.setParent(upLevel = 1)
         # region convert units from
@@ -1871,7 +2292,7 @@ def MP_PY_CreatePandaExporterWindow():
         pm.setParent(upLevel = 1)
         pm.setParent(upLevel = 1)
         # endregion
-        with pm.frameLayout(width = 200, height = 50, label = "Egg-Object-Types:"):
+        with pm.frameLayout(width = 200, height = 70, label = "Egg-Object-Types:"):
             with pm.columnLayout(columnAttach = ("left", 0)):
                 with pm.rowLayout(numberOfColumns = 2):
                     pm.button(
@@ -1899,6 +2320,15 @@ def MP_PY_CreatePandaExporterWindow():
                         label = "Delete Egg Tags",
                     )
                     pm.setParent(upLevel = 1)
+                pm.checkBox(
+                    "MP_PY_ApplyTagRulesCB",
+                    annotation = (
+                        "Tags the scene with the rules of the tagging rules file before every export.\n"
+                        f"Rules file: {default_rules_file()}"
+                    ),
+                    value = 0,
+                    label = "Apply tagging rules before export",
+                )
                 pm.setParent(upLevel = 1)
             pm.setParent(upLevel = 1)
         pm.setParent(upLevel = 1)
@@ -2228,7 +2658,7 @@ def MP_PY_CreatePandaExporterWindow():
             pm.setParent(upLevel = 1)
         # endregion
         # region Export scene/nodes options
-        with pm.frameLayout(width = 270, height = 80, label = "Export Scene or Export Nodes:"):
+        with pm.frameLayout(width = 270, height = 105, label = "Export Scene or Export Nodes:"):
             with pm.columnLayout(columnAttach = ("left", 0)):
                 with pm.rowLayout(numberOfColumns = 2):
                     pm.button(
@@ -2286,6 +2716,29 @@ def MP_PY_CreatePandaExporterWindow():
                     )
                     pm.setParent(upLevel = 1)
 
+                with pm.rowLayout(numberOfColumns = 3):
+                    pm.checkBox(
+                        "MP_PY_ParallelExportCB",
+                        annotation = (
+                            "Writes the node .mb files first, then runs the maya2egg/egg2bam conversions\n"
+                            "in parallel, one process per CPU core within the memory budget."
+                        ),
+                        value = 0,
+                        label = "Parallel",
+                    )
+                    pm.text(label = "Memory budget (MB)")
+                    pm.intField(
+                        "MP_PY_MemoryBudgetIF",
+                        annotation = (
+                            "Total memory the parallel conversions may use.\n"
+                            "Each maya2egg process loads the Maya libraries, roughly 1GB each. 0 = no limit."
+                        ),
+                        min = 0,
+                        value = 8192,
+                        width = 60,
+                    )
+                    pm.setParent(upLevel = 1)
+
                 pm.setParent(upLevel = 1)
             pm.setParent(upLevel = 1)
         # endregion
@@ -2308,11 +2761,12 @@ def MP_PY_CreatePandaExporterWindow():
                         "MP_PY_GetEggFile2BamBTN",
                         width = 80,
                         height = 20,
-                        command = lambda *args: MP_PY_PlaceholderFunc(),  # MP_PY_GetEggFile2Bam
+                        command = lambda *args: MP_PY_GetEggFile2Bam(),
                         annotation = (
                             "Creates a Panda Bam file by running the selected version"
                             "\nof egg2bam and the currently chosen export options"
-                            "\non the selected egg file(s)."
+                            "\non the selected egg file(s). Bam files newer than their"
+                            "\negg are skipped, see MayaPandaConvert.py for folders."
                         ),
                         label = "Egg File 2 Bam",
                     )
@@ -2320,8 +2774,11 @@ def MP_PY_CreatePandaExporterWindow():
                         "MP_PY_GetBamFile2EggBTN",
                         width = 80,
                         height = 20,
-                        command = lambda *args: MP_PY_PlaceholderFunc(),  # MP_PY_GetBamFile2Egg
-                        annotation = "Runs bam2egg on the selected bam file(s)",
+                        command = lambda *args: MP_PY_GetBamFile2Egg(),
+                        annotation = (
+                            "Runs bam2egg on the selected bam file(s), all at the same time."
+                            "\nEggs newer than their bam are skipped."
+                        ),
                         label = "Bam File 2 Egg",
                     )
                     pm.setParent(upLevel = 1)
@@ -2331,8 +2788,11 @@ def MP_PY_CreatePandaExporterWindow():
                         "MP_PY_ImportPandaFileBTN",
                         width = 100,
                         height = 20,
-                        command = lambda *args: MP_PY_PlaceholderFunc(),  # MP_PY_ImportPandaFile
-                        annotation = "Imports selected Panda Bam or Egg file(s).",
+                        command = lambda *args: MP_PY_ImportPandaFile(),
+                        annotation = (
+                            "Imports selected Panda Bam or Egg file(s)."
+                            "\nBams are converted to egg first, previously imported ones come from the build cache."
+                        ),
                         label = "Import Panda File",
                     )
                     pm.setParent(upLevel = 1)
@@ -2358,6 +2818,7 @@ ui_elements = {
     "MP_PY_PandaExporter": "window",
     "MP_PY_AddEggObjectTypesWindow": "window",
     "MP_PY_DeleteEggObjectTypesWindow": "window",
+    "MP_PY_EggObjectTypePanel": "workspaceControl",
 }
 
 # Delete any current instances of the UI elements
@@ -2366,6 +2827,8 @@ for element, ui_type in ui_elements.items():
         pm.deleteUI(element, menu = True)
     elif ui_type == "window" and pm.window(element, exists = True):
         pm.deleteUI(element, window = True)
+    elif ui_type == "workspaceControl" and pm.workspaceControl(element, exists = True):
+        pm.deleteUI(element)
 # endregion
 
 
@@ -2376,7 +2839,18 @@ pm.menu("MP_PY_PandaMenu", label = "Panda3D_Python")
 pm.setParent("MP_PY_PandaMenu", menu = 1)
 pm.menuItem(command = lambda *args: MP_PY_PandaExporterUI(), label = "Panda Export GUI...")
 pm.menuItem(command = lambda *args: MP_PY_GetFile2Pview(), label = "View file in PView...")
+pm.menuItem(command = lambda *args: MP_PY_VIEWER.close(), label = "Close Live Preview")
 pm.menuItem(command = lambda *args: MP_PY_AddEggObjectTypesGUI(), label = "Add Egg-Type Attribute")
+pm.menuItem(command = lambda *args: MP_PY_MigrateEggObjectTypes(), label = "Migrate Egg-Object-Types")
+pm.menuItem(command = lambda *args: MP_PY_EggObjectTypeAuditGUI(), label = "Audit Egg-Object-Types...")
+pm.menuItem(command = lambda *args: MP_PY_EggObjectTypePanelGUI(), label = "Egg-Object-Types of Selection...")
+pm.menuItem(command = lambda *args: MP_PY_ApplyTagRules(), label = "Apply Tagging Rules")
+pm.menuItem(command = lambda *args: MP_PY_GetEggFile2Bam(folder = True), label = "Convert Egg Folder to Bam...")
+pm.menuItem(command = lambda *args: MP_PY_CancelConversions(), label = "Cancel Running Conversions")
+pm.menuItem(command = lambda *args: MP_PY_WORKER.close(), label = "Stop Conversion Worker")
+pm.menuItem(command = lambda *args: MP_PY_ClearBuildCache(), label = "Clear Export Cache")
+pm.menuItem(command = lambda *args: MP_PY_ExportMetricsReportGUI(), label = "Export Metrics Report...")
+pm.menuItem(command = lambda *args: MP_PY_SaveExportProfile(), label = "Save Export Profile...")
 pm.menuItem(command = lambda *args: MP_PY_GotoPanda3D(), label = "Panda3D Home")
 pm.menuItem(command = lambda *args: MP_PY_GotoPanda3DManual(), label = "Panda3D Manual")
 pm.menuItem(command = lambda *args: MP_PY_GotoPanda3DForum(), label = "Panda3D Help Forums")
@@ -2598,42 +3072,68 @@ def MP_PY_BrowseForFolderPreProcess(option):
             pm.textField("MP_PY_CustomOutputPathTF", edit = True, enable = True, text = folder_path)
 
 
-def MP_PY_ExportPrep(work_file, file_name):
+def MP_PY_ExportPrep(work_file, file_name, settings=None, run=None, dest_path=None, subsets=()):
     """
     Prepares the export process, generates arguments, exports the egg file,
     and optionally converts it to a bam file or views it in Pview.
 
     :param work_file: Full file path and name.
     :param file_name: Base file name.
+    :param settings: ExportSettings snapshot. Captured from the exporter window if not given.
+    :param run: ExportRun to record the stage timings in. It is finished once the last stage is done.
+    :param dest_path: Directory of the exported files. Defaults to the directory of work_file.
+    :param subsets: Only convert these nodes of work_file.
     :return: The path to the exported egg file or "failed" on error.
     """
+    settings = settings or MP_PY_CaptureExportSettings()
+    run = run or ExportRun(work_file)
+
     # Get the destination path
-    dest_path = os.path.dirname(work_file) + "/"
+    dest_path = dest_path or os.path.dirname(work_file) + "/"
 
     # Check for custom file name option
-    custom_filename = pm.textField("MP_PY_CustomFilenameTF", query = True, text = True)
-    if custom_filename:
-        file_name = custom_filename
+    if settings.filename:
+        file_name = settings.filename
 
     # Get the custom arguments
-    args = MP_PY_ArgsBuilder(file_name)
+    with run.stage("args"):
+        args = MP_PY_ArgsBuilder(file_name, settings, subsets)
     if args == "failed":
+        run.finish("failed")
         return "failed"
 
-    # Export the egg file
-    egg_file = MP_PY_Export2Egg(work_file, dest_path, file_name + ".egg", args)
-    if egg_file == "failed":
-        return "failed"
-
-    # If output option is both Egg and Bam, run egg2bam
-    selected_output_option = pm.radioCollection("MP_PY_OutputPandaFileTypeRC", query = True, select = True)
-    if selected_output_option == "MP_PY_ChooseEggBamRB":
-        MP_PY_Export2Bam(egg_file, 0)
-    else:
-        # If Pview option is selected, view the egg file
-        if pm.checkBox("MP_PY_ExportPviewCB", query = True, value = True):
-            MP_PY_Send2Pview(egg_file)
+    def on_egg_exported(job):
+        if not job.succeeded:
+            run.finish()
+            return
+        # Catch heavy assets now rather than when profiling the game, without holding up egg2bam and pview
+        def on_stats(reports):
+            report_lines, flagged = reports[job.outputs[0]]
+            print("\n".join([f"Egg statistics: {job.outputs[0]}"] + report_lines))
+            if flagged:
+                MP_PY_NodesExportedAsPandaFilesGUI(
+                    [(os.path.basename(job.outputs[0]), os.path.dirname(job.outputs[0]))], reports
+                )
 
+        MP_PY_ScanEggStats([job.outputs[0]], on_stats)
+        # If output option is both Egg and Bam, run egg2bam
+        if settings.output_bam:
+            MP_PY_Export2Bam(
+                job.outputs[0], 0, background = True, on_done = lambda bam_job: run.finish(), settings = settings, run = run
+            )
+            return
+        if settings.pview:
+            # If Pview option is selected, view the egg file
+            MP_PY_Send2Pview(job.outputs[0], settings, run)
+        run.finish()
+
+    # Export the egg file in the background, egg2bam and pview follow once it has been written
+    egg_file = MP_PY_Export2Egg(
+        work_file, dest_path, file_name + ".egg", args, background = True, on_done = on_egg_exported, settings = settings,
+        run = run
+    )
+    if egg_file == "failed":
+        run.finish("failed")
     return egg_file
 
 
@@ -2651,7 +3151,7 @@ def MP_PY_BrowseForFolder(file_mode, caption):
     return ""
 
 
-def MP_PY_Export2Bam(egg_file, export_mode):
+def MP_PY_Export2Bam(egg_file, export_mode, background=False, on_done=None, settings=None, run=None):
     """
     Converts an .egg file to a .bam file using specified options.
 
@@ -2659,80 +3159,408 @@ def MP_PY_Export2Bam(egg_file, export_mode):
     :param export_mode: Determines the export mode:
                         0 = Normal scene exporting.
                         1 = User has chosen a specific egg file to convert.
+    :param background: Run egg2bam on the job runner instead of waiting for it.
+    :param on_done: Called on the main thread with the finished ConversionJob, once every bam version is done.
+    :param settings: ExportSettings snapshot. Captured from the exporter window if not given.
+    :param run: ExportRun to record the egg2bam time, the .bam size and the pview launch in.
+    :return: The path to the .bam file, or "failed" if egg2bam failed. With several bam versions, the
+             bam of the version chosen in the Bam Version menu, or else of the first one.
     """
     if not egg_file:
         pm.error("Invalid egg file")
 
-    # Extract file details
-    file_name, file_extension = os.path.splitext(os.path.basename(egg_file))
-    file_path = os.path.dirname(egg_file)
-
-    # Additional options
-    raw_tex = "-rawtex " if pm.checkBox("MP_PY_RawtexCB", query = True, value = True) else ""
-    flatten = "-flatten 1 " if pm.checkBox("MP_PY_FlattenCB", query = True, value = True) else ""
-
-    # Handle custom output and filename for export_mode 1
-    if export_mode == 1:
-        custom_filename = pm.textField("MP_PY_CustomFilenameTF", query = True, text = True)
-        custom_output_path = pm.textField("MP_PY_CustomOutputPathTF", query = True, text = True)
-        file_name = custom_filename or file_name
-        file_path = custom_output_path or file_path
-
-    # Texture path options
-    tex_path_option = pm.radioCollection("MP_PY_TexPathOptionsRC", query = True, select = True)
-    custom_bam_tex_path = pm.textField("MP_PY_CustomBamTexPathTF", query = True, text = True)
-    custom_egg_tex_path = pm.textField("MP_PY_CustomEggTexPathTF", query = True, text = True)
-
-    path_store = "-ps rel " \
-        if tex_path_option in {"MP_PY_ChooseCustomRefPathRB", "MP_PY_ChooseCustomTexPathRB"} \
-        else ""
-
-    path_directory = f"-pd \"{custom_bam_tex_path or custom_egg_tex_path or file_path}\" " \
-        if tex_path_option != "MP_PY_ChooseDefaultTexPathRB" \
-        else ""
-
-    target_directory = f"-pc \"{custom_bam_tex_path or custom_egg_tex_path or file_path}\" " \
-        if tex_path_option == "MP_PY_ChooseCustomTexPathRB" \
-        else ""
-
-    dirname = f"-pp \"{file_path}\" " \
-        if tex_path_option != "MP_PY_ChooseDefaultTexPathRB" \
-        else ""
-
-    # Define the .bam file path
-    bam_file = os.path.join(file_path, f"{file_name}.bam")
-    print(f"Converting: {egg_file}")
-    print(f"Output BAM file: {bam_file}")
-
-    # Get the appropriate egg2bam version
-    egg2bam = MP_PY_PandaVersion("getEgg2Bam")
-
-    # Overwrite mode
-    overwrite = pm.checkBox("MP_PY_ExportOverwriteCB", query = True, value = True)
-    overwrite_flag = "-o " if overwrite else ""
-
-    # Construct the command
-    cmd = (
-        f"{egg2bam} {raw_tex}{flatten}{path_store}{path_directory}"
-        f"{target_directory}{dirname}"
-        f"{overwrite_flag}\"{bam_file}\" \"{egg_file}\""
+    settings = settings or MP_PY_CaptureExportSettings()
+    # With bam_fan_out every version is converted from this one egg, all at the same time
+    targets = []
+    for target, target_mode in egg2bam_targets(settings, egg_file, export_mode):
+        name = f"{target.bam_version} {os.path.basename(egg_file)}" if settings.bam_fan_out else ""
+        # A WorkerJob when the conversion worker is enabled, it runs the egg2bam command if the worker cannot
+        job, bam_file = egg2bam_job(target, egg_file, target_mode, MP_PY_WORKER, name)
+        if settings.bam_fan_out:
+            os.makedirs(os.path.dirname(bam_file), exist_ok = True)
+        targets.append((target, job, bam_file))
+        print(f"Converting: {egg_file}")
+        print(f"Output BAM file: {bam_file}")
+        print(f"Command:\n{job.commands[0]}")
+    main_bam = next((bam_file for target, _, bam_file in targets if target.bam_version == settings.bam_version), targets[0][2])
+    remaining = [len(targets)]
+
+    def finish(job, target, bam_file):
+        if run:
+            run.add_job(job, ["egg2bam"])
+            run.add_file(f"bam {target.bam_version}" if settings.bam_fan_out else "bam", bam_file)
+        if MP_PY_ReportJob(job):
+            # Run Pview if selected
+            if settings.pview and bam_file == main_bam:
+                MP_PY_Send2Pview(bam_file, settings, run)
+            print(f"Conversion complete: .egg -> .bam\nUnit: {settings.unit}")
+        remaining[0] -= 1
+        if on_done and not remaining[0]:
+            on_done(job)
+
+    if background:
+        for target, job, bam_file in targets:
+            MP_PY_JOB_RUNNER.submit(job, on_done = partial(finish, target = target, bam_file = bam_file))
+        return main_bam
+
+    jobs = [job for _, job, _ in targets]
+    JobPool(jobs, pool_size()).wait(0.05)
+    for target, job, bam_file in targets:
+        finish(job, target, bam_file)
+    return main_bam if all(job.succeeded for job in jobs) else "failed"
+
+
+def MP_PY_GetEggFile2Bam(folder=False):
+    """
+    Lets the user choose egg files, or a folder to convert every egg below it, and converts them to bam.
+
+    :param folder: Choose a folder rather than files.
+    """
+    starting_directory = os.path.dirname(pm.sceneName()) if pm.sceneName() else os.getcwd()
+    chosen = pm.fileDialog2(
+        dialogStyle = 2,
+        fileMode = 3 if folder else 4,
+        startingDirectory = starting_directory,
+        caption = "Select a folder of egg files to convert..." if folder else "Select egg file(s) to convert...",
+        fileFilter = "Panda Egg (*.egg)",
     )
-    # Execute the command
-    result = os.system(cmd)
-    print(f"Command executed:\n{cmd}")
+    if not chosen:
+        return []
+    return MP_PY_ConvertEggsToBam(chosen)
+
+
+def MP_PY_ConvertEggsToBam(paths, settings=None, force=False):
+    """
+    Converts egg files, and the eggs of folders, to bam with the egg2bam options of the exporter window.
+    The conversions run on the background job runner, as many at once as there are cores, and their
+    results are listed in a window as they finish. Bams newer than their egg are skipped.
+
+    :param paths: Egg files and folders.
+    :param settings: ExportSettings snapshot. Captured from the exporter window if not given.
+    :param force: Also convert eggs whose bam is up to date.
+    :return: The ConversionJobs.
+    """
+    settings = settings or MP_PY_CaptureExportSettings()
+    eggs = expand_files(paths, EGG_EXTENSIONS)
+    if not eggs:
+        MP_PY_ConfirmationDialog("Egg File 2 Bam", "No egg files found.", "ok")
+        return []
+    jobs, skipped = egg2bam_jobs(eggs, settings, force, MP_PY_WORKER)
+    print(f"Converting {len(jobs)} egg files to bam, {len(skipped)} are up to date.")
+    job_done = MP_PY_EggToBamResultsGUI(jobs, skipped)
+    for job in jobs:
+        MP_PY_JOB_RUNNER.submit(job, on_done = job_done)
+    return jobs
+
+
+def MP_PY_EggToBamResultsGUI(jobs, skipped):
+    """
+    Lists the conversions of MP_PY_ConvertEggsToBam. Double-clicking a row prints the egg2bam output.
+
+    :param jobs: The ConversionJobs, listed as queued.
+    :param skipped: (egg, bam) pairs that were up to date.
+    :return: Function to call with each job when it finishes, which updates its row.
+    """
+    if pm.window("MP_PY_EggToBamResultsGUI", exists = True):
+        pm.deleteUI("MP_PY_EggToBamResultsGUI", window = True)
+
+    counts = {"converted": 0, "failed": 0, "cancelled": 0}
+    # Row of every job, below the skipped files
+    rows = {id(job): len(skipped) + position for position, job in enumerate(jobs, start = 1)}
+
+    def summary():
+        finished = sum(counts.values())
+        return (
+            f"{finished} of {len(jobs)} done: {counts['converted']} converted, {counts['failed']} failed, "
+            f"{counts['cancelled']} cancelled. {len(skipped)} up to date."
+        )
 
-    # Run Pview if selected
-    if pm.checkBox("MP_PY_ExportPviewCB", query = True, value = True):
-        MP_PY_Send2Pview(bam_file)
+    def cancel(*args):
+        for job in jobs:
+            if not job.finished:
+                MP_PY_JOB_RUNNER.cancel(job)
+
+    def show_output(*args):
+        for position in pm.textScrollList(results, query = True, selectIndexedItem = True) or []:
+            if position > len(skipped):
+                MP_PY_ReportJob(jobs[position - len(skipped) - 1])
+
+    def job_done(job):
+        if job.cancelled:
+            counts["cancelled"] += 1
+            status = "cancelled"
+        elif job.succeeded:
+            counts["converted"] += 1
+            status = f"ok {job.elapsed:.2f}s"
+        else:
+            counts["failed"] += 1
+            status = f"FAILED ({job.returncode})"
+            MP_PY_ReportJob(job)
+        if not pm.window("MP_PY_EggToBamResultsGUI", exists = True):
+            return
+        position = rows[id(job)]
+        pm.textScrollList(results, edit = True, removeIndexedItem = position)
+        pm.textScrollList(results, edit = True, appendPosition = (position, f"{status:<16}{job.outputs[0]}"))
+        pm.text(summary_text, edit = True, label = summary())
 
-    print(f"Conversion complete: .egg -> .bam\nUnit: {pm.optionMenu('MP_PY_UnitMenu', query = True, value = True)}")
+    window = pm.window(
+        "MP_PY_EggToBamResultsGUI",
+        width = 800,
+        height = 400,
+        title = "...Egg File 2 Bam...",
+        toolbox = True,
+        titleBarMenu = True,
+    )
+    with pm.columnLayout(adjustableColumn = True, rowSpacing = 5):
+        summary_text = pm.text(align = "left", label = summary())
+        results = pm.textScrollList(
+            allowMultiSelection = True, height = 340, font = "fixedWidthFont", doubleClickCommand = show_output
+        )
+        pm.textScrollList(results, edit = True, append = (
+            [f"{'up to date':<16}{bam_file}" for _, bam_file in skipped]
+            + [f"{'queued':<16}{job.outputs[0]}" for job in jobs]
+        ))
+        pm.button(label = "Cancel", command = cancel)
+    pm.showWindow(window)
+    return job_done
 
 
-def MP_PY_Send2Pview(file_path=""):
+def MP_PY_GetBamFile2Egg():
+    """
+    Lets the user choose bam files and converts them to egg files next to them.
+    """
+    starting_directory = os.path.dirname(pm.sceneName()) if pm.sceneName() else os.getcwd()
+    chosen = pm.fileDialog2(
+        dialogStyle = 2,
+        fileMode = 4,
+        startingDirectory = starting_directory,
+        caption = "Select a Panda Bam to decompile to an Egg file...",
+        fileFilter = "Panda Bam (*.bam)",
+    )
+    if not chosen:
+        return []
+    return MP_PY_ConvertBamsToEgg(chosen)
+
+
+def MP_PY_ConvertBamsToEgg(paths, settings=None, force=False):
+    """
+    Converts bam files to eggs next to them with the bam2egg of the chosen bam version, all at the same
+    time on the background job runner. Eggs newer than their bam are skipped, and the eggs of bams that
+    were converted before are copied from the build cache. Bams inside the phase root chosen by
+    "Import Panda File" are converted there, so their textures are found, the others in their own folder.
+
+    :param paths: Bam files and folders.
+    :param settings: ExportSettings snapshot with the bam2egg to use. Captured from the exporter window if not given.
+    :param force: Also convert bams whose egg is up to date.
+    :return: The bam2egg jobs.
+    """
+    settings = settings or MP_PY_CaptureExportSettings()
+    bams = expand_files(paths, BAM_EXTENSIONS)
+    if not bams:
+        MP_PY_ConfirmationDialog("Bam File 2 Egg", "No bam files found.", "ok")
+        return []
+    pm.melGlobals.initVar("string", PHASE_ROOT_DIR)
+    cache = MP_PY_BUILD_CACHE if settings.use_build_cache else None
+    batches, skipped = egg_conversions(bams, pm.melGlobals[PHASE_ROOT_DIR], force)
+    jobs = []
+    cached = []
+    for root, conversions in batches.items():
+        root_jobs, root_cached = bam2egg_jobs(conversions, settings.bam2egg_exe, root, cache)
+        jobs.extend(root_jobs)
+        cached.extend(root_cached)
+    print(
+        f"Converting {len(jobs)} bam files to egg, {len(cached)} came from the build cache "
+        f"and {len(skipped)} are up to date."
+    )
+    for _, egg_file in cached:
+        print(f"From the build cache: {egg_file}")
+    remaining = [len(jobs)]
+    failed = []
+
+    def job_done(job):
+        if not MP_PY_ReportJob(job):
+            failed.append(job)
+        remaining[0] -= 1
+        if not remaining[0]:
+            print(f"Finished converting (.bam -> .egg): {len(jobs) - len(failed)} of {len(jobs)} converted.")
+
+    for job in jobs:
+        MP_PY_JOB_RUNNER.submit(job, on_done = job_done)
+    return jobs
+
+
+def MP_PY_ImportPandaFile():
+    """
+    Lets the user choose Panda bam or egg files and imports them into the scene.
+
+    Needs the mayaeggimport plugin of the Panda3D SDK. Bams are converted with bam2egg in the phase root
+    folder, the folder the phase_* folders are in, which the user is asked for once per session.
+    """
+    pm.melGlobals.initVar("string", MAYA_VER_SHORT)
+    pm.melGlobals.initVar("string", PHASE_ROOT_DIR)
+    pm.melGlobals.initVar("int", PANDA_SDK_NOTICE)
+    # Without the egg importer plugin, we assume it is not installed and offer to download the Panda3D SDK
+    plugin = "mayaeggimport" + pm.melGlobals[MAYA_VER_SHORT]
+    if not pm.pluginInfo(plugin, query = True, loaded = True):
+        download = MP_PY_ConfirmationDialog(
+            f"{plugin} Plugin ERROR!",
+            [
+                "Panda Egg Import plugin is either not currently loaded,",
+                "or not currently installed.",
+                "If you do not have the Panda3D SDK egg importer installed,",
+                "Would you like to download the Panda3D SDK now?",
+            ],
+            "downloadcancel",
+        )
+        if download == "DOWNLOAD":
+            MP_PY_GotoPanda3DSDKDownload()
+        return []
+
+    # bam2egg needs the phase root directory to find the textures
+    if not pm.melGlobals[PHASE_ROOT_DIR]:
+        choose_root = MP_PY_ConfirmationDialog(
+            "Phase Root Folder Selection",
+            [
+                "In the following dialog box, select the directory",
+                "in which your extracted phase folders are located.",
+                "",
+                "I.E. your phase root folder.",
+                "",
+                'Press "Select" to continue, press "Cancel" to exit.',
+            ],
+            "selectcancel",
+        )
+        if choose_root == "SELECT":
+            pm.melGlobals[PHASE_ROOT_DIR] = MP_PY_BrowseForFolder(3, "Select Phase Root Directory")
+        if not pm.melGlobals[PHASE_ROOT_DIR]:
+            return []
+
+    # Show the importing notice if the user has not seen it yet this session
+    if not pm.melGlobals[PANDA_SDK_NOTICE]:
+        choose_files = MP_PY_ConfirmationDialog(
+            "Panda File Selection",
+            [
+                "In the following dialog box, select the Panda File(s) you wish to import.",
+                "",
+                "This can be Panda bam or Panda Egg file(s).",
+                "",
+                'Press "Select" to choose the Panda file(s)',
+                'Press "Cancel" to exit this process.',
+                "",
+                "This is the only time you will see this message this Maya session.",
+            ],
+            "selectcancel",
+        )
+        if choose_files != "SELECT":
+            return []
+        pm.melGlobals[PANDA_SDK_NOTICE] = 1
+
+    starting_directory = os.path.dirname(pm.sceneName()) if pm.sceneName() else os.getcwd()
+    chosen = pm.fileDialog2(
+        dialogStyle = 2,
+        fileMode = 4,
+        startingDirectory = starting_directory,
+        caption = "Select Panda Egg or Panda Bam file to import.",
+        fileFilter = "Panda files (*.bam *.egg);;Panda bam file (*.bam);;Panda egg file (*.egg)",
+    )
+    if not chosen:
+        return []
+
+    # Bams from outside the phase root probably come from a different set of phases
+    root = pm.melGlobals[PHASE_ROOT_DIR]
+    if any(path.lower().endswith(BAM_EXTENSIONS) and not inside_root(path, root) for path in chosen):
+        choose_root = MP_PY_ConfirmationDialog(
+            "Phase Root Folder Different",
+            [
+                "You appear to be importing a Panda file with a different phase root location.",
+                "Please select the appropriate Phase Root Folder for this file.",
+                "",
+                "I.E. the root folder that all the Phase_* folders are in.",
+                "",
+                'Press "Select" to continue, press "Cancel" to exit.',
+            ],
+            "selectcancel",
+        )
+        if choose_root == "SELECT":
+            root = MP_PY_BrowseForFolder(3, "Select Phase Root Directory") or root
+            pm.melGlobals[PHASE_ROOT_DIR] = root
+    return MP_PY_ImportPandaFiles(chosen, root)
+
+
+def MP_PY_ImportPandaFiles(paths, root, settings=None, on_done=None):
+    """
+    Imports Panda files into the scene, in the order given.
+
+    The bams are converted to eggs in the phase root first, all at the same time on the background job
+    runner, and the eggs of bams that were imported before are copied from the build cache instead.
+    Once every conversion has finished, the files are imported one after another and the eggs written
+    for the bams are deleted again.
+
+    :param paths: Bam and egg files.
+    :param root: The phase root, bam2egg finds the textures of the bams from there.
+    :param settings: ExportSettings snapshot with the bam2egg to use. Captured from the exporter window if not given.
+    :param on_done: Called on the main thread with the files that could not be imported, once the others are.
+    :return: The bam2egg jobs.
+    """
+    settings = settings or MP_PY_CaptureExportSettings()
+    files = [path for path in paths if path.lower().endswith(PANDA_FILE_EXTENSIONS) and os.path.isfile(path)]
+    if not files:
+        MP_PY_ConfirmationDialog("No File Selected", "No Panda File is currently selected", "ok")
+        return []
+    cache = MP_PY_BUILD_CACHE if settings.use_build_cache else None
+    # bam -> egg written for it, next to the phase folders so the texture paths of the egg resolve
+    eggs = {path: import_egg_path(path, root) for path in files if path.lower().endswith(BAM_EXTENSIONS)}
+    bam_of = {egg_file: bam_file for bam_file, egg_file in eggs.items()}
+    jobs, cached = bam2egg_jobs(eggs.items(), settings.bam2egg_exe, root, cache)
+    print(f"Importing {len(files)} Panda files: {len(jobs)} bams to convert, {len(cached)} from the build cache.")
+    failed = []
+    remaining = [len(jobs)]
+
+    def import_files():
+        start = time.time()
+        for path in files:
+            if path in failed:
+                continue
+            print(f"Importing Panda File: {path}")
+            try:
+                pm.importFile(eggs.get(path, path))
+            except RuntimeError as error:
+                print(f"Could not import {path}: {error}")
+                failed.append(path)
+        for egg_file in eggs.values():
+            if os.path.exists(egg_file):
+                os.remove(egg_file)
+        print(f"Imported {len(files) - len(failed)} of {len(files)} Panda files in {time.time() - start:.2f}s.")
+        if failed:
+            MP_PY_ConfirmationDialog(
+                "Import Panda File",
+                ["These files could not be imported, see the Script Editor:"] + failed,
+                "ok",
+            )
+        if on_done:
+            on_done(failed)
+
+    def converted(job):
+        if not MP_PY_ReportJob(job):
+            failed.append(bam_of[job.outputs[0]])
+        remaining[0] -= 1
+        if not remaining[0]:
+            import_files()
+
+    if not jobs:
+        import_files()
+    for job in jobs:
+        MP_PY_JOB_RUNNER.submit(job, on_done = converted)
+    return jobs
+
+
+def MP_PY_Send2Pview(file_path="", settings=None, run=None):
     """
     Sends the specified file to Pview or uses the Pview plugin for Maya to preview the scene.
 
     :param file_path: The file to preview. If empty, uses Maya's Pview plugin to preview the scene.
+    :param settings: ExportSettings snapshot to take the pview version from, if any.
+    :param run: ExportRun to record the time taken to launch the external pview in.
     """
     # Process Variables
     maya_version_short = pm.melGlobals[MAYA_VER_SHORT]
@@ -2759,21 +3587,103 @@ def MP_PY_Send2Pview(file_path=""):
             print("Pview plugin requires a saved scene. Prompting user to choose a file...")
             MP_PY_GetFile2Pview()
 
+    elif settings and settings.live_preview:
+        # Reload the file in the viewer that is already open, which starts one if there is none
+        launch_start = time.perf_counter()
+        sent = MP_PY_VIEWER.show(file_path)
+        print(f"Live preview: {'reloaded' if sent == 'sent' else 'started the viewer for'} {file_path}")
+        if run:
+            run.add_time("pview", time.perf_counter() - launch_start)
+
     else:
         # A file is provided; use the external Pview executable
-        pview_executable = MP_PY_PandaVersion("getPview")
+        launch_start = time.perf_counter()
+        pview_executable = settings.pview_exe if settings else MP_PY_PandaVersion("getPview")
         print("\nStarting Pview for file...\n")
         print(f"File: {file_path}\n")
 
-        # Execute the Pview command
+        # Run pview in the background so Maya stays usable while the viewer is open
         cmd = f"{pview_executable} -l -c \"{file_path}\""
-        result = os.system(cmd)
 
-        print(f"{result}\n")
-        print("End Pview\n")
+        def finish(job):
+            MP_PY_ReportJob(job)
+            print("End Pview\n")
+
+        MP_PY_JOB_RUNNER.submit(ConversionJob(f"pview {os.path.basename(file_path)}", [cmd]), on_done = finish)
+        if run:
+            run.add_time("pview", time.perf_counter() - launch_start)
 
 
-def MP_PY_Export2Egg(mb_file, dest_path, dest_filename, args):
+def MP_PY_CachedMaya2EggCommands(mb_file, egg_file, args, settings, references=None):
+    """
+    Looks the export up in the build cache before running maya2egg.
+    On a cache hit the cached egg is copied to egg_file, and no command needs to run.
+    The files the open scene references are part of the key. Exports that copy their textures (-pc) always
+    run maya2egg, as a cache hit would leave the copies out of date.
+
+    :param mb_file: The path to the Maya binary (.mb) file.
+    :param egg_file: The full path of the .egg file to write.
+    :param args: The arguments from MP_PY_ArgsBuilder.
+    :param settings: ExportSettings snapshot.
+    :param references: The files the open scene references, from scene_references. Queried if not given.
+    :return: A tuple of (commands to run, cache key). The key is None when the cache is disabled.
+    """
+    commands = [maya2egg_command(settings, mb_file, egg_file, args)]
+    if not settings.use_build_cache or maya2egg_copies_textures(args):
+        return commands, None
+
+    if references is None:
+        references = scene_references(pm.cmds)
+    cache_key = MP_PY_BUILD_CACHE.maya2egg_key(mb_file, egg_file, args, references)
+    if (settings.overwrite or not os.path.exists(egg_file)) and MP_PY_BUILD_CACHE.fetch(cache_key, egg_file):
+        print(f"Scene unchanged since the last export, reusing cached egg file: {egg_file}")
+        return [], cache_key
+    return commands, cache_key
+
+
+def MP_PY_ClearBuildCache():
+    """
+    Removes every cached egg file.
+    """
+    MP_PY_BUILD_CACHE.clear()
+    print(f"Cleared export cache: {MP_PY_BUILD_CACHE.cache_dir}")
+
+
+def MP_PY_ExportMetricsReportGUI(limit=25):
+    """
+    Displays the slowest exported assets and the time spent per export stage per day,
+    read from the export metrics history.
+
+    :param limit: Number of slowest assets to list.
+    """
+    # Delete the window if it already exists
+    if pm.window("MP_PY_ExportMetricsReportGUI", exists = True):
+        pm.deleteUI("MP_PY_ExportMetricsReportGUI", window = True)
+
+    window = pm.window(
+        "MP_PY_ExportMetricsReportGUI",
+        width = 900,
+        height = 400,
+        title = f"...Export Metrics: {MP_PY_METRICS.path}...",
+        toolbox = True,
+        titleBarMenu = True,
+    )
+    with pm.columnLayout(columnAttach = ("left", 0), adjustableColumn = True, rowSpacing = 0):
+        pm.scrollField(
+            wordWrap = False,
+            editable = False,
+            font = "fixedWidthFont",
+            width = 900,
+            height = 400,
+            text = format_report(MP_PY_METRICS.records(), limit),
+        )
+
+    pm.showWindow(window)
+
+
+def MP_PY_Export2Egg(
+    mb_file, dest_path, dest_filename, args, background=False, on_done=None, settings=None, run=None, references=None
+):
     """
     Exports a Maya binary file to an egg file using the specified arguments.
 
@@ -2781,6 +3691,11 @@ def MP_PY_Export2Egg(mb_file, dest_path, dest_filename, args):
     :param dest_path: The destination directory for the .egg file.
     :param dest_filename: The name of the destination .egg file.
     :param args: The arguments to be passed to the maya2egg export command.
+    :param background: Run maya2egg on the job runner instead of waiting for it.
+    :param on_done: Called on the main thread with the finished ConversionJob.
+    :param settings: ExportSettings snapshot. Captured from the exporter window if not given.
+    :param run: ExportRun to record the maya2egg time and the .egg size in.
+    :param references: See MP_PY_CachedMaya2EggCommands.
     :return: The path to the exported .egg file, or "failed" if the export fails.
     """
     # Validate Maya binary file
@@ -2794,25 +3709,56 @@ def MP_PY_Export2Egg(mb_file, dest_path, dest_filename, args):
     print(f"Your scene will be saved as this egg file: {dest_filename}")
     print(f"In this directory: {dest_path}")
 
-    # Check if overwriting is enabled
-    overwrite = pm.checkBox("MP_PY_ExportOverwriteCB", query = True, value = True)
-
-    # Construct the system command
-    if overwrite:
+    settings = settings or MP_PY_CaptureExportSettings()
+    commands, cache_key = MP_PY_CachedMaya2EggCommands(mb_file, egg_file, args, settings, references)
+    if settings.overwrite:
         print("!!Overwrite enabled!!")
-        cmd = f"{args} -o \"{egg_file}\" \"{mb_file}\""
-    else:
-        cmd = f"{args} \"{mb_file}\" \"{egg_file}\""
+
+    def finish(job):
+        if cache_key and job.commands and job.succeeded:
+            MP_PY_BUILD_CACHE.store(cache_key, egg_file)
+        if run:
+            run.cached = not job.commands
+            run.add_job(job, ["maya2egg"])
+            run.add_file("egg", egg_file)
+        if MP_PY_ReportJob(job):
+            print(f"Finished exporting (.mb -> .egg), unit: {settings.unit}")
+        if on_done:
+            on_done(job)
 
     # Execute the command
     # Notice: cmd is a string, be careful with any spaces in the path.
-    start_time = time.time()
-    result = os.system(cmd)
-    end_time = time.time()
-    print(f"Elapsed time: {end_time - start_time} seconds")
+    job = ConversionJob(dest_filename, commands, [egg_file])
+    if background:
+        MP_PY_JOB_RUNNER.submit(job, on_done = finish)
+        return egg_file
 
-    print(f"Finished exporting (.mb -> .egg), unit: {pm.optionMenu('MP_PY_UnitMenu', query = True, value = True)}")
-    return egg_file
+    finish(run_job(job))
+    return egg_file if job.succeeded else "failed"
+
+
+def MP_PY_ReportJob(job):
+    """
+    Prints the exit code, wall time and captured output of a finished conversion job.
+
+    :param job: The finished ConversionJob.
+    :return: True if the job succeeded.
+    """
+    status = "cancelled" if job.cancelled else f"exit code {job.returncode}"
+    print(f"{job.name}: {status}, elapsed time: {job.elapsed:.2f} seconds")
+    if job.stdout.strip():
+        print(job.stdout.rstrip())
+    if job.stderr.strip():
+        print(job.stderr.rstrip())
+    return job.succeeded
+
+
+def MP_PY_CancelConversions():
+    """
+    Cancels every background conversion and pview job started by the exporter.
+    """
+    cancelled = MP_PY_JOB_RUNNER.cancel()
+    print(f"Cancelled {len(cancelled)} background job(s).")
 
 
 def MP_PY_GetFile2Pview():
@@ -2851,8 +3797,10 @@ def MP_PY_ExportNodesToPandaFiles():
     Converts the selected nodes in a Maya scene to Panda3D-compatible files.
     Supports exporting multiple nodes to individual files with user-defined options.
     """
+    settings = MP_PY_CaptureExportSettings()
+
     # Get the export directory path
-    dest_path = pm.textField("MP_PY_CustomOutputPathTF", query = True, text = True)
+    dest_path = settings.output_path
     selected_nodes = pm.ls(selection = True, long = True)
     selected_nodes.sort()
 
@@ -2878,13 +3826,186 @@ def MP_PY_ExportNodesToPandaFiles():
 
     # Ensure the destination path ends with a slash
     dest_path = os.path.join(dest_path, "")
+    os.makedirs(dest_path, exist_ok = True)
+
+    if settings.apply_tag_rules:
+        MP_PY_ApplyTagRules(settings.tag_rules_file, quiet = True)
 
     # Variables for tracking progress and results
     nodes_to_panda_files = []
     files_exported = 0
     number_of_selected_nodes = len(selected_nodes)
 
-    # Initialize Maya progress bar
+    # In parallel mode the .mb files are written here, and the conversions are queued for the job pool
+    conversion_jobs = []
+    cache_entries = {}
+    # ExportRun and stage names of each job's commands
+    job_runs = {}
+    scene_name = pm.cmds.file(query = True, sceneName = True)
+
+    # Nodes with a unique name are converted from one shared scene file with maya2egg -subset,
+    # the others still get a .mb file of their own
+    subset_names = MP_PY_UniqueNodeNames(selected_nodes) if settings.reuse_scene_file else {}
+    shared_mb_file = ""
+    shared_save_time = 0.0
+    # Checked before legacy_layout marks the scene modified
+    saved_scene_file = MP_PY_SavedSceneFile() if subset_names else ""
+    # Every node's cache key holds them, they do not change during the export
+    references = scene_references(pm.cmds) if settings.use_build_cache else ()
+    # The egg-object-types have to be in the eggObjectTypesN attributes maya2egg reads while the .mb files are written
+    with legacy_layout(pm.cmds, OT_REGISTRY.ids()) as expanded:
+        if subset_names:
+            shared_mb_file = "" if expanded else saved_scene_file
+            if not shared_mb_file:
+                scene_base = os.path.splitext(os.path.basename(scene_name))[0] or "untitled"
+                shared_mb_file = os.path.join(dest_path, f"{scene_base}_nodes_temp.mb")
+                save_start = time.perf_counter()
+                if saved_scene_file:
+                    MP_PY_SaveSceneCopy(shared_mb_file, saved_scene_file)
+                else:
+                    forget_stamp(shared_mb_file)
+                    pm.cmds.file(shared_mb_file, op = "v=1", typ = "mayaBinary", exportAll = True, force = True)
+                shared_save_time = time.perf_counter() - save_start
+                nodes_to_panda_files.append((os.path.basename(shared_mb_file), dest_path))
+
+        # Initialize Maya progress bar
+        g_main_progress_bar = pm.melGlobals["gMainProgressBar"]
+        pm.progressBar(
+            g_main_progress_bar,
+            edit = True,
+            beginProgress = True,
+            isInterruptable = True,
+            minValue = 0,
+            maxValue = number_of_selected_nodes,
+        )
+
+        # Loop through selected nodes and export each
+        for this_file_number, node in enumerate(selected_nodes, start = 1):
+            if pm.progressBar(g_main_progress_bar, query = True, isCancelled = True):
+                break
+
+            # Update progress bar
+            pm.progressBar(
+                g_main_progress_bar,
+                edit = True,
+                step = 1,
+                status = f"Exporting selected node... {this_file_number} of Nodes: {number_of_selected_nodes}",
+            )
+
+            # Extract the node's name and construct file names
+            node_name = node.split("|")[-1]
+            maya_file_name = f"{node_name}.mb"
+            temp_mb_file = os.path.join(dest_path, maya_file_name)
+            subsets = ()
+
+            run = ExportRun(scene_name, node, MP_PY_METRICS)
+
+            if node in subset_names:
+                temp_mb_file = shared_mb_file
+                subsets = (subset_names[node],)
+                # The single save is booked on the first node
+                run.add_time("save_mb", shared_save_time)
+                shared_save_time = 0.0
+            else:
+                # Export the node as a Maya binary file
+                pm.select(node, replace = True)
+                with run.stage("save_mb"):
+                    pm.cmds.file(temp_mb_file, op = "v=1", typ = "mayaBinary", exportSelected = True, force = True)
+                # Add Maya file info to results
+                nodes_to_panda_files.append((maya_file_name, dest_path))
+            run.add_file("mb", temp_mb_file)
+
+            # Define egg file name
+            file_name = os.path.splitext(maya_file_name)[0]
+            dest_filename = f"{file_name}.egg"
+
+            # Build arguments for exporting
+            with run.stage("args"):
+                args = MP_PY_ArgsBuilder(file_name, settings, subsets)
+
+            if settings.parallel:
+                egg_file = os.path.join(dest_path, dest_filename)
+                commands, cache_key = MP_PY_CachedMaya2EggCommands(temp_mb_file, egg_file, args, settings, references)
+                job = ConversionJob(node_name, commands, [dest_filename])
+                run.cached = not commands
+                stages = ["maya2egg"] * len(commands)
+                if cache_key and commands:
+                    cache_entries[id(job)] = (cache_key, egg_file)
+                if settings.output_bam:
+                    # Every bam version is converted from the node's one maya2egg run
+                    for target, target_mode in egg2bam_targets(settings, egg_file, 0):
+                        bam_cmd, bam_file = egg2bam_command(target, egg_file, target_mode)
+                        os.makedirs(os.path.dirname(bam_file), exist_ok = True)
+                        job.commands.append(bam_cmd)
+                        job.outputs.append(os.path.relpath(bam_file, dest_path))
+                        stages.append("egg2bam")
+                job_runs[id(job)] = (run, stages)
+                conversion_jobs.append(job)
+                continue
+
+            # Export the egg file
+            if not settings.output_bam:
+                egg_file = MP_PY_Export2Egg(
+                    temp_mb_file, dest_path, dest_filename, args, settings = settings, run = run, references = references
+                )
+                run.finish()
+                if egg_file == "failed":
+                    continue
+                nodes_to_panda_files.append((dest_filename, dest_path))
+                files_exported += 1
+            else:
+                # Export egg and bam files
+                egg_file = MP_PY_Export2Egg(
+                    temp_mb_file, dest_path, dest_filename, args, settings = settings, run = run, references = references
+                )
+                if egg_file == "failed":
+                    run.finish()
+                    continue
+                nodes_to_panda_files.append((dest_filename, dest_path))
+
+                # Convert the egg file to a bam file, or one per version
+                bam_file = MP_PY_Export2Bam(egg_file, 0, settings = settings, run = run)
+                run.finish()
+                if bam_file != "failed":
+                    nodes_to_panda_files.append((os.path.relpath(bam_file, dest_path), dest_path))
+                files_exported += 1
+
+        # End progress bar
+        pm.progressBar(g_main_progress_bar, edit = True, endProgress = True)
+
+    if conversion_jobs:
+        for job in MP_PY_RunConversionJobs(conversion_jobs, settings.memory_budget_mb):
+            run, stages = job_runs[id(job)]
+            run.add_job(job, stages)
+            for output in job.outputs:
+                run.add_file(os.path.splitext(output)[1].lstrip("."), os.path.join(dest_path, output))
+            run.finish()
+            if job.succeeded:
+                if id(job) in cache_entries:
+                    MP_PY_BUILD_CACHE.store(*cache_entries[id(job)])
+                nodes_to_panda_files.extend((output, dest_path) for output in job.outputs)
+                files_exported += 1
+
+    # Show results if files were exported
+    if files_exported > 0 and nodes_to_panda_files:
+        MP_PY_NodesExportedAsPandaFilesGUI(nodes_to_panda_files)
+
+
+def MP_PY_RunConversionJobs(jobs, memory_budget_mb=0):
+    """
+    Runs conversion jobs through a bounded JobPool, reporting progress and
+    cancellation through the main Maya progress bar.
+
+    The pool size is limited by the CPU count and the memory budget,
+    since each maya2egg process loads the Maya libraries.
+
+    :param jobs: List of ConversionJobs.
+    :param memory_budget_mb: Total memory the jobs may use. 0 = no limit.
+    :return: The finished jobs.
+    """
+    pool = JobPool(jobs, pool_size(memory_budget_mb = memory_budget_mb))
+    print(f"Running {len(jobs)} conversions, {pool.workers} at a time.")
+
     g_main_progress_bar = pm.melGlobals["gMainProgressBar"]
     pm.progressBar(
         g_main_progress_bar,
@@ -2892,70 +4013,80 @@ def MP_PY_ExportNodesToPandaFiles():
         beginProgress = True,
         isInterruptable = True,
         minValue = 0,
-        maxValue = number_of_selected_nodes,
+        maxValue = len(jobs),
     )
 
-    # Loop through selected nodes and export each
-    for this_file_number, node in enumerate(selected_nodes, start = 1):
+    while not pool.done():
         if pm.progressBar(g_main_progress_bar, query = True, isCancelled = True):
+            print("Cancelling conversions...")
+            pool.cancel()
             break
 
-        # Update progress bar
-        pm.progressBar(
-            g_main_progress_bar,
-            edit = True,
-            step = 1,
-            status = f"Exporting selected node... {this_file_number} of Nodes: {number_of_selected_nodes}",
-        )
+        for job in pool.poll():
+            if not job.succeeded:
+                print(f"Conversion failed for {job.name} (exit code {job.returncode})")
+            pm.progressBar(
+                g_main_progress_bar,
+                edit = True,
+                step = 1,
+                status = f"Converting nodes... {len(pool.finished)} of {len(jobs)}",
+            )
+        time.sleep(0.05)
 
-        # Extract the node's name and construct file names
-        node_name = node.split("|")[-1]
-        maya_file_name = f"{node_name}.mb"
-        temp_mb_file = os.path.join(dest_path, maya_file_name)
-
-        # Export the node as a Maya binary file
-        pm.select(node, replace = True)
-        pm.cmds.file(temp_mb_file, op = "v=1", typ = "mayaBinary", exportSelected = True, force = True)
-        # Add Maya file info to results
-        nodes_to_panda_files.append((maya_file_name, dest_path))
-
-        # Define egg file name
-        file_name = os.path.splitext(maya_file_name)[0]
-        dest_filename = f"{file_name}.egg"
-
-        # Build arguments for exporting
-        args = MP_PY_ArgsBuilder(file_name)
-
-        # Export the egg file
-        if pm.radioCollection("MP_PY_OutputPandaFileTypeRC", query = True, select = True) == "MP_PY_ChooseEggRB":
-            egg_file = MP_PY_Export2Egg(temp_mb_file, dest_path, dest_filename, args)
-            nodes_to_panda_files.append((dest_filename, dest_path))
-            files_exported += 1
-        elif pm.radioCollection("MP_PY_OutputPandaFileTypeRC", query = True, select = True) == "MP_PY_ChooseEggBamRB":
-            # Export egg and bam files
-            egg_file = MP_PY_Export2Egg(temp_mb_file, dest_path, dest_filename, args)
-            nodes_to_panda_files.append((dest_filename, dest_path))
-
-            # Convert the egg file to a bam file
-            MP_PY_Export2Bam(egg_file, 0)
-            bam_file_name = f"{file_name}.bam"
-            nodes_to_panda_files.append((bam_file_name, dest_path))
-            files_exported += 1
-
-    # End progress bar
     pm.progressBar(g_main_progress_bar, edit = True, endProgress = True)
+    return pool.finished
 
-    # Show results if files were exported
-    if files_exported > 0 and nodes_to_panda_files:
-        MP_PY_NodesExportedAsPandaFilesGUI(nodes_to_panda_files)
 
+def MP_PY_EggStatsReport(egg_file, budgets=None):
+    """
+    Counts the groups, Geoms, vertices, triangles, textures, render states and draw calls of an exported egg
+    per top-level node, and checks the asset against its budget from the budgets file.
+
+    :param egg_file: Path to the .egg file.
+    :param budgets: ExportBudgets to check against. Read from the budgets file if not given.
+    :return: Tuple of (report lines, True if the asset is over budget).
+    """
+    try:
+        budgets = budgets or ExportBudgets.load()
+        stats = egg_stats(egg_file)
+    except (OSError, ValueError) as error:
+        return [f"  No egg statistics: {error}"], False
+    violations = budgets.check(stats)
+    return format_stats(stats, violations), bool(violations)
+
+
+def MP_PY_ScanEggStats(egg_files, on_done):
+    """
+    Runs MP_PY_EggStatsReport on egg files in a background thread, so scanning large eggs does not freeze Maya.
+    The budgets file is read once for all of them.
+
+    :param egg_files: Paths of the .egg files.
+    :param on_done: Called on the main thread with a dictionary of egg file to its MP_PY_EggStatsReport result.
+    :return: The thread.
+    """
+    def scan():
+        try:
+            budgets = ExportBudgets.load()
+        except (OSError, ValueError) as error:
+            maya.utils.executeDeferred(print, f"Could not read the export budgets: {error}")
+            budgets = ExportBudgets()
+        reports = {egg_file: MP_PY_EggStatsReport(egg_file, budgets) for egg_file in egg_files}
+        maya.utils.executeDeferred(on_done, reports)
 
-def MP_PY_NodesExportedAsPandaFilesGUI(nodes_to_panda_files):
+    thread = threading.Thread(target = scan, name = "MayaPandaEggStats", daemon = True)
+    thread.start()
+    return thread
+
+
+def MP_PY_NodesExportedAsPandaFilesGUI(nodes_to_panda_files, reports=None):
     """
     Displays a window listing all nodes that were exported as Panda files.
-    Shows the file names and their export locations as a reference for the user.
+    Shows the file names and their export locations as a reference for the user,
+    with the statistics of every egg file. Assets over their budget are flagged.
 
     :param nodes_to_panda_files: List of tuples with (file_name, file_path).
+    :param reports: Already computed MP_PY_EggStatsReport results, keyed by egg file path. The other eggs are
+                    scanned in the background, and their statistics are filled in once they are done.
     """
     # Delete the window if it already exists
     if pm.window("MP_PY_NodesExportedToPandaFilesGUI", exists = True):
@@ -2965,33 +4096,66 @@ def MP_PY_NodesExportedAsPandaFilesGUI(nodes_to_panda_files):
         MP_PY_ConfirmationDialog("Data Error!", "There is currently no exported files in the array.", "ok")
         return
 
+    reports = dict(reports or {})
+    egg_files = [
+        os.path.join(file_path, file_name)
+        for file_name, file_path in nodes_to_panda_files
+        if file_name.lower().endswith(".egg")
+    ]
+    missing = [egg_file for egg_file in egg_files if egg_file not in reports]
+
+    def listing():
+        lines = []
+        over_budget = []
+        for file_name, file_path in nodes_to_panda_files:
+            lines.append(f"{file_name} : {file_path}")
+            egg_file = os.path.join(file_path, file_name)
+            if egg_file not in egg_files:
+                continue
+            if egg_file not in reports:
+                lines.append("  Egg statistics: scanning...")
+                continue
+            report_lines, flagged = reports[egg_file]
+            lines.extend(report_lines)
+            if flagged:
+                over_budget.append(file_name)
+        if over_budget:
+            lines[:0] = [f"OVER BUDGET ({len(over_budget)}): {', '.join(over_budget)}", ""]
+        return "\n".join(lines) + "\n"
+
     # Create the window
     window = pm.window(
         "MP_PY_NodesExportedToPandaFilesGUI",
         sizeable = False,
-        width = 600,
-        height = 200,
+        width = 800,
+        height = 300,
         title = "...Listing of Exported nodes to Panda Files...",
         toolbox = True,
         titleBarMenu = True,
     )
     with pm.columnLayout(columnAttach = ("left", 0), adjustableColumn = True, rowSpacing = 0):
-        scroll_field = pm.scrollField(
+        # Populate the scroll field with exported files, paths and egg statistics
+        listing_field = pm.scrollField(
             wordWrap = False,
             editable = False,
-            width = 600,
-            height = 200,
+            font = "fixedWidthFont",
+            width = 800,
+            height = 300,
+            text = listing(),
         )
 
     # Show the window
     pm.showWindow(window)
-    pm.window("MP_PY_NodesExportedToPandaFilesGUI", edit = True, width = 600, height = 200)
+    pm.window("MP_PY_NodesExportedToPandaFilesGUI", edit = True, width = 800, height = 300)
+
+    def on_stats(new_reports):
+        reports.update(new_reports)
+        # The window may have been closed, or replaced by a later export's
+        if pm.scrollField(listing_field, exists = True):
+            pm.scrollField(listing_field, edit = True, text = listing())
 
-    # Populate the scroll field with exported files and paths
-    for i in range(0, len(nodes_to_panda_files), 2):
-        file_name = nodes_to_panda_files[i]
-        file_path = nodes_to_panda_files[i + 1]
-        pm.scrollField(scroll_field, edit = True, insertText = f"{file_name} : {file_path}\n")
+    if missing:
+        MP_PY_ScanEggStats(missing, on_stats)
 
 
 def MP_PY_BrowseForFilePreProcess(option):
@@ -3030,11 +4194,31 @@ def MP_PY_BrowseForFilePreProcess(option):
 
 
 class MassDeleteAttrWindow(object):
+    """
+    Lists the user-defined attributes of the selected nodes (every transform and shape when nothing
+    is selected) and deletes the chosen ones from all of those nodes.
+
+    The index of which node has which attribute is built with one listAttr over all nodes and one
+    ls of the attribute names. Deleting is one undoable step, done a batch of nodes per deleteAttr
+    with the main progress bar, and can be cancelled with Esc.
+
+    Egg-object-types are listed by type instead of by the attributes that hold them, read with
+    MP_PY_ReadEggObjectTypes. Deleting one writes the remaining types of each node back with
+    MP_PY_WriteEggObjectTypes, so the eggObjectTypeList and any eggObjectTypesN attributes change together.
+    """
     # Borrowed from https://forums.cgsociety.org/t/delete-multiple-attributes/1848055/2
+    # Nodes per deleteAttr call, and per progress bar step
+    batchSize = 250
+    # Index keys of egg-object-types, which no attribute name can clash with
+    typePrefix = "egg-object-type "
+
     def __init__(self):
         self.window = 'massDeleteAttrWin'
         self.title = 'Mass Delete Attributes'
         self.size = (600, 800)
+        self.selection = []
+        # attribute -> nodes that have it, in the order the list shows the attributes
+        self.index = {}
 
     def create(self):
         if pm.window(self.window, exists = True):
@@ -3047,41 +4231,208 @@ class MassDeleteAttrWindow(object):
         )
 
         self.mainForm = pm.paneLayout(configuration = 'horizontal3', ps = ((1, 100, 80), (2, 100, 10)))
-        self.uiList = pm.textScrollList(allowMultiSelection = True)
+        self.uiList = pm.textScrollList(allowMultiSelection = True, font = "fixedWidthFont")
         self.btnDelete = pm.button(label = 'Delete!', command = partial(self.doDelete))
         self.btnRefresh = pm.button(label = 'Refresh Selection', command = partial(self.doRefresh))
 
     def getSelection(self):
-        self.selection = pm.ls(selection = True)
+        self.selection = pm.cmds.ls(selection = True, long = True)
         if not self.selection:
-            self.selection = pm.ls(transforms = True, shapes = True)
+            self.selection = pm.cmds.ls(transforms = True, shapes = True, long = True) or []
 
-    def listCustomAttrs(self):
+    def indexCustomAttrs(self):
+        """
+        :return: Dictionary of user-defined attribute name to the nodes of the selection that have it, sorted by name.
+        """
+        if not self.selection:
+            return {}
+        names = set(pm.cmds.listAttr(self.selection, userDefined = True) or [])
+        if not names:
+            return {}
+        selected = set(self.selection)
+        index = {name: [] for name in sorted(names)}
+        for plug in pm.cmds.ls([f"*.{name}" for name in names], long = True, recursive = True) or []:
+            node, _, attr = plug.rpartition(".")
+            if node in selected and attr in index:
+                index[attr].append(node)
+
+        # The nodes with egg-object-type attributes are listed under their types instead.
+        # Their plugs are read in the order of MP_PY_ReadEggObjectTypes, eggObjectTypes1..10 before the list.
+        plugs = []
+        for attr in sorted(
+            [attr for attr in index if attr == EGG_OBJECT_TYPE_LIST or legacy_number(attr) is not None],
+            key = lambda attr: legacy_number(attr) or len(LEGACY_NUMBERS) + 1,
+        ):
+            plugs.extend(f"{node}.{attr}" for node in index.pop(attr))
+        tagged = {}
+        for node, _, names in MP_PY_ReadEggObjectTypePlugs(plugs):
+            node_types = tagged.setdefault(node, [])
+            node_types.extend(name for name in names if name not in node_types)
+        types = {}
+        for node, node_types in tagged.items():
+            for name in node_types:
+                types.setdefault(self.typePrefix + name, []).append(node)
+        types = {key: types[key] for key in sorted(types)}
+        types.update((attr, nodes) for attr, nodes in index.items() if nodes)
+        return types
+
+    @staticmethod
+    def itemLabel(attr, nodes):
         # todo: Also list the value of the attr (instead of just eggObjectType1 or whatever)
-        attrs = []
-        for node in self.selection:
-            customAttrs = node.listAttr(userDefined = True)
-            if customAttrs:
-                attrs.extend([attr.attrName() for attr in customAttrs])
-        return sorted(list(set(attrs)))
+        return f"{attr:<40}{len(nodes):>8} nodes"
+
+    def deleteFromNodes(self, attr, nodes):
+        """
+        Deletes an attribute from a batch of nodes with one deleteAttr, or node by node when that fails.
+
+        :return: The nodes it could not be deleted from.
+        """
+        try:
+            pm.cmds.deleteAttr(*nodes, attribute = attr)
+            return []
+        except RuntimeError:
+            pass
+        failed = []
+        for node in nodes:
+            try:
+                pm.cmds.deleteAttr(node, attribute = attr)
+            except RuntimeError:
+                # Locked or from a reference, and nodes deleted since the last refresh
+                if pm.cmds.objExists(f"{node}.{attr}"):
+                    failed.append(node)
+        return failed
+
+    @staticmethod
+    def deleteTypesFromNodes(eggObjectTypes, nodes):
+        """
+        Removes egg-object-types from a batch of nodes, writing each node's remaining types once.
+
+        :return: The nodes they could not be removed from.
+        """
+        attributes = {}
+        failed = []
+        for node, names in MP_PY_ReadEggObjectTypes(nodes, attributes).items():
+            remaining = [name for name in names if name not in eggObjectTypes]
+            # Nodes deleted or untagged since the last refresh have nothing to remove
+            if len(remaining) == len(names):
+                continue
+            try:
+                MP_PY_WriteEggObjectTypes(node, remaining, attributes[node])
+            except RuntimeError:
+                # Locked or from a reference
+                failed.append(node)
+        return failed
 
     def doDelete(self, *args):
-        attrs = self.uiList.getSelectItem()
-        if not attrs:
-            return
+        positions = pm.textScrollList(self.uiList, query = True, selectIndexedItem = True) or []
+        order = list(self.index)
+        self.deleteAttrs([order[position - 1] for position in positions])
+
+    def deleteAttrs(self, attrs):
+        """
+        Deletes the attributes from every node of the index that has them, as one undoable step.
+        The chosen egg-object-types are removed first, together, so each node is written once.
 
-        for node in self.selection:
-            for attr in attrs:
-                if node.hasAttr(attr):
-                    node.deleteAttr(attr)
+        :return: Number of attributes deleted.
+        """
+        if not attrs:
+            return 0
 
-        for attr in attrs:
-            self.uiList.removeItem(attr)
+        total = sum(len(self.index[attr]) for attr in attrs)
+        g_main_progress_bar = pm.melGlobals["gMainProgressBar"]
+        pm.progressBar(
+            g_main_progress_bar,
+            edit = True,
+            beginProgress = True,
+            isInterruptable = True,
+            minValue = 0,
+            maxValue = total,
+        )
+        types = [attr for attr in attrs if attr.startswith(self.typePrefix)]
+        steps = ([types] if types else []) + [[attr] for attr in attrs if attr not in types]
+        deleted = 0
+        failed = {}
+        cancelled = False
+        # The attributes deleting got to, only their list items change
+        touched = []
+        pm.undoInfo(openChunk = True, chunkName = "MassDeleteAttrWindow")
+        try:
+            for step in steps:
+                touched.extend(step)
+                # The attributes of the step each node has
+                owners = {}
+                for attr in step:
+                    for node in self.index[attr]:
+                        owners.setdefault(node, []).append(attr)
+                nodes = list(owners)
+                done = set()
+                while nodes and not cancelled:
+                    batch = nodes[:self.batchSize]
+                    if step is types:
+                        failed_nodes = self.deleteTypesFromNodes({attr[len(self.typePrefix):] for attr in types}, batch)
+                    else:
+                        failed_nodes = self.deleteFromNodes(step[0], batch)
+                    del nodes[:len(batch)]
+                    failed_nodes = set(failed_nodes)
+                    for node in batch:
+                        if node in failed_nodes:
+                            for attr in owners[node]:
+                                failed.setdefault(attr, []).append(node)
+                        else:
+                            done.add(node)
+                            deleted += len(owners[node])
+                    pm.progressBar(
+                        g_main_progress_bar,
+                        edit = True,
+                        step = sum(len(owners[node]) for node in batch),
+                        status = f"Deleting {', '.join(step)}... {deleted} of {total}",
+                    )
+                    cancelled = pm.progressBar(g_main_progress_bar, query = True, isCancelled = True)
+                # Nodes it failed on or did not get to still have the attribute
+                for attr in step:
+                    self.index[attr] = [node for node in self.index[attr] if node not in done]
+                if cancelled:
+                    break
+        finally:
+            pm.undoInfo(closeChunk = True)
+            pm.progressBar(g_main_progress_bar, edit = True, endProgress = True)
+
+        self.updateItems(touched)
+        print(f"Deleted {deleted} of {total} attributes{', cancelled' if cancelled else ''}. Undo restores them all.")
+        if any(failed.values()):
+            MP_PY_ConfirmationDialog("Mass Delete Attributes", [
+                f"{attr} could not be deleted from {len(nodes)} nodes, see the script editor."
+                for attr, nodes in failed.items() if nodes
+            ], "ok")
+            for attr, nodes in failed.items():
+                if nodes:
+                    print(f"{attr} could not be deleted from:\n    " + "\n    ".join(nodes))
+        return deleted
+
+    def updateItems(self, attrs):
+        """
+        Removes the attributes that are gone from every node from the list, and updates the node counts of the rest.
+        """
+        order = list(self.index)
+        # From the bottom up, so the positions of the items still to update do not move
+        for attr in sorted(attrs, key = order.index, reverse = True):
+            position = order.index(attr) + 1
+            pm.textScrollList(self.uiList, edit = True, removeIndexedItem = position)
+            if self.index[attr]:
+                pm.textScrollList(
+                    self.uiList, edit = True, appendPosition = (position, self.itemLabel(attr, self.index[attr]))
+                )
+            else:
+                del self.index[attr]
+                order.remove(attr)
 
     def doRefresh(self, *args):
         self.getSelection()
-        self.uiList.removeAll()
-        self.uiList.append(self.listCustomAttrs())
+        self.index = self.indexCustomAttrs()
+        pm.textScrollList(self.uiList, edit = True, removeAll = True)
+        pm.textScrollList(self.uiList, edit = True, append = [
+            self.itemLabel(attr, nodes) for attr, nodes in self.index.items()
+        ])
 
     def show(self):
         pm.showWindow(self.window)
@@ -0,0 +1,343 @@
+"""
+Live preview: one viewer that stays open and reloads exported files.
+
+Starting pview for every export means waiting for it to start, losing the camera and loading every
+texture again. The live viewer is a small panda3d program, this file run with a Python that has
+panda3d (ppython on Windows, python3 elsewhere, or MP_PY_VIEWER_PYTHON). It runs detached from Maya
+and listens on a localhost port (MP_PY_VIEWER_PORT, 47810 by default) for one JSON message per line:
+
+    {"show": "/path/model.bam"}     shows the file, or reloads it when it is already shown
+    {"clear": true}                 removes every model
+    {"quit": true}
+
+A reload replaces only that model and keeps the camera. It bypasses the model cache, and textures
+are only read again when their file changed. The viewer also polls the modification times of the
+shown files, so a file written by something other than the exporter is reloaded as well.
+
+ViewerClient is the exporter's side: it sends the file to the running viewer, and starts the
+viewer when there is none. The viewer's panda3d has to read the bam version egg2bam writes.
+
+Usage:
+    python MayaPandaViewer.py [--port 47810] model.bam ...
+
+This module does not import pymel, and only imports panda3d in the viewer process.
+"""
+
+import argparse
+import json
+import os
+import select
+import socket
+import subprocess
+import sys
+import time
+
+PORT_ENV = "MP_PY_VIEWER_PORT"
+PYTHON_ENV = "MP_PY_VIEWER_PYTHON"
+DEFAULT_PORT = 47810
+# Seconds between checks of the shown files' modification times
+POLL_INTERVAL = 0.25
+
+
+def default_port():
+    return int(os.environ.get(PORT_ENV) or DEFAULT_PORT)
+
+
+def default_python():
+    """
+    Returns the Python that runs the viewer, which can be overridden with the MP_PY_VIEWER_PYTHON environment variable.
+    """
+    return os.environ.get(PYTHON_ENV) or ("ppython" if os.name == "nt" else "python3")
+
+
+def default_log_file():
+    return os.path.join(os.path.expanduser("~"), ".mayapanda", "viewer.log")
+
+
+class ViewerClient(object):
+    """
+    Sends files to the live viewer, starting it when it is not running.
+    """
+
+    def __init__(self, python_exe=None, port=None, startup_timeout=5.0):
+        self.python_exe = python_exe or default_python()
+        self.port = port or default_port()
+        self.startup_timeout = startup_timeout
+        # The viewer this client started, if any
+        self.process = None
+
+    def send(self, message):
+        """
+        :return: Whether a running viewer took the message.
+        """
+        try:
+            with socket.create_connection(("127.0.0.1", self.port), timeout = 0.5) as connection:
+                connection.sendall((json.dumps(message) + "\n").encode())
+            return True
+        except OSError:
+            return False
+
+    def starting(self):
+        return self.process is not None and self.process.poll() is None
+
+    def show(self, path):
+        """
+        Shows a file in the viewer, reloading it if it is already shown.
+
+        :return: "sent" when a running viewer took it, "launched" when a new viewer was started with it.
+        """
+        path = os.path.abspath(path)
+        if self.send({"show": path}):
+            return "sent"
+        if self.starting():
+            # Started by an earlier export and still loading panda3d
+            deadline = time.time() + self.startup_timeout
+            while time.time() < deadline and self.starting():
+                time.sleep(0.1)
+                if self.send({"show": path}):
+                    return "sent"
+        self.launch([path])
+        return "launched"
+
+    def launch(self, paths=()):
+        """
+        Starts a viewer detached from this process, its output goes to ~/.mayapanda/viewer.log.
+        """
+        log_file = default_log_file()
+        os.makedirs(os.path.dirname(log_file), exist_ok = True)
+        kwargs = {}
+        if os.name == "nt":
+            kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+        with open(log_file, "ab") as log:
+            self.process = subprocess.Popen(
+                [self.python_exe, os.path.abspath(__file__), "--port", str(self.port)] + list(paths),
+                stdin = subprocess.DEVNULL,
+                stdout = log,
+                stderr = subprocess.STDOUT,
+                **kwargs
+            )
+        return self.process
+
+    def close(self):
+        """
+        :return: Whether a viewer was running.
+        """
+        self.process = None
+        return self.send({"quit": True})
+
+
+class MessageServer(object):
+    """
+    Non-blocking localhost listener, polled once a frame by the viewer.
+    """
+
+    def __init__(self, port):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(("127.0.0.1", port))
+        self.listener.listen(8)
+        self.listener.setblocking(False)
+        # connection -> bytes received so far
+        self.connections = {}
+
+    def accept(self):
+        while True:
+            try:
+                connection, _ = self.listener.accept()
+            except BlockingIOError:
+                return
+            connection.setblocking(False)
+            self.connections[connection] = b""
+
+    def poll(self):
+        """
+        :return: The complete messages received since the last poll.
+        """
+        messages = []
+        readable, _, _ = select.select([self.listener] + list(self.connections), [], [], 0)
+        for ready in readable:
+            if ready is self.listener:
+                self.accept()
+                continue
+            try:
+                data = ready.recv(65536)
+            except OSError:
+                # Reset by the client, e.g. Maya quitting in the middle of a message
+                ready.close()
+                del self.connections[ready]
+                continue
+            buffer = self.connections[ready] + data
+            *lines, buffer = buffer.split(b"\n")
+            self.connections[ready] = buffer
+            for line in lines:
+                try:
+                    messages.append(json.loads(line.decode()))
+                except ValueError:
+                    print(f"Ignoring message {line!r}")
+            if not data:
+                ready.close()
+                del self.connections[ready]
+        return messages
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+        self.listener.close()
+
+
+class ModelViewer(object):
+    """
+    The models shown in the viewer, reloaded one by one when their file changes.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        # path -> [NodePath, modification time]
+        self.models = {}
+        # texture file -> modification time it was read at
+        self.texture_times = {}
+        self.changed_at = {}
+
+    def show(self, path):
+        from panda3d.core import Filename
+
+        start = time.perf_counter()
+        try:
+            mtime = os.path.getmtime(path)
+            # Only the model is read from disk again, unchanged textures come from the texture pool
+            model = self.base.loader.loadModel(Filename.fromOsSpecific(path), noCache = True)
+        except Exception as error:
+            print(f"Could not load {path}: {error}")
+            return
+        self.reload_changed_textures(model)
+        first = not self.models
+        if path in self.models:
+            self.models[path][0].removeNode()
+        model.reparentTo(self.base.render)
+        self.models[path] = [model, mtime]
+        self.changed_at.pop(path, None)
+        if first:
+            self.center()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Loaded {path} in {elapsed:.0f} ms")
+        self.set_title(f"{os.path.basename(path)} - loaded in {elapsed:.0f} ms")
+
+    def reload_changed_textures(self, model):
+        for texture in model.findAllTextures():
+            texture_file = texture.getFullpath().toOsSpecific()
+            try:
+                mtime = os.path.getmtime(texture_file)
+            except OSError:
+                continue
+            if texture_file in self.texture_times and self.texture_times[texture_file] != mtime:
+                texture.reload()
+            self.texture_times[texture_file] = mtime
+
+    def clear(self):
+        for model, _ in self.models.values():
+            model.removeNode()
+        self.models.clear()
+
+    def center(self):
+        # Like pview -c: look at everything shown from far enough away
+        bounds = self.base.render.getBounds()
+        if bounds.isEmpty():
+            return
+        center = bounds.getCenter()
+        radius = max(bounds.getRadius(), 0.01)
+        self.base.trackball.node().setOrigin(center)
+        self.base.trackball.node().setPos(0, radius * 3, 0)
+        self.base.trackball.node().setHpr(0, 0, 0)
+
+    def poll_files(self):
+        """
+        Reloads the shown files whose modification time changed, once it has stayed the same for
+        one poll, so a file that is still being written is not read.
+        """
+        for path, (_, loaded_mtime) in list(self.models.items()):
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if mtime == loaded_mtime:
+                continue
+            if self.changed_at.get(path) == mtime:
+                self.show(path)
+            else:
+                self.changed_at[path] = mtime
+
+    def set_title(self, title):
+        from panda3d.core import WindowProperties
+
+        if self.base.win is not None:
+            properties = WindowProperties()
+            properties.setTitle(f"Panda Live Preview - {title}")
+            self.base.win.requestProperties(properties)
+
+
+def run_viewer(port, paths=()):
+    from direct.showbase.ShowBase import ShowBase
+    from panda3d.core import AmbientLight, DirectionalLight, loadPrcFileData
+
+    loadPrcFileData("", "window-title Panda Live Preview")
+    try:
+        server = MessageServer(port)
+    except OSError as error:
+        # Another viewer already has the port, hand it the files instead
+        client = ViewerClient(port = port)
+        if all(client.send({"show": os.path.abspath(path)}) for path in paths):
+            return 0
+        print(f"Could not listen on port {port}: {error}")
+        return 1
+
+    base = ShowBase()
+    base.setBackgroundColor(0.3, 0.3, 0.3)
+    # Default lighting, like pview -l
+    ambient = base.render.attachNewNode(AmbientLight("ambient"))
+    ambient.node().setColor((0.3, 0.3, 0.3, 1))
+    sun = base.render.attachNewNode(DirectionalLight("sun"))
+    sun.setHpr(30, -45, 0)
+    base.render.setLight(ambient)
+    base.render.setLight(sun)
+
+    viewer = ModelViewer(base)
+    base.accept("c", viewer.center)
+    base.accept("escape", sys.exit)
+    for path in paths:
+        viewer.show(os.path.abspath(path))
+
+    def handle_messages(task):
+        for message in server.poll():
+            if message.get("show"):
+                viewer.show(message["show"])
+            elif message.get("clear"):
+                viewer.clear()
+            elif message.get("quit"):
+                sys.exit(0)
+        return task.cont
+
+    def poll_files(task):
+        viewer.poll_files()
+        return task.again
+
+    base.taskMgr.add(handle_messages, "MP_PY_ViewerMessages")
+    base.taskMgr.doMethodLater(POLL_INTERVAL, poll_files, "MP_PY_ViewerFiles")
+    try:
+        base.run()
+    finally:
+        server.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Panda live preview: shows egg and bam files, reloading them when they change.")
+    parser.add_argument("files", nargs = "*", help = "Egg or bam files to show")
+    parser.add_argument("--port", type = int, default = default_port(), help = "Localhost port to listen on")
+    options = parser.parse_args(argv)
+    return run_viewer(options.port, options.files)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+"""
+Conversion worker: one long-lived panda3d process that converts .egg files to .bam.
+
+Every egg2bam run starts a new process that loads the Panda3D libraries, parses the PRC files and
+reads every texture again, which takes far longer than converting a small prop. The worker is this
+file run with a Python that has panda3d (the live preview's, see default_python in
+MayaPandaViewer.py). It reads each egg with EggData, loads it with loadEggData and writes it with
+BamFile. PRC files are read once, and textures stay in the TexturePool between conversions. A
+texture is only read again when its file changed.
+
+Requests go to the worker's stdin and replies come back on its stdout, one JSON message per line:
+
+    {"id": 1, "egg": "/path/prop.egg", "bam": "/path/prop.bam", "rawtex": false, ...}
+    {"id": 1, "ok": true, "log": "...", "elapsed": 0.004}
+
+A request holds the egg2bam options of the exporter window, see egg2bam_options in
+MayaPandaSettings.py. The worker writes the bam version of its own panda3d, so it is only used
+for the "Default" bam version. Every other version still runs its own egg2bam.
+
+WorkerJob is a ConversionJob that runs in the worker, so the job runner and the batch converter
+schedule it like an egg2bam job. When the worker cannot be started, or exits before it answers,
+the job runs egg2bam instead. The worker's own output goes to ~/.mayapanda/worker.log.
+
+Usage, to convert files in a worker without Maya:
+    python MayaPandaWorker.py --convert prop.egg ...
+
+This module does not import pymel, and only imports panda3d in the worker process.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from MayaPandaJobs import ConversionJob
+from MayaPandaSettings import egg2bam_command, egg2bam_options
+from MayaPandaViewer import default_python
+
+# The only bam version the worker writes, the one of its own panda3d
+WORKER_BAM_VERSION = "Default"
+
+
+def default_log_file():
+    return os.path.join(os.path.expanduser("~"), ".mayapanda", "worker.log")
+
+
+class WorkerClient(object):
+    """
+    Starts the conversion worker on first use and hands it requests. Replies are read on a
+    background thread, so checking for one never blocks.
+    """
+
+    def __init__(self, command=None, on_reply=None):
+        """
+        :param command: Command line starting the worker, this file run with default_python() if not given.
+        :param on_reply: Called on the reader thread whenever a reply arrives, e.g. AsyncJobRunner.wake,
+                         so the jobs waiting on the worker are polled without waiting for the next interval.
+        """
+        self.command = command or [default_python(), os.path.abspath(__file__)]
+        self.on_reply = on_reply
+        self.process = None
+        # Why the worker cannot be used, once it failed to start
+        self.unavailable = ""
+        # The worker's ready message, with its panda3d and bam versions
+        self.info = {}
+        # request id -> the worker process it was sent to
+        self._pending = {}
+        self._replies = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        log_file = default_log_file()
+        os.makedirs(os.path.dirname(log_file), exist_ok = True)
+        kwargs = {"creationflags": subprocess.CREATE_NO_WINDOW} if os.name == "nt" else {}
+        with open(log_file, "ab") as log:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin = subprocess.PIPE,
+                stdout = subprocess.PIPE,
+                stderr = log,
+                **kwargs
+            )
+        self.info = {}
+        threading.Thread(
+            target = self._read, args = (self.process,), name = "MayaPandaWorkerReader", daemon = True
+        ).start()
+        return self.process
+
+    def submit(self, request):
+        """
+        Sends a conversion request, starting the worker if it is not running.
+
+        :param request: Dictionary from egg2bam_options.
+        :return: The id to collect the reply with, or None when the worker cannot be used.
+        """
+        with self._lock:
+            if self.unavailable:
+                return None
+            if not self.running():
+                try:
+                    self.start()
+                except OSError as error:
+                    self.unavailable = f"Could not start the conversion worker {self.command[0]}: {error}"
+                    return None
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self.process.stdin.write((json.dumps(dict(request, id = request_id)) + "\n").encode())
+                self.process.stdin.flush()
+            except OSError:
+                return None
+            self._pending[request_id] = self.process
+        return request_id
+
+    def result(self, request_id):
+        """
+        :return: The reply to a request, or None while the worker is still on it. A reply with
+                 "exited" set means the worker went away before it answered.
+        """
+        with self._lock:
+            return self._replies.pop(request_id, None)
+
+    def discard(self, request_id):
+        """
+        Drops the reply to a request. The worker still finishes a conversion it has started.
+        """
+        with self._lock:
+            self._pending.pop(request_id, None)
+            self._replies.pop(request_id, None)
+
+    def close(self):
+        """
+        :return: Whether a worker was running.
+        """
+        with self._lock:
+            process, self.process = self.process, None
+            self.unavailable = ""
+        if process is None or process.poll() is not None:
+            return False
+        try:
+            process.stdin.write(b'{"quit": true}\n')
+            process.stdin.close()
+        except OSError:
+            pass
+        return True
+
+    def _read(self, process):
+        for line in process.stdout:
+            try:
+                message = json.loads(line.decode())
+            except ValueError:
+                continue
+            with self._lock:
+                if message.get("ready"):
+                    self.info = message
+                elif self._pending.pop(message.get("id"), None) is not None:
+                    self._replies[message["id"]] = message
+            if self.on_reply is not None:
+                self.on_reply()
+        returncode = process.wait()
+        with self._lock:
+            if process is self.process:
+                if not self.info:
+                    self.unavailable = (
+                        f"The conversion worker exited with code {returncode} on startup, see {default_log_file()}"
+                    )
+                self.process = None
+            for request_id in [request_id for request_id, sent_to in self._pending.items() if sent_to is process]:
+                del self._pending[request_id]
+                self._replies[request_id] = {
+                    "id": request_id,
+                    "ok": False,
+                    "exited": True,
+                    "error": f"The conversion worker exited with code {returncode}",
+                }
+        if self.on_reply is not None:
+            self.on_reply()
+
+
+@dataclass
+class WorkerJob(ConversionJob):
+    """
+    Converts one egg in the conversion worker. Its command is the egg2bam command line, which
+    runs instead when the worker cannot be used.
+    """
+    request: Dict = field(default_factory = lambda: dict())
+    worker: Optional[WorkerClient] = None
+
+    # Runtime state
+    _request_id = None
+
+    def start(self):
+        self._request_id = self.worker.submit(self.request) if self.worker is not None else None
+        if self._request_id is None:
+            super().start()
+            return
+        self._start_time = self._step_start_time = time.time()
+        self.step_times = []
+
+    def poll(self):
+        if self.finished or self._request_id is None:
+            return super().poll()
+        reply = self.worker.result(self._request_id)
+        if reply is None:
+            return False
+        self._request_id = None
+        if reply.get("exited"):
+            self.stderr += f"{reply['error']}, converting with egg2bam instead\n"
+            self._step = 0
+            self._launch()
+            return False
+        self.stdout += reply.get("log", "")
+        if not reply["ok"]:
+            self.stderr += reply.get("error", "") + "\n"
+        self.step_times.append(time.time() - self._step_start_time)
+        self._finish(0 if reply["ok"] else 1)
+        return True
+
+    def cancel(self):
+        if self.finished or self._request_id is None:
+            super().cancel()
+            return
+        self.worker.discard(self._request_id)
+        self._request_id = None
+        self.cancelled = True
+        self.step_times.append(time.time() - self._step_start_time)
+        self._finish(-1)
+
+
+def egg2bam_job(settings, egg_file, export_mode=0, worker=None, name=""):
+    """
+    Builds the job converting an .egg file to .bam: a WorkerJob when a worker is given and the
+    settings ask for it, else a ConversionJob running egg2bam.
+
+    :param settings: The ExportSettings snapshot.
+    :param export_mode: See egg2bam_command.
+    :param worker: The WorkerClient to convert in.
+    :param name: Job name, the bam file's name if not given.
+    :return: A tuple of (job, bam file path).
+    """
+    cmd, bam_file = egg2bam_command(settings, egg_file, export_mode)
+    name = name or os.path.basename(bam_file)
+    if worker is not None and settings.conversion_worker and settings.bam_version == WORKER_BAM_VERSION:
+        request = egg2bam_options(settings, egg_file, export_mode)
+        return WorkerJob(name, [cmd], [bam_file], request = request, worker = worker), bam_file
+    return ConversionJob(name, [cmd], [bam_file]), bam_file
+
+
+class EggConverter(object):
+    """
+    The worker's side: converts requests one at a time, keeping loaded textures between them.
+    """
+
+    def __init__(self):
+        from panda3d.core import LineStream, Notify
+
+        # texture file -> modification time it was read at
+        self.texture_times = {}
+        # Panda's messages of a conversion are sent back in its reply
+        self.messages = LineStream()
+        Notify.ptr().setOstreamPtr(self.messages, False)
+
+    def convert(self, request):
+        """
+        Converts the egg of a request the way egg2bam does with the same options.
+
+        :raises ValueError: With the reason the conversion failed.
+        """
+        from panda3d.core import BamFile, BamWriter, ConfigVariableBool, DSearchPath, Filename, NodePath
+        from panda3d.egg import EggData, loadEggData
+
+        egg_file = request["egg"]
+        bam_file = request["bam"]
+        if not request.get("overwrite", True) and os.path.exists(bam_file):
+            raise ValueError(f"{bam_file} already exists")
+
+        search_path = DSearchPath()
+        for directory in [os.path.dirname(egg_file)] + list(request.get("search_path", [])):
+            search_path.appendDirectory(Filename.fromOsSpecific(directory))
+        egg = EggData()
+        egg.setAutoResolveExternals(True)
+        if not egg.read(Filename.fromOsSpecific(egg_file)):
+            raise ValueError(f"Could not read {egg_file}")
+        egg.resolveFilenames(search_path)
+        if request.get("path_directory"):
+            self.store_textures(egg, request["path_directory"], request.get("copy_directory", ""))
+
+        # egg2bam only flattens with -flatten, the loader's own default is to flatten
+        ConfigVariableBool("egg-flatten").setValue(bool(request.get("flatten")))
+        node = loadEggData(egg)
+        if node is None:
+            raise ValueError(f"Could not load {egg_file}")
+        self.reload_changed_textures(NodePath(node))
+
+        os.makedirs(os.path.dirname(os.path.abspath(bam_file)), exist_ok = True)
+        bam = BamFile()
+        if not bam.openWrite(Filename.fromOsSpecific(bam_file)):
+            raise ValueError(f"Could not write {bam_file}")
+        if request.get("rawtex"):
+            bam.getWriter().setFileTextureMode(BamWriter.BTM_rawdata)
+        elif request.get("path_directory"):
+            # store_textures already made the paths what they should be
+            bam.getWriter().setFileTextureMode(BamWriter.BTM_unchanged)
+        written = bam.writeObject(node)
+        bam.close()
+        if not written:
+            raise ValueError(f"Could not write {bam_file}")
+
+    def store_textures(self, egg, path_directory, copy_directory=""):
+        """
+        Like egg2bam -ps rel -pd path_directory [-pc copy_directory]: copies the textures to
+        copy_directory, and stores their paths relative to path_directory.
+        """
+        from panda3d.core import Filename
+        from panda3d.egg import EggTextureCollection
+
+        textures = EggTextureCollection()
+        textures.findUsedTextures(egg)
+        for index in range(textures.getNumTextures()):
+            texture = textures.getTexture(index)
+            slots = [(texture.getFullpath, texture.setFilename, texture.setFullpath)]
+            if texture.hasAlphaFilename():
+                slots.append((texture.getAlphaFullpath, texture.setAlphaFilename, texture.setAlphaFullpath))
+            for get_fullpath, set_filename, set_fullpath in slots:
+                source = get_fullpath().toOsSpecific()
+                target = source
+                if copy_directory:
+                    target = os.path.join(copy_directory, os.path.basename(source))
+                    stale = not os.path.exists(target) or os.path.getmtime(source) > os.path.getmtime(target)
+                    if os.path.isfile(source) and stale:
+                        os.makedirs(copy_directory, exist_ok = True)
+                        shutil.copy2(source, target)
+                set_filename(Filename.fromOsSpecific(os.path.relpath(target, path_directory)))
+                set_fullpath(Filename.fromOsSpecific(target))
+
+    def reload_changed_textures(self, model):
+        # Textures come from the TexturePool, which does not notice a file that changed since
+        for texture in model.findAllTextures():
+            texture_file = texture.getFullpath().toOsSpecific()
+            try:
+                mtime = os.path.getmtime(texture_file)
+            except OSError:
+                continue
+            if texture_file in self.texture_times and self.texture_times[texture_file] != mtime:
+                texture.reload()
+            self.texture_times[texture_file] = mtime
+
+    def log(self):
+        lines = []
+        while self.messages.isTextAvailable():
+            lines.append(self.messages.getLine())
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def run_worker(requests, replies):
+    """
+    Converts the requests read from requests, one JSON message per line, until it ends or a quit
+    message arrives. Every request gets a reply written to replies.
+    """
+    from panda3d.core import BamFile, PandaSystem
+
+    def reply(message):
+        replies.write(json.dumps(message) + "\n")
+        replies.flush()
+
+    converter = EggConverter()
+    reply({
+        "ready": True,
+        "panda3d": PandaSystem.getVersionString(),
+        "bam_version": f"{BamFile().getCurrentMajorVer()}.{BamFile().getCurrentMinorVer()}",
+    })
+    for line in requests:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            print(f"Ignoring request {line!r}")
+            continue
+        if request.get("quit"):
+            break
+        start = time.perf_counter()
+        try:
+            converter.convert(request)
+            message = {"id": request.get("id"), "ok": True}
+        except Exception as error:
+            message = {"id": request.get("id"), "ok": False, "error": str(error)}
+        message["log"] = converter.log()
+        message["elapsed"] = time.perf_counter() - start
+        reply(message)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Panda conversion worker: converts .egg files to .bam in one process.")
+    parser.add_argument("--convert", nargs = "+", default = [], help = "Convert these egg files and exit, next to each egg")
+    options = parser.parse_args(argv)
+
+    if options.convert:
+        from MayaPandaSettings import ExportSettings
+
+        lines = [
+            json.dumps(dict(egg2bam_options(ExportSettings(), os.path.abspath(egg_file)), id = position))
+            for position, egg_file in enumerate(options.convert)
+        ]
+        return run_worker(lines, sys.stdout)
+
+    # stdout carries the replies, anything else printed goes to stderr
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return run_worker(sys.stdin, replies)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Stand-in for maya2egg, egg2bam and bam2egg that writes a synthetic output file instead of converting anything.
+
+    python fake_panda_tool.py maya2egg [maya2egg arguments...]
+    python fake_panda_tool.py egg2bam [egg2bam arguments...]
+    python fake_panda_tool.py bam2egg [bam2egg arguments...]
+    python fake_panda_tool.py worker
+
+worker answers the requests of the conversion worker (see MayaPandaWorker.py) from stdin, writing
+the same bam as egg2bam for each.
+
+The egg is a grid of quads in one vertex pool. Its size comes from the MP_PY_BENCH_EGG_VERTICES
+environment variable, and MP_PY_BENCH_TOOL_DELAY adds a fixed conversion time in seconds.
+write_tool_scripts() creates executables named like the real tools that run this script.
+"""
+
+import json
+import os
+import stat
+import sys
+import time
+
+EGG_VERTICES_ENV = "MP_PY_BENCH_EGG_VERTICES"
+TOOL_DELAY_ENV = "MP_PY_BENCH_TOOL_DELAY"
+DEFAULT_EGG_VERTICES = 1024
+
+
+def synthetic_egg(name, vertex_count):
+    """
+    Returns egg text with a square grid of about vertex_count vertices and one quad per grid cell.
+    """
+    side = max(2, int(vertex_count ** 0.5))
+    lines = [
+        "<CoordinateSystem> { Y-up }",
+        "",
+        f"<Group> {name} {{",
+        f"  <VertexPool> {name}.verts {{",
+    ]
+    for row in range(side):
+        for column in range(side):
+            index = row * side + column
+            lines.append(f"    <Vertex> {index} {{ {column}.0 0.0 {row}.0 <UV> {{ {column / side:.4f} {row / side:.4f} }} }}")
+    lines.append("  }")
+    for row in range(side - 1):
+        for column in range(side - 1):
+            first = row * side + column
+            lines.append(
+                f"  <Polygon> {{ <VertexRef> {{ {first} {first + 1} {first + side + 1} {first + side} "
+                f"<Ref> {{ {name}.verts }} }} }}"
+            )
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def output_file(tool, args):
+    """
+    Finds the output file in a maya2egg, egg2bam or bam2egg command line, as built by MayaPandaSettings
+    and MayaPandaImport.
+    """
+    if "-o" in args:
+        return args[args.index("-o") + 1]
+    # Without -o, maya2egg and bam2egg take "input output" and egg2bam takes "output input"
+    return args[-2] if tool == "egg2bam" else args[-1]
+
+
+def write_bam(output, egg):
+    with open(output, "wb") as handle:
+        handle.write(b"pbj\0\n\r")
+        handle.write(os.urandom(max(16, os.path.getsize(egg) // 4) if os.path.exists(egg) else 16))
+
+
+def run_worker(requests, replies):
+    replies.write(json.dumps({"ready": True, "panda3d": "fake", "bam_version": "6.45"}) + "\n")
+    replies.flush()
+    for line in requests:
+        request = json.loads(line)
+        if request.get("quit"):
+            break
+        time.sleep(float(os.environ.get(TOOL_DELAY_ENV, 0)))
+        write_bam(request["bam"], request["egg"])
+        replies.write(json.dumps({"id": request["id"], "ok": True, "log": "", "elapsed": 0.0}) + "\n")
+        replies.flush()
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tool, args = argv[0], argv[1:]
+    if tool == "worker":
+        return run_worker(sys.stdin, sys.stdout)
+    output = output_file(tool, args)
+    time.sleep(float(os.environ.get(TOOL_DELAY_ENV, 0)))
+
+    name = os.path.splitext(os.path.basename(output))[0]
+    if tool in ("maya2egg", "bam2egg"):
+        with open(output, "w") as handle:
+            handle.write(synthetic_egg(name, int(os.environ.get(EGG_VERTICES_ENV, DEFAULT_EGG_VERTICES))))
+    else:
+        write_bam(output, args[-1])
+    return 0
+
+
+def write_tool_scripts(directory):
+    """
+    Writes maya2egg, egg2bam and bam2egg executables into directory that run this script with the current interpreter.
+
+    :return: A dictionary of tool name to executable path.
+    """
+    os.makedirs(directory, exist_ok = True)
+    tools = {}
+    for tool in ("maya2egg", "egg2bam", "bam2egg"):
+        path = os.path.join(directory, tool)
+        with open(path, "w") as handle:
+            handle.write(f"#!/bin/sh\nexec \"{sys.executable}\" \"{os.path.abspath(__file__)}\" {tool} \"$@\"\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        tools[tool] = path
+    return tools
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,528 @@
+"""
+Stand-in for pymel.core, maya.api.OpenMaya and maya.utils, so the exporter can be imported and benchmarked with plain CPython.
+
+Every command costs a fixed per-call overhead (a busy wait, the default is a rough figure for a
+pymel round trip into Maya) and is counted, so benchmarks report both the time and the number of
+Maya calls a function makes. Commands the exporter depends on (ls, select, objExists, addAttr,
+getAttr, setAttr, file, ...) work on a small in-memory scene; every other command just returns
+a value that lets the exporter's UI code run.
+
+Call install() before importing MayaPandaUI.
+"""
+
+import fnmatch
+import os
+import sys
+import time
+import types
+
+from collections import Counter
+
+DEFAULT_OVERHEAD_US = 20.0
+
+
+class StandInState(object):
+    def __init__(self):
+        self.overhead = DEFAULT_OVERHEAD_US / 1e6
+        self.calls = Counter()
+        self.reset_scene()
+
+    def reset_scene(self, scene_name=""):
+        self.scene_name = scene_name
+        # node long name -> {attribute: value}
+        self.nodes = {}
+        # node long name -> {attribute: enumName text}
+        self.enums = {}
+        self.selection = []
+        self.windows = set()
+        self.modified = False
+        # callback id -> (node, function, client data) of om.MNodeMessage.addAttributeChangedCallback
+        self.callbacks = {}
+        # node -> its callback ids
+        self.node_callbacks = {}
+        self.last_callback_id = 0
+
+    def reset_calls(self):
+        self.calls.clear()
+
+
+STATE = StandInState()
+
+
+def _spin():
+    if STATE.overhead <= 0:
+        return
+    end = time.perf_counter() + STATE.overhead
+    while time.perf_counter() < end:
+        pass
+
+
+class UIElement(str):
+    """
+    Name of a control or layout. Layouts are used as context managers by the exporter.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def setHeight(self, value):
+        STATE.calls["setHeight"] += 1
+        _spin()
+
+    def setWidth(self, value):
+        STATE.calls["setWidth"] += 1
+        _spin()
+
+
+def new_scene(node_count, scene_name="/tmp/mp_py_bench/bench.mb"):
+    """
+    Replaces the scene with node_count transforms, all of them selected, and saves it to scene_name.
+
+    :return: The long names of the nodes.
+    """
+    STATE.reset_scene(scene_name)
+    for index in range(node_count):
+        node = f"|pCube{index}"
+        STATE.nodes[node] = {}
+        STATE.enums[node] = {}
+    STATE.selection = list(STATE.nodes)
+    _write_scene(scene_name, STATE.nodes)
+    return list(STATE.nodes)
+
+
+def _write_scene(path, nodes):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+    with open(path, "w") as handle:
+        handle.write("//Maya ASCII stand-in\n")
+        for node in nodes:
+            handle.write(f"createNode transform -n \"{node}\";\n")
+
+
+# region Scene commands
+
+def _resolve(name):
+    name = str(name)
+    if name in STATE.nodes:
+        return name
+    long_name = "|" + name
+    if long_name in STATE.nodes:
+        return long_name
+    for node in STATE.nodes:
+        if node.endswith("|" + name):
+            return node
+    return None
+
+
+def _split(path):
+    node, _, attr = str(path).partition(".")
+    return _resolve(node), attr
+
+
+def _resolve_plug(name):
+    node, attr = _split(name)
+    if node is None or attr not in STATE.nodes[node]:
+        return None
+    return f"{node}.{attr}"
+
+
+def _match_plugs(pattern):
+    node_pattern, _, attr_pattern = str(pattern).partition(".")
+    return [
+        f"{node}.{attr}"
+        for node, attrs in STATE.nodes.items()
+        if fnmatch.fnmatchcase(node.split("|")[-1], node_pattern)
+        for attr in attrs
+        if fnmatch.fnmatchcase(attr, attr_pattern)
+    ]
+
+
+def _resolve_names(name):
+    if "*" in str(name):
+        return _match_plugs(name)
+    plug = _resolve_plug(name) if "." in str(name) else _resolve(name)
+    return [plug] if plug else []
+
+
+def _ls(*args, **kwargs):
+    if kwargs.get("selection") or kwargs.get("sl"):
+        nodes = list(STATE.selection)
+    elif args:
+        names = args[0] if isinstance(args[0], (list, tuple)) else args
+        nodes = [node for name in names for node in _resolve_names(name)]
+    else:
+        nodes = list(STATE.nodes)
+    if kwargs.get("long") or kwargs.get("l"):
+        return nodes
+    return [node.split("|")[-1] for node in nodes]
+
+
+def _select(*args, **kwargs):
+    if kwargs.get("clear") or kwargs.get("cl"):
+        STATE.selection = []
+        return
+    names = args[0] if args and isinstance(args[0], (list, tuple)) else args
+    nodes = [node for node in map(_resolve, names) if node]
+    if kwargs.get("add"):
+        STATE.selection.extend(node for node in nodes if node not in STATE.selection)
+    else:
+        STATE.selection = nodes
+
+
+def _obj_exists(path):
+    node, attr = _split(path)
+    if node is None:
+        return False
+    return not attr or attr in STATE.nodes[node]
+
+
+def _add_attr(*args, **kwargs):
+    if kwargs.get("edit") or kwargs.get("e"):
+        node, attr = _split(args[0])
+        if kwargs.get("enumName") is not None:
+            STATE.enums[node][attr] = kwargs["enumName"]
+        STATE.modified = True
+        return
+    node = _resolve(args[0])
+    attr = kwargs.get("ln") or kwargs.get("longName")
+    if (kwargs.get("dataType") or kwargs.get("dt")) == "stringArray":
+        STATE.nodes[node][attr] = []
+    else:
+        STATE.nodes[node][attr] = kwargs.get("defaultValue", kwargs.get("dv", 0))
+    STATE.modified = True
+    if kwargs.get("enumName") is not None:
+        STATE.enums[node][attr] = kwargs["enumName"]
+    _attribute_changed(node, attr, MNodeMessage.kAttributeAdded)
+
+
+def _attribute_changed(node, attr, message):
+    for callback_id in list(STATE.node_callbacks.get(node, ())):
+        _, function, client_data = STATE.callbacks[callback_id]
+        function(message, MPlug(node, attr), None, client_data)
+
+
+def _get_attr(path, **kwargs):
+    node, attr = _split(path)
+    value = STATE.nodes[node][attr]
+    if kwargs.get("asString") and attr in STATE.enums[node]:
+        return _enum_fields(STATE.enums[node][attr])[value]
+    return value
+
+
+def _enum_fields(text):
+    fields = {}
+    value = 0
+    for field in text.split(":"):
+        name, separator, explicit = field.partition("=")
+        value = int(explicit) if separator else value
+        fields[value] = name
+        value += 1
+    return fields
+
+
+def _set_attr(path, value, *values, **kwargs):
+    node, attr = _split(path)
+    if kwargs.get("type") == "stringArray":
+        # setAttr plug count value...
+        value = list(values[:value])
+    STATE.nodes[node][attr] = value
+    STATE.modified = True
+    _attribute_changed(node, attr, MNodeMessage.kAttributeSet)
+
+
+def _delete_attr(*args, **kwargs):
+    if kwargs.get("attribute"):
+        # deleteAttr -attribute deletes it from every node given
+        plugs = [(_resolve(name), kwargs["attribute"]) for name in args]
+    else:
+        plugs = [_split(args[0])]
+    for node, attr in plugs:
+        if node is None or attr not in STATE.nodes[node]:
+            raise RuntimeError(f"No attribute {attr} on {node}")
+    for node, attr in plugs:
+        STATE.nodes[node].pop(attr, None)
+        STATE.enums[node].pop(attr, None)
+        STATE.modified = True
+        _attribute_changed(node, attr, MNodeMessage.kAttributeRemoved)
+
+
+def _list_attr(*args, **kwargs):
+    # Stand-in nodes only hold user-defined attributes
+    names = args[0] if args and isinstance(args[0], (list, tuple)) else args
+    nodes = [node for node in map(_resolve, names) if node]
+    return [attr for node in nodes for attr in STATE.nodes[node]] or None
+
+
+def _attribute_query(attr, **kwargs):
+    node = _resolve(kwargs.get("node") or kwargs.get("n"))
+    if kwargs.get("listEnum") or kwargs.get("le"):
+        return [STATE.enums[node].get(attr, "")]
+    return node is not None and attr in STATE.nodes[node]
+
+
+def _file(*args, **kwargs):
+    if kwargs.get("query") or kwargs.get("q"):
+        if kwargs.get("sceneName") or kwargs.get("sn"):
+            return STATE.scene_name
+        if kwargs.get("modified"):
+            return STATE.modified
+        return None
+    if "modified" in kwargs:
+        STATE.modified = bool(kwargs["modified"])
+        return None
+    if kwargs.get("exportSelected") or kwargs.get("es") or kwargs.get("exportAll") or kwargs.get("ea"):
+        nodes = STATE.selection if kwargs.get("exportSelected") or kwargs.get("es") else list(STATE.nodes)
+        _write_scene(args[0], nodes)
+        return args[0]
+    return None
+
+
+def _undo_info(*args, **kwargs):
+    if kwargs.get("query") or kwargs.get("q"):
+        return True
+    return None
+
+
+def _window(*args, **kwargs):
+    name = args[0] if args else f"window{len(STATE.windows)}"
+    if kwargs.get("exists") or kwargs.get("ex"):
+        return name in STATE.windows
+    if kwargs.get("query") or kwargs.get("q") or kwargs.get("edit") or kwargs.get("e"):
+        return None
+    STATE.windows.add(name)
+    return UIElement(name)
+
+
+def _delete_ui(*args, **kwargs):
+    for name in args:
+        STATE.windows.discard(name)
+
+
+SCENE_COMMANDS = {
+    "ls": _ls,
+    "select": _select,
+    "objExists": _obj_exists,
+    "addAttr": _add_attr,
+    "getAttr": _get_attr,
+    "setAttr": _set_attr,
+    "deleteAttr": _delete_attr,
+    "listAttr": _list_attr,
+    "attributeQuery": _attribute_query,
+    "file": _file,
+    "window": _window,
+    "workspaceControl": _window,
+    "deleteUI": _delete_ui,
+    "undoInfo": _undo_info,
+    "sceneName": lambda *args, **kwargs: STATE.scene_name,
+    "about": lambda *args, **kwargs: False,
+}
+
+MEL_PROCEDURES = {
+    "attributeExists": lambda attr, node: _obj_exists(f"{node}.{attr}"),
+    "basenameEx": lambda path: os.path.splitext(os.path.basename(str(path)))[0],
+    "dirname": lambda path: os.path.dirname(str(path)),
+    "getApplicationVersionAsFloat": lambda: 2022.0,
+    "substituteAllString": lambda text, old, new: str(text).replace(old, new),
+}
+
+# endregion
+
+
+def _default(name, args, kwargs):
+    if kwargs.get("query") or kwargs.get("q"):
+        return None
+    if kwargs.get("edit") or kwargs.get("e") or kwargs.get("exists") or kwargs.get("ex"):
+        return None
+    if args and isinstance(args[0], str):
+        return UIElement(args[0])
+    return UIElement(name)
+
+
+class Command(object):
+    def __init__(self, name, impl=None, prefix=""):
+        self.name = name
+        self.impl = impl
+        self.key = prefix + name
+
+    def __call__(self, *args, **kwargs):
+        STATE.calls[self.key] += 1
+        _spin()
+        if self.impl is not None:
+            return self.impl(*args, **kwargs)
+        return _default(self.name, args, kwargs)
+
+
+class CommandModule(types.ModuleType):
+    """
+    Module whose every attribute is a counted command.
+    """
+
+    def __init__(self, name, commands, prefix=""):
+        super(CommandModule, self).__init__(name)
+        self._commands = commands
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        command = Command(name, self._commands.get(name), self._prefix)
+        setattr(self, name, command)
+        return command
+
+
+class MSelectionList(object):
+    """
+    The parts of maya.api.OpenMaya the exporter reads attributes with. API calls stay inside Maya,
+    so they are counted but cost no overhead.
+    """
+
+    def __init__(self):
+        self._plugs = []
+
+    def add(self, name):
+        STATE.calls["om.MSelectionList.add"] += 1
+        plug = _resolve_plug(name) if "." in str(name) else _resolve(name)
+        if plug is None:
+            raise RuntimeError(f"(kInvalidParameter): Object does not exist: {name}")
+        self._plugs.append(plug)
+        return self
+
+    def getDependNode(self, index):
+        STATE.calls["om.MSelectionList.getDependNode"] += 1
+        # Nodes are their long names
+        return self._plugs[index]
+
+    def getPlug(self, index):
+        STATE.calls["om.MSelectionList.getPlug"] += 1
+        return MPlug(*_split(self._plugs[index]))
+
+
+class MPlug(object):
+    def __init__(self, node, attr):
+        self._node = node
+        self._attr = attr
+
+    def attribute(self):
+        return self._node, self._attr
+
+    def asShort(self):
+        return int(STATE.nodes[self._node][self._attr])
+
+    def asMObject(self):
+        return list(STATE.nodes[self._node][self._attr])
+
+    def partialName(self, useLongNames=False):
+        return self._attr
+
+
+class MNodeMessage(object):
+    kAttributeSet = 0x8
+    kAttributeRemoved = 0x80
+    kAttributeAdded = 0x40
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, client_data=None):
+        STATE.calls["om.MNodeMessage.addAttributeChangedCallback"] += 1
+        STATE.last_callback_id += 1
+        callback_id = STATE.last_callback_id
+        STATE.callbacks[callback_id] = (node, function, client_data)
+        STATE.node_callbacks.setdefault(node, set()).add(callback_id)
+        return callback_id
+
+
+def _remove_callback(callback_id):
+    if callback_id in STATE.callbacks:
+        node, _, _ = STATE.callbacks.pop(callback_id)
+        STATE.node_callbacks[node].discard(callback_id)
+
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callback_id):
+        STATE.calls["om.MMessage.removeCallback"] += 1
+        _remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        STATE.calls["om.MMessage.removeCallbacks"] += 1
+        for callback_id in callback_ids:
+            _remove_callback(callback_id)
+
+
+class MFnStringArrayData(object):
+    def __init__(self, data):
+        self._data = data
+
+    def array(self):
+        return list(self._data)
+
+
+class MFnEnumAttribute(object):
+    def __init__(self, attribute):
+        self._node, self._attr = attribute
+
+    def fieldName(self, value):
+        return _enum_fields(STATE.enums[self._node][self._attr])[value]
+
+
+class MelGlobals(dict):
+    """
+    pm.melGlobals. Reading or writing a MEL global is a round trip into Maya too.
+    """
+
+    def initVar(self, var_type, name):
+        STATE.calls["melGlobals.initVar"] += 1
+        _spin()
+        if name not in self:
+            dict.__setitem__(self, name, [] if var_type.endswith("[]") else "")
+        return name
+
+    def __getitem__(self, name):
+        STATE.calls["melGlobals"] += 1
+        _spin()
+        return self.get(name, "")
+
+    def __setitem__(self, name, value):
+        STATE.calls["melGlobals"] += 1
+        _spin()
+        dict.__setitem__(self, name, list(value) if isinstance(value, (list, tuple)) else value)
+
+
+def install(overhead_us=DEFAULT_OVERHEAD_US):
+    """
+    Registers the stand-in as pymel.core, maya.cmds, maya.api.OpenMaya and maya.utils.
+    """
+    STATE.overhead = overhead_us / 1e6
+
+    core = CommandModule("pymel.core", SCENE_COMMANDS)
+    core.cmds = CommandModule("maya.cmds", SCENE_COMMANDS, "cmds.")
+    core.mel = CommandModule("pymel.core.mel", MEL_PROCEDURES, "mel.")
+    core.melGlobals = MelGlobals()
+
+    pymel = types.ModuleType("pymel")
+    pymel.core = core
+    open_maya = types.ModuleType("maya.api.OpenMaya")
+    open_maya.MSelectionList = MSelectionList
+    open_maya.MFnEnumAttribute = MFnEnumAttribute
+    open_maya.MFnStringArrayData = MFnStringArrayData
+    open_maya.MNodeMessage = MNodeMessage
+    open_maya.MMessage = MMessage
+    maya = types.ModuleType("maya")
+    maya.api = types.ModuleType("maya.api")
+    maya.api.OpenMaya = open_maya
+    maya.cmds = core.cmds
+    maya.utils = types.ModuleType("maya.utils")
+    maya.utils.executeDeferred = lambda callback, *args: callback(*args)
+
+    sys.modules.update({
+        "pymel": pymel,
+        "pymel.core": core,
+        "maya": maya,
+        "maya.api": maya.api,
+        "maya.api.OpenMaya": open_maya,
+        "maya.cmds": core.cmds,
+        "maya.utils": maya.utils,
+    })
+    return core
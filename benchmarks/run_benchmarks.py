@@ -0,0 +1,422 @@
+"""
+Benchmarks for the pure-Python parts of MayaPandaUI.py, run on plain CPython.
+
+pymel is replaced by pymel_standin, which charges a per-call overhead for every Maya command and
+counts the calls, and the batch export and import use fake maya2egg/egg2bam/bam2egg tools from
+fake_panda_tool.py.
+Scene benchmarks run on synthetic scenes of --sizes nodes. The batch loop starts real processes
+for every node, so it runs on the smaller --batch-sizes.
+
+    python benchmarks/run_benchmarks.py                   # compare against benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline   # store the results as the new baseline
+
+A case regresses when it got slower than the baseline by more than --tolerance, or when it makes
+more Maya calls than before. Call counts do not depend on the machine, timings do, so store a
+baseline on the machine the comparison runs on. The exit code is 1 if any case regressed.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [BENCH_DIR, os.path.dirname(BENCH_DIR)]
+
+import pymel_standin  # noqa: E402
+from fake_panda_tool import EGG_VERTICES_ENV, write_tool_scripts  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+# Differences below this many seconds are noise, whatever the ratio
+NOISE_FLOOR = 0.001
+
+
+class Case(object):
+    """
+    A benchmark. setup(size) prepares the state and returns the function to time.
+    """
+
+    def __init__(self, name, setup, kind="fixed", number=1):
+        self.name = name
+        self.setup = setup
+        self.kind = kind  # "fixed", "scene" or "batch"
+        self.number = number
+
+
+def build_cases(ui, work_dir):
+    from MayaPandaCache import BuildCache
+    from MayaPandaMetrics import MetricsHistory
+    from MayaPandaSettings import ExportSettings
+
+    settings = ExportSettings(animation = "both", force_joints = (), custom_frame_range = True, texture_path_mode = "copy")
+
+    def ot_names(sortby):
+        def setup(size):
+            return lambda: ui.getOTNames(sortby)
+        return setup
+
+    def args_builder(size):
+        return lambda: ui.MP_PY_ArgsBuilder("bench_model", settings)
+
+    def ot_registry(size):
+        def run():
+            # What importing the module and opening the Add Egg-Object-Types window do with the definitions
+            ui.OT_NEW = ui.MP_PY_LoadObjectTypes()
+            ui.OT_REGISTRY = ui.ObjectTypeRegistry(ui.OT_NEW, ui.CategoryDefs)
+            for category in ui.CategoryDefs.values():
+                category.get_children()
+            ui.MP_PY_Globals()
+        return run
+
+    def add_egg_object_types_gui(reopen):
+        def setup(size):
+            ui.pm.deleteUI("MP_PY_AddEggObjectTypesWindow", window = 1)
+            if not reopen:
+                def run():
+                    ui.pm.deleteUI("MP_PY_AddEggObjectTypesWindow", window = 1)
+                    ui.MP_PY_AddEggObjectTypesGUI()
+                return run
+            ui.MP_PY_AddEggObjectTypesGUI()
+            return ui.MP_PY_AddEggObjectTypesGUI
+        return setup
+
+    def filter_egg_object_types(size):
+        # Typing "camera-col" and deleting it again
+        ui.pm.deleteUI("MP_PY_AddEggObjectTypesWindow", window = 1)
+        ui.MP_PY_AddEggObjectTypesGUI()
+        text = "camera-col"
+        steps = [text[:length] for length in range(1, len(text) + 1)] + [text[:length] for length in range(len(text) - 1, -1, -1)]
+
+        def run():
+            for step in steps:
+                ui.MP_PY_FilterEggObjectTypes(step)
+        return run
+
+    def egg_object_type_panel(warm):
+        # A burst of 100 SelectionChanged events for a selection of the whole scene
+        def setup(size):
+            nodes = tagged_scene(size)
+            panel = ui.MP_PY_EggObjectTypePanelGUI()
+            pymel_standin.STATE.selection = list(nodes)
+
+            def run():
+                if not warm:
+                    panel.clearCache()
+                deferred = []
+                execute_deferred = ui.maya.utils.executeDeferred
+                ui.maya.utils.executeDeferred = lambda callback, *args: deferred.append((callback, args))
+                try:
+                    for _ in range(100):
+                        panel.scheduleRefresh()
+                finally:
+                    ui.maya.utils.executeDeferred = execute_deferred
+                # Maya idles after the burst
+                for callback, args in deferred:
+                    callback(*args)
+            if warm:
+                run()
+            return run
+        return setup
+
+    def mass_delete_attr(delete):
+        # Stale tags on the whole scene: the list and two legacy attributes
+        def setup(size):
+            nodes = tagged_scene(size)
+            names = ":".join(ui.getOTNames("category"))
+            for node in nodes:
+                pymel_standin.STATE.nodes[node].update(eggObjectTypes1 = 0, eggObjectTypes2 = 0)
+                pymel_standin.STATE.enums[node].update(eggObjectTypes1 = names, eggObjectTypes2 = names)
+            window = ui.MassDeleteAttrWindow()
+            window.create()
+            if not delete:
+                return window.doRefresh
+
+            def run():
+                window.doRefresh()
+                window.deleteAttrs(list(window.index))
+            return run
+        return setup
+
+    def add_egg_object_flags(size):
+        pymel_standin.new_scene(size)
+        return lambda: ui.MP_PY_AddEggObjectFlags("barrier")
+
+    def retag_egg_object_flags(size):
+        # Every node already has the type, so everything ends up in the conflict summary
+        pymel_standin.new_scene(size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ui.MP_PY_AddEggObjectFlags("barrier")
+        return lambda: ui.MP_PY_AddEggObjectFlags("barrier")
+
+    def tagged_scene(size):
+        # Five egg-object-types on every node, in the eggObjectTypeList
+        nodes = pymel_standin.new_scene(size)
+        names = ui.getOTNames("category")[:5]
+        for node in nodes:
+            pymel_standin.STATE.nodes[node][ui.EGG_OBJECT_TYPE_LIST] = list(names)
+        return nodes
+
+    def read_egg_object_types(size):
+        nodes = tagged_scene(size)
+        return lambda: ui.MP_PY_ReadEggObjectTypes(nodes)
+
+    def audit_egg_object_types(size):
+        tagged_scene(size)
+        return ui.MP_PY_AuditEggObjectTypes
+
+    rules_file = os.path.join(work_dir, "tag_rules.json")
+    with open(rules_file, "w") as handle:
+        json.dump({"rules": [
+            {"label": "Walls", "match": {"name": "[02468]$"}, "types": ["barrier"]},
+            {"label": "Floors", "match": {"name": "[13579]$", "parent": "^$"}, "types": ["floor", "camera-collide"]},
+        ]}, handle)
+
+    def apply_tag_rules(size):
+        pymel_standin.new_scene(size)
+        return lambda: ui.MP_PY_ApplyTagRules(rules_file, quiet = True)
+
+    def legacy_layout(size):
+        # What every export does before the scene is written for maya2egg
+        tagged_scene(size)
+
+        def run():
+            with ui.legacy_layout(ui.pm.cmds, ui.OT_REGISTRY.ids()):
+                pass
+        return run
+
+    def migrate_egg_object_types(size):
+        # Tags as older versions wrote them: the whole type list as the enum, the position as the value
+        pymel_standin.new_scene(size)
+        names = ui.getOTNames("category")
+        for index, node in enumerate(pymel_standin.STATE.nodes):
+            pymel_standin.STATE.nodes[node]["eggObjectTypes1"] = index % len(names)
+            pymel_standin.STATE.enums[node]["eggObjectTypes1"] = ":".join(names)
+        return ui.MP_PY_MigrateEggObjectTypes
+
+    tools = write_tool_scripts(os.path.join(work_dir, "tools"))
+
+    def convert_eggs(up_to_date, conversion_worker=False):
+        # Egg File 2 Bam on a folder of size eggs, until the last conversion finished
+        def setup(size):
+            egg_dir = os.path.join(work_dir, "eggs")
+            shutil.rmtree(egg_dir, ignore_errors = True)
+            os.makedirs(egg_dir)
+            for index in range(size):
+                with open(os.path.join(egg_dir, f"prop{index}.egg"), "w") as handle:
+                    handle.write("<Group> prop {}\n")
+            convert_settings = ExportSettings(egg2bam_exe = tools["egg2bam"], conversion_worker = conversion_worker)
+            if conversion_worker:
+                # Started here, so the worker's startup is not part of the timing
+                ui.MP_PY_WORKER.close()
+                ui.MP_PY_WORKER.command = [sys.executable, os.path.join(BENCH_DIR, "fake_panda_tool.py"), "worker"]
+                ui.MP_PY_WORKER.start()
+
+            def run():
+                for job in ui.MP_PY_ConvertEggsToBam([egg_dir], convert_settings):
+                    while not job.finished:
+                        time.sleep(0.01)
+            if up_to_date:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run()
+            return run
+        return setup
+
+    def import_panda_files(cached):
+        # Import Panda File on size bams, until the last one is imported
+        def setup(size):
+            root = os.path.join(work_dir, "phases")
+            shutil.rmtree(root, ignore_errors = True)
+            os.makedirs(os.path.join(root, "phase_3", "models"))
+            bams = []
+            for index in range(size):
+                bams.append(os.path.join(root, "phase_3", "models", f"prop{index}.bam"))
+                with open(bams[-1], "wb") as handle:
+                    handle.write(b"pbj\0\n\r" + index.to_bytes(4, "little"))
+            ui.MP_PY_BUILD_CACHE = BuildCache(os.path.join(work_dir, "cache"))
+            ui.MP_PY_BUILD_CACHE.clear()
+            import_settings = ExportSettings(bam2egg_exe = tools["bam2egg"])
+
+            def run():
+                finished = threading.Event()
+                ui.MP_PY_ImportPandaFiles(bams, root, import_settings, on_done = lambda failed: finished.set())
+                finished.wait()
+            if cached:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run()
+            return run
+        return setup
+
+    def export_nodes(parallel, reuse_scene_file=True, bam_versions=0):
+        def setup(size):
+            out_dir = os.path.join(work_dir, "out")
+            shutil.rmtree(out_dir, ignore_errors = True)
+            ui.MP_PY_BUILD_CACHE = BuildCache(os.path.join(work_dir, "cache"))
+            ui.MP_PY_BUILD_CACHE.clear()
+            ui.MP_PY_METRICS = MetricsHistory(os.path.join(work_dir, "metrics.jsonl"))
+            node_settings = ExportSettings(
+                custom_output = True,
+                output_path = out_dir,
+                output_bam = True,
+                parallel = parallel,
+                reuse_scene_file = reuse_scene_file,
+                memory_budget_mb = 0,
+                maya2egg_exe = tools["maya2egg"],
+                egg2bam_exe = tools["egg2bam"],
+                bam_fan_out = tuple((f"6.{45 - index}", tools["egg2bam"]) for index in range(bam_versions)),
+            )
+            ui.MP_PY_CaptureExportSettings = lambda: node_settings
+            pymel_standin.new_scene(size)
+
+            def run():
+                ui.MP_PY_ExportNodesToPandaFiles()
+                # Include the egg statistics the exported files window scans in the background
+                for thread in threading.enumerate():
+                    if thread.name == "MayaPandaEggStats":
+                        thread.join()
+            return run
+        return setup
+
+    return [
+        Case("getOTNames", ot_names(None), number = 1000),
+        Case("getOTNames_alphabetical", ot_names("alphabetical"), number = 100),
+        Case("getOTNames_category", ot_names("category"), number = 100),
+        Case("MP_PY_ArgsBuilder", args_builder, number = 1000),
+        Case("ot_registry_setup", ot_registry, number = 20),
+        Case("MP_PY_AddEggObjectTypesGUI", add_egg_object_types_gui(False), number = 20),
+        Case("MP_PY_AddEggObjectTypesGUI_reopen", add_egg_object_types_gui(True), number = 100),
+        Case("MP_PY_FilterEggObjectTypes", filter_egg_object_types, number = 20),
+        Case("MP_PY_AddEggObjectFlags", add_egg_object_flags, kind = "scene"),
+        Case("MP_PY_AddEggObjectFlags_retag", retag_egg_object_flags, kind = "scene"),
+        Case("MP_PY_ReadEggObjectTypes", read_egg_object_types, kind = "scene"),
+        Case("legacy_layout", legacy_layout, kind = "scene"),
+        Case("MP_PY_AuditEggObjectTypes", audit_egg_object_types, kind = "scene"),
+        Case("EggObjectTypePanel_cold", egg_object_type_panel(False), kind = "scene"),
+        Case("EggObjectTypePanel_warm", egg_object_type_panel(True), kind = "scene"),
+        Case("MP_PY_ApplyTagRules", apply_tag_rules, kind = "scene"),
+        Case("MP_PY_MigrateEggObjectTypes", migrate_egg_object_types, kind = "scene"),
+        Case("MassDeleteAttrWindow_refresh", mass_delete_attr(False), kind = "scene"),
+        Case("MassDeleteAttrWindow_delete", mass_delete_attr(True), kind = "scene"),
+        Case("MP_PY_ConvertEggsToBam", convert_eggs(False), kind = "batch"),
+        Case("MP_PY_ConvertEggsToBam_up_to_date", convert_eggs(True), kind = "batch"),
+        Case("MP_PY_ConvertEggsToBam_worker", convert_eggs(False, True), kind = "batch"),
+        Case("MP_PY_ImportPandaFiles", import_panda_files(False), kind = "batch"),
+        Case("MP_PY_ImportPandaFiles_cached", import_panda_files(True), kind = "batch"),
+        Case("export_nodes_serial", export_nodes(False), kind = "batch"),
+        Case("export_nodes_parallel", export_nodes(True), kind = "batch"),
+        Case("export_nodes_serial_temp_files", export_nodes(False, False), kind = "batch"),
+        Case("export_nodes_serial_3_bam_versions", export_nodes(False, bam_versions = 3), kind = "batch"),
+    ]
+
+
+def measure(case, size, repeat):
+    """
+    :return: Median seconds per call and the number of Maya calls of one call.
+    """
+    timings = []
+    calls = 0
+    for _ in range(repeat):
+        func = case.setup(size)
+        pymel_standin.STATE.reset_calls()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(case.number):
+                func()
+            timings.append((time.perf_counter() - start) / case.number)
+        calls = sum(pymel_standin.STATE.calls.values()) // case.number
+    return statistics.median(timings), calls
+
+
+def compare(results, baseline, tolerance):
+    """
+    :return: A dictionary of case key to a short regression description.
+    """
+    regressions = {}
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if result["calls"] > base["calls"]:
+            regressions[key] = f"calls {base['calls']} -> {result['calls']}"
+        elif result["seconds"] > base["seconds"] * (1.0 + tolerance) and result["seconds"] - base["seconds"] > NOISE_FLOOR:
+            regressions[key] = f"{result['seconds'] / base['seconds']:.2f}x slower"
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description = "Benchmark MayaPandaUI.py with a pymel stand-in.")
+    parser.add_argument("--sizes", default = "10,100,1000,10000", help = "Node counts of the scene benchmarks")
+    parser.add_argument("--batch-sizes", default = "10,100", help = "Node counts of the batch export benchmarks")
+    parser.add_argument("--overhead-us", type = float, default = pymel_standin.DEFAULT_OVERHEAD_US,
+                        help = "Cost of one Maya command in microseconds")
+    parser.add_argument("--egg-vertices", type = int, default = 1024, help = "Vertices per synthetic egg")
+    parser.add_argument("--repeat", type = int, default = 3, help = "Runs per case, the median is reported")
+    parser.add_argument("--only", default = "", help = "Only run cases whose name contains this text")
+    parser.add_argument("--baseline", default = DEFAULT_BASELINE, help = "Baseline results file")
+    parser.add_argument("--save-baseline", action = "store_true", help = "Store the results as the baseline")
+    parser.add_argument("--tolerance", type = float, default = 0.25, help = "Allowed slowdown, 0.25 = 25%%")
+    options = parser.parse_args(argv)
+
+    pymel_standin.install(options.overhead_us)
+    os.environ[EGG_VERTICES_ENV] = str(options.egg_vertices)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import MayaPandaUI as ui
+
+    sizes = {
+        "fixed": [None],
+        "scene": [int(size) for size in options.sizes.split(",") if size],
+        "batch": [int(size) for size in options.batch_sizes.split(",") if size],
+    }
+    baseline = {}
+    if os.path.isfile(options.baseline) and not options.save_baseline:
+        with open(options.baseline) as handle:
+            baseline = json.load(handle)["results"]
+
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix = "mp_py_bench_")
+    try:
+        print(f"{'case':<40} {'ms':>12} {'calls':>8} {'baseline ms':>12} {'ratio':>7}")
+        for case in build_cases(ui, work_dir):
+            if options.only not in case.name:
+                continue
+            for size in sizes[case.kind]:
+                key = case.name if size is None else f"{case.name}[{size}]"
+                seconds, calls = measure(case, size, options.repeat)
+                results[key] = {"seconds": seconds, "calls": calls}
+                base = baseline.get(key)
+                base_text = f"{base['seconds'] * 1000:12.3f} {seconds / base['seconds']:7.2f}" if base else ""
+                print(f"{key:<40} {seconds * 1000:12.3f} {calls:8d} {base_text}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors = True)
+
+    if options.save_baseline:
+        with open(options.baseline, "w") as handle:
+            json.dump({
+                "machine": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "overhead_us": options.overhead_us,
+                    "egg_vertices": options.egg_vertices,
+                },
+                "results": results,
+            }, handle, indent = 4, sort_keys = True)
+        print(f"Saved baseline: {options.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, options.tolerance)
+    for key, reason in sorted(regressions.items()):
+        print(f"REGRESSION {key}: {reason}")
+    if baseline and not regressions:
+        print("No regressions against the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())